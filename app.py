@@ -1,3 +1,6 @@
+import functools
+from datetime import date
+
 import streamlit as st
 from core import (
     dashboard_summary,
@@ -5,6 +8,9 @@ from core import (
     sidebar,
     data_variables,
     dashboard_plot,
+    summary_cache,
+    figure_cache,
+    data_loader,
 )
 
 # ==========================================================================================================    
@@ -51,23 +57,35 @@ def dashboard() -> None:
     else:
         # Filter or clean the dataset
         df = utils.filter_the_dataset(df)
+        # Summaries are memoized per dataset and filter values (see core.summary_cache).
+        # The filtered frames are only sliced when a summary is not cached yet.
+        dataset_key = summary_cache.get_dataset_fingerprint(df)
 
 # ==========================================================================================================    
     # Summary Calculations for Last N Days
 # ==========================================================================================================    
         no_of_days_for_summary  = st.expander("Days Filter", expanded=False).slider("Select Number of Days for Summary Calculations", min_value=7, max_value=365, value=30, step=1, key="days_slider")
-        df_last_n_days = utils.get_last_n_days_data(df, no_of_days_for_summary)
+        days_key = (no_of_days_for_summary, date.today())
+        get_df_last_n_days = functools.cache(lambda: utils.get_last_n_days_data(df, no_of_days_for_summary))
+        # Count and fine-sum summaries read the daily rollup cube (see core.rollup_cube) when there is one
+        rollup = sidebar.get_dataset_rollup(df)
+        get_rollup_last_n_days = functools.cache(
+            lambda: get_df_last_n_days() if rollup is None else utils.get_last_n_days_data(rollup, no_of_days_for_summary)
+        )
         
         col1, col2 = st.columns(2)
         with col1:
             st.info(f"### Total Violations (Last {no_of_days_for_summary} Days)")
-            summary = dashboard_summary.get_violations_summary_of_last_n_days(df_last_n_days)
+            summary = summary_cache.get_or_compute(
+                (dataset_key, 'violations_summary') + days_key,
+                lambda: dashboard_summary.get_violations_summary_of_last_n_days(get_df_last_n_days())
+            )
             
             # Display Charts
             # with st.expander("View Violation Types Distribution Chart"):
             with st.container():    
                 st.markdown("<h3 style='text-align: center;'>Violation Types Distribution</h3>", unsafe_allow_html=True)
-                st.pyplot(summary.get('fig'), width='stretch')
+                st.image(summary.get('fig'), width='stretch')
             # Metrics
             sub_col1, sub_col2, sub_col3 = st.columns(3, border=True)
             with sub_col1:
@@ -76,17 +94,20 @@ def dashboard() -> None:
             with sub_col2:
                 st.metric(label="Violations/Day", value=f"{int(summary.get('total_no_of_violations')/no_of_days_for_summary)}")
             with sub_col3:
-                st.metric(label="Violations/VehicleType", value=f"{int(summary.get('total_no_of_violations')/df_last_n_days['Vehicle_Type'].nunique())}")
+                st.metric(label="Violations/VehicleType", value=f"{int(summary.get('total_no_of_violations')/summary.get('total_vehicle_types'))}")
             st.markdown('---')
             
     # ==========================================================================================================
             # --- License Insights ---
             st.info(f"### License Insights (Last {no_of_days_for_summary} Days)")
-            license_insights = dashboard_summary.get_license_insights(df_last_n_days)
+            license_insights = summary_cache.get_or_compute(
+                (dataset_key, 'license_insights') + days_key,
+                lambda: dashboard_summary.get_license_insights(get_df_last_n_days())
+            )
             
             with st.container():
                 st.markdown("<h3 style='text-align: center;'>License Validity</h3>", unsafe_allow_html=True)
-                st.pyplot(license_insights.get('validity_fig'), width='stretch')
+                st.image(license_insights.get('validity_fig'), width='stretch')
             
             sub_col_l1, sub_col_l2 = st.columns(2, border=True)
             with sub_col_l1:
@@ -99,13 +120,16 @@ def dashboard() -> None:
     # ==========================================================================================================
         with col2:
             st.info(f"### Total Fines (Last {no_of_days_for_summary} Days)")
-            fine_summary = dashboard_summary.get_total_fines_generated(df_last_n_days)
+            fine_summary = summary_cache.get_or_compute(
+                (dataset_key, 'fines_summary') + days_key,
+                lambda: dashboard_summary.get_total_fines_generated(get_rollup_last_n_days())
+            )
             
             # Display Charts
             # with st.expander("View Fines Distribution Chart"):
             with st.container():    
                 st.markdown("<h3 style='text-align: center;'>Fines Distribution</h3>", unsafe_allow_html=True)
-                st.pyplot(fine_summary.get('fig'), width='stretch')
+                st.image(fine_summary.get('fig'), width='stretch')
             # Metrics
             sub_col1, sub_col2 = st.columns(2, border=True)
             with sub_col1:
@@ -116,11 +140,14 @@ def dashboard() -> None:
 
     # ==========================================================================================================
             st.info(f"### Location Insights (Last {no_of_days_for_summary} Days)")
-            location_based_summary = dashboard_summary.get_violations_by_location(df_last_n_days)
+            location_based_summary = summary_cache.get_or_compute(
+                (dataset_key, 'location_summary') + days_key,
+                lambda: dashboard_summary.get_violations_by_location(get_rollup_last_n_days())
+            )
             # with st.expander("View Violations by Location Chart"):
             with st.container():    
                 st.markdown("<h3 style='text-align: center;'>Violations by Location</h3>", unsafe_allow_html=True)
-                st.pyplot(location_based_summary.get('fig'), width='stretch')
+                st.image(location_based_summary.get('fig'), width='stretch')
             # Metrics
             sub_col2, sub_col3 = st.columns(2, border=True)
             
@@ -140,8 +167,10 @@ def dashboard() -> None:
     # Additional Dashboard Metrics Overview
 # ==========================================================================================================  
         # Year Filter for Global Overview
-        min_year = int(df['Date'].dt.year.min())
-        max_year = int(df['Date'].dt.year.max())
+        min_year, max_year = summary_cache.get_or_compute(
+            (dataset_key, 'year_range'),
+            lambda: tuple(int(date.year) for date in data_loader.get_date_range(df))
+        )
 # ==========================================================================================================  
     # GLOBAL DATA OVERVIEW
 # ==========================================================================================================  
@@ -159,28 +188,27 @@ def dashboard() -> None:
                  key="slider_global_year"
              )
         
-        # Filter Data
-        mask_global = (df['Date'].dt.year >= selected_years_global[0]) & (df['Date'].dt.year <= selected_years_global[1])
-        df_global = df[mask_global]
-        
         with st.expander(f"📊 Executive Summary Report ({selected_years_global[0]} - {selected_years_global[1]})", expanded=True):
-             global_metrics = dashboard_summary.get_global_overview_metrics(df_global)
+             global_metrics = summary_cache.get_or_compute(
+                 (dataset_key, 'dataset_metrics', tuple(selected_years_global)),
+                 lambda: dashboard_summary.get_dataset_metrics(utils.get_years_data(df, selected_years_global))
+             )
              
              # Row 1
              c1, c2, c3, c4 = st.columns(4, border=True)
-             with c1: st.metric("Total Violations", global_metrics.get('total_violations', 0))
-             with c2: st.metric("Most Common Violation", global_metrics.get('most_common_violation', 'N/A'))
-             with c3: st.metric("Top Location", global_metrics.get('top_location', 'N/A'))
-             with c4: st.metric("Top Licensed Agency", global_metrics.get('top_agency', 'N/A'))
+             with c1: st.metric("Total Violations", global_metrics.total_violations)
+             with c2: st.metric("Most Common Violation", global_metrics.most_common_violation)
+             with c3: st.metric("Top Location", global_metrics.top_location)
+             with c4: st.metric("Top Licensed Agency", global_metrics.top_agency)
              
 
              
              # Row 2
              c1, c2, c3, c4 = st.columns(4, border=True)
-             with c1: st.metric("Avg Fine", f"Rs. {global_metrics.get('avg_fine', 0):,.2f}")
-             with c2: st.metric("Max Fine", f"Rs. {global_metrics.get('max_fine', 0):,.2f}")
-             with c3: st.metric("Min Fine", f"Rs. {global_metrics.get('min_fine', 0):,.2f}")
-             with c4: st.metric("Common Payment", global_metrics.get('common_payment', 'N/A'))
+             with c1: st.metric("Avg Fine", f"Rs. {global_metrics.avg_fine:,.2f}")
+             with c2: st.metric("Max Fine", f"Rs. {global_metrics.max_fine:,.2f}")
+             with c3: st.metric("Min Fine", f"Rs. {global_metrics.min_fine:,.2f}")
+             with c4: st.metric("Common Payment", global_metrics.common_payment)
 
         st.markdown('---')
       
@@ -201,18 +229,17 @@ def dashboard() -> None:
                  key="slider_behavior_year"
              )
              
-        # Filter Data
-        mask_behavior = (df['Date'].dt.year >= selected_years_behavior[0]) & (df['Date'].dt.year <= selected_years_behavior[1])
-        df_behavior = df[mask_behavior]
-
         with st.expander(f"Advanced Risk Indicators ({selected_years_behavior[0]} - {selected_years_behavior[1]})", expanded=True):
-             behavior_metrics = dashboard_summary.get_behavioral_analysis(df_behavior)
+             behavior_metrics = summary_cache.get_or_compute(
+                 (dataset_key, 'dataset_metrics', tuple(selected_years_behavior)),
+                 lambda: dashboard_summary.get_dataset_metrics(utils.get_years_data(df, selected_years_behavior))
+             )
              
-             over_speeding_count, over_speeding_pct = behavior_metrics['over_speeding_stats']
-             court_count, court_pct = behavior_metrics['court_appearance_stats']
-             repeat_offender_count, repeat_offender_pct = behavior_metrics['repeat_offender_stats']
-             bad_weather_count, bad_weather_pct = behavior_metrics['bad_weather_stats']
-             top_weather_name, top_weather_count, top_weather_pct = behavior_metrics['most_frequent_weather_stats']
+             over_speeding_count, over_speeding_pct = behavior_metrics.over_speeding_stats
+             court_count, court_pct = behavior_metrics.court_appearance_stats
+             repeat_offender_count, repeat_offender_pct = behavior_metrics.repeat_offender_stats
+             bad_weather_count, bad_weather_pct = behavior_metrics.bad_weather_stats
+             top_weather_name, top_weather_count, top_weather_pct = behavior_metrics.most_frequent_weather_stats
 
              # Row 1 (3 Columns)
              col1, col2, col3 = st.columns(3)
@@ -222,7 +249,7 @@ def dashboard() -> None:
                      label="Over-Speeding Incidents",
                      value=f"{over_speeding_count}",
                      delta=f"{over_speeding_pct:.1f}% Rate",
-                     delta_color="inner" if over_speeding_pct < 10 else "inverse",
+                     delta_color="normal" if over_speeding_pct < 10 else "inverse",
                      help="Percentage of violations where recorded speed exceeded the limit."
                  )
              with col2:
@@ -282,10 +309,9 @@ def dashboard() -> None:
                  )
             
             # Filter
-            mask_vehicle = (df['Date'].dt.year >= years_vehicle[0]) & (df['Date'].dt.year <= years_vehicle[1])
-            df_vehicle = df[mask_vehicle]
+            df_vehicle = utils.get_years_data(df, years_vehicle)
             
-            st.pyplot(dashboard_plot.plot_vehicle_type_vs_violation_type(df_vehicle), width='stretch')
+            st.image(figure_cache.get_figure_image(dashboard_plot.plot_vehicle_type_vs_violation_type, df_vehicle), width='stretch')
             
         st.markdown('---')
         
@@ -304,10 +330,9 @@ def dashboard() -> None:
                  )
             
             # Filter
-            mask_heatmap = (df['Date'].dt.year >= years_heatmap[0]) & (df['Date'].dt.year <= years_heatmap[1])
-            df_heatmap = df[mask_heatmap]
+            df_heatmap = utils.get_years_data(df, years_heatmap)
 
-            st.pyplot(dashboard_plot.plot_severity_heatmap_by_location(df_heatmap), width='stretch')
+            st.image(figure_cache.get_figure_image(dashboard_plot.plot_severity_heatmap_by_location, df_heatmap), width='stretch')
         st.markdown('---')        
     # ------------------------------
     # INFO SECTION
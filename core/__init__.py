@@ -0,0 +1,5 @@
+import pandas as pd
+
+# Copy-on-Write lets every page derive columns from the shared, cached dataset
+# (see core.sidebar) without cloning it and without mutating the cached frame.
+pd.set_option("mode.copy_on_write", True)
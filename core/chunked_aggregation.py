@@ -0,0 +1,211 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from core import data_loader, derived_columns, rollup_cube, summary_cache
+
+# This module runs grouped aggregations over a dataset file in chunks (out-of-core mode).
+# Every chunk is reduced to partial aggregates per group (count, sum, min, max ...), which are merged
+# into a running total, so memory is bounded by the chunk size and the number of groups.
+# Streamed results are cached per file version and date range (see core.summary_cache), reruns reuse them.
+
+# ---------------------------------------------------------
+# CHUNKED AGGREGATION CONFIGURATION
+# ---------------------------------------------------------
+# Records read per chunk
+CHUNK_ROWS = 250_000
+
+# Dataset files from this size on are aggregated in chunks on the Numerical Analysis page
+OUT_OF_CORE_MIN_BYTES = 256 * 1024 * 1024
+
+# Marks chunked dataset handles (see `open_chunked_dataset`) in `DataFrame.attrs`
+CHUNKED_ATTR = 'chunked_source'
+
+# Partial aggregates kept per chunk for every supported function
+PARTIAL_AGGREGATES = {
+    'count': ['count'],
+    'size': ['size'],
+    'sum': ['sum'],
+    'min': ['min'],
+    'max': ['max'],
+    'mean': ['sum', 'count'],
+    'std': ['sum', 'sum_sq', 'count'],
+}
+
+# How partial aggregates of two chunks are combined
+PARTIAL_COMBINE = {'count': 'sum', 'size': 'sum', 'sum': 'sum', 'sum_sq': 'sum', 'min': 'min', 'max': 'max'}
+
+
+# ==================================================================================
+# Block 0: Chunked Dataset Functions
+# ==================================================================================
+def open_chunked_dataset(path: str, start=None, end=None) -> pd.DataFrame:
+    """
+    Returns a handle for aggregating a dataset file in chunks: an empty frame with the columns
+    of the loaded dataset (derived columns included), tagged with the file, its version and the date range.
+    `group_aggregate` streams the file for such handles.
+
+    Args:
+        path (str): Path of the CSV or Parquet dataset file.
+        start, end: Optional first and last day (both included), see data_loader.slice_by_date.
+
+    Returns:
+        pd.DataFrame: The zero-row handle.
+    """
+    head = data_loader.apply_schema(data_loader.read_dataset_head(path, 1))
+    handle = derived_columns.add_derived_columns(head).iloc[:0]
+    stat = os.stat(path)
+    handle.attrs[CHUNKED_ATTR] = {'path': path, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'start': start, 'end': end}
+    return handle
+# -------------------------------------------------------------------------------
+def is_chunked(df: pd.DataFrame) -> bool:
+    """
+    Checks if a frame is a chunked dataset handle.
+    """
+    return CHUNKED_ATTR in df.attrs
+# -------------------------------------------------------------------------------
+def get_chunked_result(df: pd.DataFrame, name: str, params: tuple, compute):
+    """
+    Result of a computation streamed over a chunked handle, cached by file version, date range,
+    `name` and `params`, so a rerun with the same selection does not read the file again.
+    """
+    source = df.attrs[CHUNKED_ATTR]
+    key = (name, source['path'], source['mtime_ns'], source['size'], source['start'], source['end']) + params
+    return summary_cache.get_or_compute(key, compute)
+# -------------------------------------------------------------------------------
+def get_read_columns(columns: list) -> list:
+    """
+    Stored columns needed to get `columns`, derived columns are replaced by their source columns.
+    """
+    read_columns = []
+    for col in columns:
+        if col not in derived_columns.DERIVED_COLUMNS:
+            read_columns.append(col)
+        else:
+            read_columns.extend(derived_columns.DERIVED_COLUMN_SOURCES[col])
+    return list(dict.fromkeys(read_columns))
+# -------------------------------------------------------------------------------
+def iter_dataset_chunks(path: str, columns: list, start=None, end=None):
+    """
+    Yields a dataset file as typed chunks of CHUNK_ROWS records with the requested columns.
+
+    CSV files are read through their Parquet cache when it is current, else parsed in chunks.
+    Derived columns are calculated per chunk, records outside the date range are left out.
+    """
+    read_columns = get_read_columns(columns)
+    if start is not None or end is not None:
+        read_columns = list(dict.fromkeys(read_columns + [data_loader.DATE_COLUMN]))
+
+    parquet_parts = data_loader.get_parquet_parts(path)
+    if parquet_parts:
+        # Appended delta parts are read after the file they extend
+        chunks = (
+            batch.to_pandas()
+            for part in parquet_parts
+            for batch in pq.ParquetFile(part).iter_batches(batch_size=CHUNK_ROWS, columns=read_columns)
+        )
+    else:
+        header = pd.read_csv(path, nrows=0).columns
+        chunks = pd.read_csv(path, usecols=read_columns, dtype=data_loader.get_read_dtypes(header), chunksize=CHUNK_ROWS)
+
+    for chunk in chunks:
+        chunk = data_loader.apply_schema(chunk)
+        if start is not None or end is not None:
+            chunk = data_loader.slice_by_date(chunk, start, end)
+        for col in columns:
+            if col in derived_columns.DERIVED_COLUMNS:
+                chunk[col] = derived_columns.get_derived_column(chunk, col)
+        yield chunk[columns]
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 1: Streaming Reduce Functions
+# ==================================================================================
+def get_partial_aggregates(chunk: pd.DataFrame, group_cols: list, agg_dict: dict) -> pd.DataFrame:
+    """
+    Partial aggregates of one chunk: one row per group, one (column, partial) column per needed partial.
+    """
+    keys = [chunk[col] for col in group_cols]
+    partials = {}
+    for col, funcs in agg_dict.items():
+        # Integer columns are downcast at load time and would overflow once summed
+        values = rollup_cube.widen_integer_dtype(chunk[col])
+        grouped = values.groupby(keys, observed=True)
+        for partial in sorted({partial for func in funcs for partial in PARTIAL_AGGREGATES[func]}):
+            if partial == 'sum_sq':
+                partials[(col, partial)] = (values.astype('float64') ** 2).groupby(keys, observed=True).sum()
+            else:
+                partials[(col, partial)] = grouped.agg(partial)
+    return pd.DataFrame(partials)
+# -------------------------------------------------------------------------------
+def combine_partial_aggregates(total: pd.DataFrame, partial: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merges the partial aggregates of a new chunk into the running total.
+    """
+    # Chunks without records in the date range add nothing
+    if total is None or total.empty:
+        return partial
+    if partial.empty:
+        return total
+    combined = pd.concat([total, partial])
+    combine_funcs = {col: PARTIAL_COMBINE[col[1]] for col in combined.columns}
+    return combined.groupby(level=list(range(combined.index.nlevels)), observed=True).agg(combine_funcs)
+# -------------------------------------------------------------------------------
+def finalize_aggregates(total: pd.DataFrame, agg_dict: dict) -> pd.DataFrame:
+    """
+    Turns the combined partial aggregates into the requested functions, like `groupby(...).agg(agg_dict)`.
+    """
+    result = {}
+    for col, funcs in agg_dict.items():
+        for func in funcs:
+            if func == 'mean':
+                result[(col, func)] = total[(col, 'sum')] / total[(col, 'count')].replace(0, np.nan)
+            elif func == 'std':
+                count = total[(col, 'count')]
+                squares = total[(col, 'sum_sq')] - total[(col, 'sum')].astype('float64') ** 2 / count.replace(0, np.nan)
+                result[(col, func)] = np.sqrt((squares / (count - 1).where(count > 1)).clip(lower=0))
+            else:
+                result[(col, func)] = total[(col, func)]
+    return pd.DataFrame(result, index=total.index)
+# -------------------------------------------------------------------------------
+def group_aggregate(df: pd.DataFrame, group_cols: list, agg_dict: dict) -> pd.DataFrame:
+    """
+    `df.groupby(group_cols, observed=True).agg(agg_dict)`, streamed over the file (once per selection)
+    for chunked handles.
+
+    Args:
+        df (pd.DataFrame): A dataset, or a handle from `open_chunked_dataset`.
+        group_cols (list): Columns to group by.
+        agg_dict (dict): {column: list of functions}, functions from PARTIAL_AGGREGATES.
+
+    Returns:
+        pd.DataFrame: One row per group, (column, function) columns.
+    """
+    if not is_chunked(df):
+        return df.groupby(group_cols, observed=True).agg(agg_dict)
+
+    def stream_aggregates():
+        source = df.attrs[CHUNKED_ATTR]
+        columns = list(dict.fromkeys(group_cols + list(agg_dict)))
+        total = None
+        for chunk in iter_dataset_chunks(source['path'], columns, source['start'], source['end']):
+            total = combine_partial_aggregates(total, get_partial_aggregates(chunk, group_cols, agg_dict))
+
+        if total is None:
+            return df.groupby(group_cols, observed=True).agg(agg_dict)
+        return finalize_aggregates(total, agg_dict)
+
+    params = (tuple(group_cols), tuple((col, tuple(funcs)) for col, funcs in agg_dict.items()))
+    return get_chunked_result(df, 'group_aggregate', params, stream_aggregates)
+# -------------------------------------------------------------------------------
+def group_size(df: pd.DataFrame, group_cols: list) -> pd.Series:
+    """
+    `df.groupby(group_cols, observed=True).size()`, streamed over the file for chunked handles.
+    """
+    if not is_chunked(df):
+        return df.groupby(group_cols, observed=True).size()
+    return group_aggregate(df, group_cols, {group_cols[0]: ['size']})[(group_cols[0], 'size')].rename(None)
+# ===================================================================================
@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+from core import dataset_catalog
+
+# This module profiles the columns of a dataset once at load time: kind, missing values, number of
+# distinct values (cardinality) and a small sample of the distinct values.
+# Column pickers and location detection read the profile instead of rescanning the records.
+
+# ---------------------------------------------------------
+# COLUMN PROFILE CONFIGURATION
+# ---------------------------------------------------------
+# Distinct values kept per column
+PROFILE_SAMPLE_SIZE = 20
+
+# Bumped whenever the profile layout changes, older stored profiles are rebuilt
+PROFILE_VERSION = 2
+
+# Column kinds, 'categorical' matches `select_dtypes(include=['object', 'category'])`
+# and 'numeric' matches `select_dtypes(include=['number'])`
+CATEGORICAL_KIND = 'categorical'
+NUMERIC_KIND = 'numeric'
+DATETIME_KIND = 'datetime'
+BOOLEAN_KIND = 'boolean'
+OTHER_KIND = 'other'
+
+
+# ==================================================================================
+# Block 0: Column Profile Functions
+# ==================================================================================
+def get_column_kind(series: pd.Series) -> str:
+    """
+    Kind of a column from its dtype.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype) or series.dtype == object:
+        return CATEGORICAL_KIND
+    if pd.api.types.is_bool_dtype(series.dtype):
+        return BOOLEAN_KIND
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return NUMERIC_KIND
+    if pd.api.types.is_datetime64_any_dtype(series.dtype):
+        return DATETIME_KIND
+    return OTHER_KIND
+# -------------------------------------------------------------------------------
+def get_distinct_values(series: pd.Series) -> pd.Index:
+    """
+    Distinct non-missing values of a column.
+    Category columns only count their codes, categories that do not occur are left out.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        return series.cat.categories[counts > 0]
+    return pd.Index(series.dropna().unique())
+# -------------------------------------------------------------------------------
+def sample_distinct_values(values: pd.Index, size: int = PROFILE_SAMPLE_SIZE) -> pd.Index:
+    """
+    Fixed-size uniform sample of distinct values, as a reservoir over the values ordered by their hash.
+    The hashes do not depend on the row order, so a dataset gets the same sample on every load.
+    """
+    if len(values) <= size:
+        return values
+    hashes = pd.util.hash_pandas_object(pd.Series(values), index=False).to_numpy()
+    smallest = np.argpartition(hashes, size)[:size]
+    return values[smallest[np.argsort(hashes[smallest])]]
+# -------------------------------------------------------------------------------
+def to_json_values(values: pd.Index, kind: str) -> list:
+    """
+    Sample values as plain JSON values for the dataset catalog.
+    """
+    if kind == DATETIME_KIND:
+        return values.astype(str).tolist()
+    return [value if isinstance(value, (str, int, float, bool)) else str(value) for value in values.tolist()]
+# -------------------------------------------------------------------------------
+def profile_column(series: pd.Series) -> dict:
+    """
+    Profile of one column.
+    """
+    kind = get_column_kind(series)
+    distinct = get_distinct_values(series)
+    return {
+        'kind': kind,
+        'dtype': str(series.dtype),
+        'missing_count': int(series.isna().sum()),
+        'unique_count': len(distinct),
+        'sample': to_json_values(sample_distinct_values(distinct), kind),
+    }
+# -------------------------------------------------------------------------------
+def profile_columns(df: pd.DataFrame) -> dict:
+    """
+    Profiles every column of a dataset in one pass per column.
+
+    Returns:
+        dict: {'version', 'row_count', 'columns': {column: profile}}, columns in frame order.
+    """
+    return {
+        'version': PROFILE_VERSION,
+        'row_count': len(df),
+        'columns': {col: profile_column(df[col]) for col in df.columns},
+    }
+# -------------------------------------------------------------------------------
+def load_profile(path: str, df: pd.DataFrame) -> dict:
+    """
+    Returns the column profile of a dataset file, reading the one stored in the dataset catalog
+    when it matches the current file version and columns, and profiling + storing it from `df` otherwise.
+
+    Args:
+        path (str): Path of the source CSV or Parquet file.
+        df (pd.DataFrame): The profiled columns of the loaded dataset (see core.sidebar.load_profile).
+
+    Returns:
+        dict: The profile, see `profile_columns`.
+    """
+    profile = dataset_catalog.get_column_profile(path)
+    if profile is not None and profile.get('version') == PROFILE_VERSION and list(profile['columns']) == list(df.columns):
+        return profile
+
+    profile = profile_columns(df)
+    dataset_catalog.set_column_profile(path, profile)
+    return profile
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 1: Profile Query Functions
+# ==================================================================================
+def get_profile_columns(profile: dict, kind: str = None, min_unique: int = None, max_unique: int = None) -> list:
+    """
+    Columns of a profile, optionally of one kind and with a number of distinct values in a range.
+
+    Args:
+        profile (dict): A profile from `profile_columns` or `load_profile`.
+        kind (str): Only columns of this kind, e.g. CATEGORICAL_KIND.
+        min_unique, max_unique (int): Inclusive bounds on the number of distinct values.
+
+    Returns:
+        list: Column names in frame order.
+    """
+    columns = []
+    for col, column_profile in profile['columns'].items():
+        if kind is not None and column_profile['kind'] != kind:
+            continue
+        if min_unique is not None and column_profile['unique_count'] < min_unique:
+            continue
+        if max_unique is not None and column_profile['unique_count'] > max_unique:
+            continue
+        columns.append(col)
+    return columns
+# ===================================================================================
@@ -2,6 +2,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import matplotlib.ticker as mtick
+from core import derived_columns
 
 # This module handles plots for the Dashboard (Home Page)
 
@@ -52,6 +53,7 @@ def plot_violation_type_percentage_pie(df):
     """
     apply_plot_style()
     violation_counts = df['Violation_Type'].value_counts()
+    violation_counts = violation_counts[violation_counts > 0] # Skip unobserved categories
     
     fig, ax = plt.subplots(figsize=FIG_SIZE)
     wedges, texts, autotexts = ax.pie(
@@ -187,7 +189,7 @@ def plot_license_validity_by_gender(df):
     Anshu: License Validity by Gender.
     """
     apply_plot_style()
-    validity_gender = df.groupby(['License_Validity', 'Driver_Gender']).size().unstack(fill_value=0)
+    validity_gender = df.groupby(['License_Validity', 'Driver_Gender'], observed=True).size().unstack(fill_value=0)
     
     fig, ax = plt.subplots(figsize=FIG_SIZE)
     validity_gender.plot(
@@ -246,6 +248,8 @@ def plot_vehicle_type_vs_violation_type(df):
         data=df, 
         x='Violation_Type',
         hue='Vehicle_Type',
+        order=df['Violation_Type'].dropna().unique(),
+        hue_order=df['Vehicle_Type'].dropna().unique(),
         ax=ax,
         palette='Set1',
         edgecolor='black'
@@ -264,34 +268,16 @@ def plot_severity_heatmap_by_location(df):
     Mrunalini: Average Severity Score by Location and Violation Type.
     """
     apply_plot_style()
-    # Helper to calculate severity (Internal logic kept same)
-    def calc_severity_score(row):
-        severity = 0
-        if pd.notnull(row.get('Fine_Amount')): severity += row['Fine_Amount'] / 1000
-        if pd.notnull(row.get('Penalty_Points')): severity += row['Penalty_Points'] 
-        if pd.notnull(row.get('Recorded_Speed')) and pd.notnull(row.get('Speed_Limit')):
-            if row['Recorded_Speed'] > row['Speed_Limit']:
-                severity += (row['Recorded_Speed'] - row['Speed_Limit']) / 10
-        if pd.notnull(row.get('Alcohol_Level')): severity += row['Alcohol_Level'] * 10
-        if row.get('Helmet_Worn') == 'No': severity += 10
-        if row.get('Seatbelt_Worn') == 'No': severity += 10
-        if row.get('Traffic_Light_Status') == 'Red': severity += 15
-        if pd.notnull(row.get('Previous_Violations')): severity += row['Previous_Violations'] * 1.5
-        return severity
-
-    # We need a copy to avoid SettingWithCopyWarning on the original df if modifying
-    # But for dashboard summary df is passed, better to just apply
-    # Optimizing: Calculate on the fly might be slow for full df, but for dashboard summary (last n days) should be fine.
-    
-    # We'll use a local copy to be safe
-    local_df = df.copy()
-    local_df['Violation_Severity_Score'] = local_df.apply(calc_severity_score, axis=1)
+    # Shallow local copy, Copy-on-Write keeps the caller's frame unchanged
+    local_df = df.copy(deep=False)
+    local_df['Violation_Severity_Score'] = derived_columns.get_severity_score(local_df)
     
     location_heatmap = local_df.pivot_table(
         values='Violation_Severity_Score',
         index='Location',
         columns='Violation_Type',
-        aggfunc='mean'
+        aggfunc='mean',
+        observed=True
     )
 
     fig, ax = plt.subplots(figsize=FIG_SIZE)
@@ -1,33 +1,42 @@
+from dataclasses import dataclass
+
+import numpy as np
 import pandas as pd
 import core.dashboard_plot as dashboard_plot
+import core.figure_cache as figure_cache
+import core.derived_columns as derived_columns
+import core.rollup_cube as rollup_cube
 
 # =================================================================================
 def get_violations_summary_of_last_n_days(df_last_n_days: pd.DataFrame) -> dict:
     # 1. calculate the no of violations in last n days
     total_no_of_violations = df_last_n_days.shape[0]
 
-    # 2. Generate a figure of pie chart for violation types
-    fig = dashboard_plot.plot_violation_type_percentage_pie(df_last_n_days)
+    # 2. Generate a figure of pie chart for violation types (rendered PNG bytes)
+    fig = figure_cache.get_figure_image(dashboard_plot.plot_violation_type_percentage_pie, df_last_n_days)
     
     return {
         'total_no_of_violations': total_no_of_violations,
+        'total_vehicle_types': df_last_n_days['Vehicle_Type'].nunique(),
         'fig': fig
     }
 
 # =================================================================================
 def get_total_fines_generated(df_last_n_days: pd.DataFrame) -> dict:
     # 1. calculate total fines in last n days
+    # df_last_n_days may be raw records or a slice of the rollup cube (see core.rollup_cube)
     total_fines = df_last_n_days['Fine_Amount'].sum()
-    avg_fine_per_violation = total_fines / df_last_n_days.shape[0] if df_last_n_days.shape[0] > 0 else 0
+    total_violations = rollup_cube.count_records(df_last_n_days)
+    avg_fine_per_violation = total_fines / total_violations if total_violations > 0 else 0
     # ==============================================================================
     # 2. Prepare data for fines based on violation type
     df_last_n_days['Fine_Amount'] = pd.to_numeric(df_last_n_days['Fine_Amount'], errors='coerce').fillna(0)
     df_last_n_days['Fine_Paid'] = df_last_n_days['Fine_Paid'].astype(str).str.upper().str.strip()
-    summary = (df_last_n_days.groupby(['Violation_Type', 'Fine_Paid'])['Fine_Amount'].sum().unstack(fill_value=0))
+    summary = (df_last_n_days.groupby(['Violation_Type', 'Fine_Paid'], observed=True)['Fine_Amount'].sum().unstack(fill_value=0))
     summary = summary.rename(columns={'YES': 'Paid', 'NO': 'Unpaid'})
     
     # 3. Generate a figure of fines based on violation type
-    fig = dashboard_plot.plot_fines_based_on_violation_type(summary)
+    fig = figure_cache.get_figure_image(dashboard_plot.plot_fines_based_on_violation_type, summary)
     
     return {
         'total_fines': total_fines,
@@ -38,7 +47,7 @@ def get_total_fines_generated(df_last_n_days: pd.DataFrame) -> dict:
 # =================================================================================
 def get_violations_by_location(df_last_n_days: pd.DataFrame) -> dict:
     # 1. No Of Violations for the location
-    location_based_violations = df_last_n_days['Location'].value_counts().reset_index()
+    location_based_violations = rollup_cube.count_by(df_last_n_days, 'Location').reset_index()
     location_based_violations.columns = ['Location', 'No of Violations']
 
     # 2. Total No Of Violations
@@ -57,7 +66,7 @@ def get_violations_by_location(df_last_n_days: pd.DataFrame) -> dict:
         plot_data = location_based_violations
 
     # 5. Plot pie chart for location based violations
-    fig = dashboard_plot.plot_violations_by_location(plot_data)
+    fig = figure_cache.get_figure_image(dashboard_plot.plot_violations_by_location, plot_data)
     
     return {
         'total_locations': total_locations,
@@ -87,7 +96,7 @@ def get_license_insights(df_last_n_days: pd.DataFrame) -> dict:
         expired_percentage = (expired_count / total_licenses) * 100 if total_licenses > 0 else 0
 
     # 3. Generate License Validity Pie Chart
-    validity_fig = dashboard_plot.plot_license_validity_by_gender(df_last_n_days)
+    validity_fig = figure_cache.get_figure_image(dashboard_plot.plot_license_validity_by_gender, df_last_n_days)
     
     return {
         'most_common_license_type': most_common_license_type,
@@ -101,102 +110,128 @@ def get_license_insights(df_last_n_days: pd.DataFrame) -> dict:
 # =======================================================================================================================
 # =======================================================================================================================
 # =======================================================================================================================
-def get_global_overview_metrics(df: pd.DataFrame) -> dict:
+# ---------------------------------------------------------
+# DATASET METRICS CONFIGURATION
+# ---------------------------------------------------------
+# Weather values counted as adverse (compared lower-cased)
+ADVERSE_WEATHER_CONDITIONS = {'fog', 'foggy', 'rain', 'rainy', 'snow', 'snowy', 'thunderstorm', 'hail', 'mist'}
+
+
+@dataclass
+class DatasetMetrics:
     """
-    Generates summary statistics for the Global Data Overview.
+    KPIs of the Global Data Overview and the Behavior & Environmental Analysis.
+    Count / percentage pairs are (count, percentage of total_violations).
     """
-    metrics = {}
-    metrics['total_violations'] = len(df)
-    
-    if 'Violation_Type' in df.columns:
-        metrics['most_common_violation'] = df['Violation_Type'].mode()[0] if not df['Violation_Type'].mode().empty else "N/A"
-    else:
-        metrics['most_common_violation'] = "N/A"
-    
-    if 'Fine_Amount' in df.columns:
-        metrics['avg_fine'] = df['Fine_Amount'].mean()
-        metrics['max_fine'] = df['Fine_Amount'].max()
-        metrics['min_fine'] = df['Fine_Amount'].min()
-    else:
-        metrics['avg_fine'] = 0
-        metrics['max_fine'] = 0
-        metrics['min_fine'] = 0
-    
-    if 'Location' in df.columns:
-        metrics['top_location'] = df['Location'].mode()[0] if not df['Location'].mode().empty else "N/A"
-    else:
-        metrics['top_location'] = "N/A"
-            
-    if 'Issuing_Agency' in df.columns:
-        metrics['top_agency'] = df['Issuing_Agency'].mode()[0] if not df['Issuing_Agency'].mode().empty else "N/A"
-    else:
-        metrics['top_agency'] = "N/A"
+    total_violations: int = 0
+    most_common_violation: str = "N/A"
+    top_location: str = "N/A"
+    top_agency: str = "N/A"
+    common_payment: str = "N/A"
+    avg_fine: float = 0.0
+    max_fine: float = 0.0
+    min_fine: float = 0.0
+    over_speeding_stats: tuple = (0, 0.0)
+    court_appearance_stats: tuple = (0, 0.0)
+    repeat_offender_stats: tuple = (0, 0.0)
+    bad_weather_stats: tuple = (0, 0.0)
+    most_frequent_weather_stats: tuple = ("N/A", 0, 0.0)
+
+
+def get_category_counts(series: pd.Series) -> pd.Series:
+    """
+    Counts every value of a column. Category columns are counted with one bincount over their codes.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        return series.value_counts(sort=False)
+    codes = series.cat.codes.to_numpy()
+    counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+    return pd.Series(counts, index=series.cat.categories)
 
-    if 'Payment_Method' in df.columns:
-        metrics['common_payment'] = df['Payment_Method'].mode()[0] if not df['Payment_Method'].mode().empty else "N/A"
-    else:
-        metrics['common_payment'] = "N/A"
-             
-    return metrics
 
+def get_mode_with_count(series: pd.Series) -> tuple:
+    """
+    Most frequent value of a column and its count. Ties go to the first value in category order.
+    """
+    counts = get_category_counts(series)
+    if counts.empty or counts.max() == 0:
+        return ("N/A", 0)
+    return (counts.index[counts.argmax()], int(counts.max()))
 
-# =======================================================================================================================
-def get_behavioral_analysis(df: pd.DataFrame) -> dict:
+
+def get_dataset_metrics(df: pd.DataFrame) -> DatasetMetrics:
     """
-    Computes flags and returns aggregate counts/percentages for:
-    - Over Speeding
-    - High Fine (>90th percentile)
-    - Repeat Offenders (>2 violations)
-    - Bad Weather Risk
+    Computes every dashboard KPI in one pass over the columns:
+    modes and flag counts come from one bincount per category column, fine statistics from one
+    array reduction, over-speeding from the Excess_Speed column added at load time.
     """
     total_records = len(df)
-    analysis_results = {
-        'total_count': total_records,
-        'over_speeding_stats': (0, 0.0),
-        'court_appearance_stats': (0, 0.0),
-        'repeat_offender_stats': (0, 0.0),
-        'bad_weather_stats': (0, 0.0),
-        'most_frequent_weather_stats': ("N/A", 0, 0.0)
-    }
-
+    metrics = DatasetMetrics(total_violations=total_records)
     if total_records == 0:
-        return analysis_results
+        return metrics
+
+    def get_rate(count):
+        return (int(count), float(count / total_records) * 100)
 
-    # Helper to calculate count and percentage
-    def calculate_stats(boolean_mask):
-        count = boolean_mask.sum()
-        percentage = (count / total_records) * 100
-        return (count, percentage)
+    def get_flag_count(col, values):
+        counts = get_category_counts(df[col])
+        return counts[counts.index.astype(str).str.lower().isin(values)].sum()
+
+    # 1. Most common values
+    for col, field in [
+        ('Violation_Type', 'most_common_violation'), ('Location', 'top_location'),
+        ('Issuing_Agency', 'top_agency'), ('Payment_Method', 'common_payment'),
+    ]:
+        if col in df.columns:
+            setattr(metrics, field, get_mode_with_count(df[col])[0])
+
+    # 2. Fine statistics
+    if 'Fine_Amount' in df.columns:
+        fines = pd.to_numeric(df['Fine_Amount'], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+        fines = fines[~np.isnan(fines)]
+        if fines.size > 0:
+            metrics.avg_fine, metrics.max_fine, metrics.min_fine = float(fines.mean()), float(fines.max()), float(fines.min())
 
-    # 1. Over Speeding
-    analysis_results['over_speeding_stats'] = calculate_stats(df['Recorded_Speed'] > df['Speed_Limit'])
+    # 3. Over Speeding
+    if {'Recorded_Speed', 'Speed_Limit'}.issubset(df.columns):
+        excess_speed = derived_columns.get_derived_column(df, derived_columns.EXCESS_SPEED_COLUMN)
+        metrics.over_speeding_stats = get_rate((excess_speed.to_numpy(dtype='float64', na_value=0) > 0).sum())
 
-    # 2. Court Appearance Required
+    # 4. Court Appearance Required
     if 'Court_Appearance_Required' in df.columns:
-        analysis_results['court_appearance_stats'] = calculate_stats(df['Court_Appearance_Required'] == 'Yes')
+        metrics.court_appearance_stats = get_rate(get_flag_count('Court_Appearance_Required', {'yes'}))
 
-    # 3. Repeat Offenders (Based on Comments == 'Repeat Offender')
+    # 5. Repeat Offenders (rows whose Comments are 'Repeat Offender')
     if 'Comments' in df.columns:
-        repeat_offender_counts = df[df['Comments'] == 'Repeat Offender'].value_counts().sum()
-        if len(df) > 0:
-            repeat_offender_pct = (repeat_offender_counts / len(df)) * 100
-
-        analysis_results['repeat_offender_stats'] = (repeat_offender_counts, repeat_offender_pct)
+        metrics.repeat_offender_stats = get_rate(get_flag_count('Comments', {'repeat offender'}))
 
+    # 6. Weather
     if 'Weather_Condition' in df.columns:
-        adverse_weather_conditions = {'fog', 'rain', 'snow', 'thunderstorm', 'hail', 'mist'}
-        # Case-insensitive check
-        is_adverse_weather = df['Weather_Condition'].astype(str).str.lower().isin(adverse_weather_conditions)
-        analysis_results['bad_weather_stats'] = calculate_stats(is_adverse_weather)
-        
-        # Top Weather
-        if not df['Weather_Condition'].empty:
-            weather_mode_result = df['Weather_Condition'].mode()
-            if not weather_mode_result.empty:
-                tps_weather_name = weather_mode_result[0]
-                tps_weather_count = (df['Weather_Condition'] == tps_weather_name).sum()
-                analysis_results['most_frequent_weather_stats'] = (tps_weather_name, tps_weather_count, (tps_weather_count / total_records) * 100)
-    return analysis_results
+        metrics.bad_weather_stats = get_rate(get_flag_count('Weather_Condition', ADVERSE_WEATHER_CONDITIONS))
+        top_weather_name, top_weather_count = get_mode_with_count(df['Weather_Condition'])
+        if top_weather_count > 0:
+            metrics.most_frequent_weather_stats = (top_weather_name,) + get_rate(top_weather_count)
+    return metrics
+
+
+# =======================================================================================================================
+def get_global_overview_metrics(df: pd.DataFrame) -> DatasetMetrics:
+    """
+    Generates summary statistics for the Global Data Overview.
+    """
+    return get_dataset_metrics(df)
+
+
+# =======================================================================================================================
+def get_behavioral_analysis(df: pd.DataFrame) -> DatasetMetrics:
+    """
+    Computes aggregate counts/percentages for:
+    - Over Speeding
+    - Court Appearance Required
+    - Repeat Offenders
+    - Bad Weather Risk
+    """
+    return get_dataset_metrics(df)
 
 
 # =======================================================================================================================
\ No newline at end of file
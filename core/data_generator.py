@@ -1,6 +1,11 @@
-import random
-from datetime import datetime, timedelta
-from faker import Faker
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 
 from core.data_variables import (
@@ -29,120 +34,369 @@ from core.data_variables import (
     payment_methods_mapping
 )
 
+# This module generates synthetic traffic violation datasets.
+# Whole columns are drawn at once with a numpy.random.Generator; text columns are built as
+# pandas Categoricals (integer codes + categories) so no per-record Python objects are created.
 
 # ---------------------------------------
 # FAKE DATA GENERATOR SETUP
 # ---------------------------------------
-fake = Faker("en_IN")
-
-# SINGLE RECORD GENERATOR
-def generate_record(idx, date: datetime.date):
-    violation_id = f"VLT{idx:06d}"
-    violation_type = random.choice(violation_types_list)
-    fine_amount = fine_mapping.get(violation_type, random.randint(100, 10000))
-    location = random.choice(states_list)
-    date = date.strftime("%Y-%m-%d")
-    time = fake.time()
-
-    vehicle_type = random.choice(vehicle_types_mapping.get(violation_type, []))
-    vehicle_color = random.choice(vehicle_colors_list)
-
-    vehicle_model_year = random.randint(1990, int(datetime.strptime(date, "%Y-%m-%d").date().year))
-
-    registration_state = random.choice(states_list)
-
-    helmet_worn = helmet_worn_mapping.get(vehicle_type, "NA")
-    seatbelt_worn = seatbelt_worn_mapping.get(vehicle_type, "NA")
-
-    driver_age = random.randint(18, 80)
-    driver_gender = random.choice(driver_genders_list)
-
-    number_of_passengers = no_of_passengers_mapping.get(vehicle_type, random.randint(0, 50))
-
-    penalty_points = random.randint(0, 8)
-    weather_condition = random.choice(weather_conditions_list)
-    road_condition = random.choice(road_conditions_list)
-
-    officer_id = f"OFF{random.randint(1000, 9999)}"
-    license_type = random.choice(license_types_list)
-    issuing_agency = random.choice(issuing_agencies_list)
-    license_validity = random.choice(license_validity_list)
-    
-    traffic_light_status = random.choice(["Red", "Green", "Yellow"])
-    
-    speed_limit = random.randint(20, 120)
-    recorded_speed = random.randint(0, 200)
-    
-    breathalyzer_result = random.choice(breathalyzer_results_list)
-    alcohol_level = alcohol_levels_mapping.get(breathalyzer_result, 0.00)
-
-    towed = towing_mapping.get(violation_type, "No")
-    # -------------------------
-    # Fine logic
-    fine_paid = "NA"
-    six_year_rule_date = datetime.today().date().replace(year=datetime.today().year - 6)
-    if datetime.strptime(date, "%Y-%m-%d").date() < six_year_rule_date:
-        fine_paid = "Yes"
-    else:
-        fine_paid = random.choice(["Yes", "No"])
-    # --------------------------
-    payment_method = payment_methods_mapping.get(fine_paid, "NA")
-
-    court_appearance_required = court_mapping.get(violation_type, "No")
-    previous_violations = random.randint(0, 20)
-    comments = random.choice(comments_list)
-
-    record = {
-        "Violation_ID": violation_id,
+# Column order of the generated files
+GENERATED_COLUMNS = [
+    "Violation_ID", "Violation_Type", "Fine_Amount", "Location", "Date", "Time",
+    "Vehicle_Type", "Vehicle_Color", "Vehicle_Model_Year", "Registration_State",
+    "Helmet_Worn", "Seatbelt_Worn", "Driver_Age", "Driver_Gender", "Number_of_Passengers",
+    "Penalty_Points", "Weather_Condition", "Road_Condition", "Officer_ID", "License_Type",
+    "Issuing_Agency", "License_Validity", "Traffic_Light_Status", "Speed_Limit", "Recorded_Speed",
+    "Alcohol_Level", "Breathalyzer_Result", "Towed", "Fine_Paid", "Payment_Method",
+    "Court_Appearance_Required", "Previous_Violations", "Comments"
+]
+
+# Records per chunk when a dataset is generated and written in chunks
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Every "HH:MM:SS" of a day and every officer ID, indexed by the drawn integer
+TIME_OF_DAY_LABELS = np.array([f"{s // 3600:02d}:{s % 3600 // 60:02d}:{s % 60:02d}" for s in range(24 * 60 * 60)], dtype=object)
+OFFICER_ID_LABELS = np.array([f"OFF{n}" for n in range(1000, 10000)], dtype=object)
+
+
+# ==================================================================================
+# Block 0: Vectorized Drawing Helpers
+# ==================================================================================
+def draw_choice(rng: np.random.Generator, choices: list, size: int) -> pd.Categorical:
+    """
+    Draws `size` values from a choice list. Repeated entries keep their higher probability,
+    same as `random.choice` on the list.
+    """
+    categories, counts = np.unique(np.asarray(choices, dtype=object), return_counts=True)
+    codes = rng.choice(len(categories), size=size, p=counts / counts.sum())
+    return pd.Categorical.from_codes(codes, categories=categories)
+# -------------------------------------------------------------------------------
+def draw_choice_by_key(rng: np.random.Generator, keys: pd.Categorical, mapping: dict, default: str = None) -> pd.Categorical:
+    """
+    Draws one value per row from `mapping[key]`, the choice list of the row's key.
+    Rows whose key is not in the mapping get `default` (a missing value when None).
+    """
+    values = [v for choices in mapping.values() for v in choices]
+    categories = np.unique(np.asarray(values + ([default] if default is not None else []), dtype=object))
+    default_code = np.searchsorted(categories, default) if default is not None else -1
+    codes = np.full(len(keys), default_code, dtype='int64')
+    for key_code, key in enumerate(keys.categories):
+        rows = np.flatnonzero(keys.codes == key_code)
+        if key not in mapping or len(rows) == 0:
+            continue
+        sub_categories, counts = np.unique(np.asarray(mapping[key], dtype=object), return_counts=True)
+        sub_codes = rng.choice(len(sub_categories), size=len(rows), p=counts / counts.sum())
+        codes[rows] = np.searchsorted(categories, sub_categories)[sub_codes]
+    return pd.Categorical.from_codes(codes, categories=categories)
+# -------------------------------------------------------------------------------
+def draw_integer_by_key(rng: np.random.Generator, keys: pd.Categorical, mapping: dict, default: tuple) -> np.ndarray:
+    """
+    Draws one whole number per row from the (low, high) range of the row's key, both ends included.
+    Rows whose key is not in the mapping use the `default` range.
+    """
+    low, high = np.array([mapping.get(key, default) for key in keys.categories] + [default], dtype='int64').T
+    codes = np.where(keys.codes >= 0, keys.codes, len(keys.categories))
+    return rng.integers(low[codes], high[codes] + 1)
+# -------------------------------------------------------------------------------
+def draw_decimal_by_key(rng: np.random.Generator, keys: pd.Categorical, mapping: dict, default: tuple, decimals: int = 2) -> np.ndarray:
+    """
+    Draws one rounded decimal per row, uniformly from the (low, high) range of the row's key.
+    Rows whose key is not in the mapping use the `default` range.
+    """
+    low, high = np.array([mapping.get(key, default) for key in keys.categories] + [default], dtype='float64').T
+    codes = np.where(keys.codes >= 0, keys.codes, len(keys.categories))
+    return np.round(rng.uniform(low[codes], high[codes]), decimals)
+# -------------------------------------------------------------------------------
+def from_labels(codes: np.ndarray, labels: np.ndarray) -> pd.Categorical:
+    """
+    Builds a Categorical of the used `labels` entries, without formatting a string per row.
+    """
+    used, codes = np.unique(codes, return_inverse=True)
+    return pd.Categorical.from_codes(codes, categories=labels[used])
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 1: Dataset Generator Functions
+# ==================================================================================
+def generate_violations(dates: np.ndarray, first_id: int = 1, seed=None, reference_date=None) -> pd.DataFrame:
+    """
+    Generates one violation record per entry of `dates`.
+
+    Args:
+        dates (np.ndarray): datetime64[D] date of every record, in output order.
+        first_id (int): Number used for the first Violation_ID (VLT000001, ...).
+        seed: Seed or numpy Generator. None draws fresh OS entropy.
+        reference_date: "Today" for the six-year fine rule. Defaults to the current date.
+
+    Returns:
+        pd.DataFrame: The generated records in GENERATED_COLUMNS order.
+    """
+    rng = np.random.default_rng(seed)
+    size = len(dates)
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    years = dates.astype('datetime64[Y]').astype('int64') + 1970
+
+    violation_ids = first_id + np.arange(size)
+    violation_type = draw_choice(rng, violation_types_list, size)
+    vehicle_type = draw_choice_by_key(rng, violation_type, vehicle_types_mapping)
+
+    # Fines older than six years are always paid
+    today = pd.Timestamp(reference_date if reference_date is not None else datetime.today().date())
+    six_year_rule_date = np.datetime64((today - pd.DateOffset(years=6)).date(), 'D')
+    fine_paid_codes = rng.integers(0, 2, size)
+    fine_paid_codes[dates < six_year_rule_date] = 1
+    fine_paid = pd.Categorical.from_codes(fine_paid_codes, categories=["No", "Yes"])
+
+    breathalyzer_result = draw_choice(rng, breathalyzer_results_list, size)
+
+    df = pd.DataFrame({
+        "Violation_ID": np.char.add("VLT", np.char.zfill(violation_ids.astype(str), 6)),
         "Violation_Type": violation_type,
-        "Fine_Amount": fine_amount,
-        "Location": location,
-        "Date": date,
-        "Time": time,
+        "Fine_Amount": draw_integer_by_key(rng, violation_type, fine_mapping, (100, 10000)),
+        "Location": draw_choice(rng, states_list, size),
+        "Date": dates.astype('datetime64[ns]'),
+        "Time": from_labels(rng.integers(0, len(TIME_OF_DAY_LABELS), size), TIME_OF_DAY_LABELS),
         "Vehicle_Type": vehicle_type,
-        "Vehicle_Color": vehicle_color,
-        "Vehicle_Model_Year": vehicle_model_year,
-        "Registration_State": registration_state,
-        "Helmet_Worn": helmet_worn,
-        "Seatbelt_Worn": seatbelt_worn,   
-        "Driver_Age": driver_age,
-        "Driver_Gender": driver_gender,
-        "Number_of_Passengers": number_of_passengers,
-        "Penalty_Points": penalty_points,
-        "Weather_Condition": weather_condition,
-        "Road_Condition": road_condition,
-        "Officer_ID": officer_id,
-        "License_Type": license_type,
-        "Issuing_Agency": issuing_agency,
-        "License_Validity": license_validity,
-        "Traffic_Light_Status": traffic_light_status,
-        "Speed_Limit": speed_limit,
-        "Recorded_Speed": recorded_speed,
-        "Alcohol_Level": alcohol_level,
+        "Vehicle_Color": draw_choice(rng, vehicle_colors_list, size),
+        "Vehicle_Model_Year": rng.integers(1990, years + 1),
+        "Registration_State": draw_choice(rng, states_list, size),
+        "Helmet_Worn": draw_choice_by_key(rng, vehicle_type, helmet_worn_mapping, "NA"),
+        "Seatbelt_Worn": draw_choice_by_key(rng, vehicle_type, seatbelt_worn_mapping, "NA"),
+        "Driver_Age": rng.integers(18, 81, size),
+        "Driver_Gender": draw_choice(rng, driver_genders_list, size),
+        "Number_of_Passengers": draw_integer_by_key(rng, vehicle_type, no_of_passengers_mapping, (0, 50)),
+        "Penalty_Points": rng.integers(0, 9, size),
+        "Weather_Condition": draw_choice(rng, weather_conditions_list, size),
+        "Road_Condition": draw_choice(rng, road_conditions_list, size),
+        "Officer_ID": from_labels(rng.integers(0, len(OFFICER_ID_LABELS), size), OFFICER_ID_LABELS),
+        "License_Type": draw_choice(rng, license_types_list, size),
+        "Issuing_Agency": draw_choice(rng, issuing_agencies_list, size),
+        "License_Validity": draw_choice(rng, license_validity_list, size),
+        "Traffic_Light_Status": draw_choice(rng, ["Red", "Green", "Yellow"], size),
+        "Speed_Limit": rng.integers(20, 121, size),
+        "Recorded_Speed": rng.integers(0, 201, size),
+        "Alcohol_Level": draw_decimal_by_key(rng, breathalyzer_result, alcohol_levels_mapping, (0.0, 0.0)),
         "Breathalyzer_Result": breathalyzer_result,
-        "Towed": towed,
+        "Towed": draw_choice_by_key(rng, violation_type, towing_mapping, "No"),
         "Fine_Paid": fine_paid,
-        "Payment_Method": payment_method,
-        "Court_Appearance_Required": court_appearance_required,
-        "Previous_Violations": previous_violations,
-        "Comments": comments
-    }
-    
-    return record
+        "Payment_Method": draw_choice_by_key(rng, fine_paid, payment_methods_mapping, "NA"),
+        "Court_Appearance_Required": draw_choice_by_key(rng, violation_type, court_mapping, "No"),
+        "Previous_Violations": rng.integers(0, 21, size),
+        "Comments": draw_choice(rng, comments_list, size),
+    })
+    return df[GENERATED_COLUMNS]
+# -------------------------------------------------------------------------------
+def draw_daily_counts(start_date: str, end_date: str, min_records_per_day: int, max_records_per_day: int, seed=None):
+    """
+    Draws a record count for every day between the two dates (inclusive).
+
+    Returns:
+        tuple: (datetime64[D] array of days, int array of record counts per day)
+    """
+    rng = np.random.default_rng(seed)
+    days = np.arange(np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D') + 1)
+    daily_counts = rng.integers(min_records_per_day, max_records_per_day + 1, len(days))
+    return days, daily_counts
 
 
 # DATASET GENERATOR — DAY BY DAY
-def generate_dataset_by_days(start_date=("2015-01-01"), end_date=(datetime.now().date().strftime("%Y-%m-%d")), min_records_per_day=5, max_records_per_day=15):
-    
-    current_date = datetime.strptime(start_date, "%Y-%m-%d").date()
-    end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
-    
-    violation_counter = 1
-    records = []
-    while current_date <= end_date:
-        daily_count = random.randint(min_records_per_day, max_records_per_day)
-        for _ in range(daily_count):
-            records.append(generate_record(violation_counter, current_date))
-            violation_counter += 1
-        current_date += timedelta(days=1)
-    return records
\ No newline at end of file
+def generate_dataset_by_days(start_date=("2015-01-01"), end_date=(datetime.now().date().strftime("%Y-%m-%d")), min_records_per_day=5, max_records_per_day=15, seed=None):
+    """
+    Generates a synthetic dataset with a random number of records for each day between the two dates.
+    Pass the same `seed` to get the same dataset again.
+
+    Returns:
+        pd.DataFrame: The generated records.
+    """
+    rng = np.random.default_rng(seed)
+    days, daily_counts = draw_daily_counts(start_date, end_date, min_records_per_day, max_records_per_day, rng)
+    return generate_violations(np.repeat(days, daily_counts), first_id=1, seed=rng)
+# -------------------------------------------------------------------------------
+def generate_dataset_chunks(days: np.ndarray, daily_counts: np.ndarray, chunk_rows: int = DEFAULT_CHUNK_ROWS, seed=None,
+                            first_id: int = 1, reference_date=None):
+    """
+    Generates the dataset in chunks of whole days with about `chunk_rows` records each,
+    so only one chunk is held in memory. Violation IDs continue across chunks.
+
+    Args:
+        days (np.ndarray): Days to generate, from `draw_daily_counts`.
+        daily_counts (np.ndarray): Records per day, from `draw_daily_counts`.
+        chunk_rows (int): Target number of records per chunk.
+        seed: Seed or numpy Generator.
+        first_id (int): Number used for the first Violation_ID.
+        reference_date: "Today" for the six-year fine rule, see `generate_violations`.
+
+    Yields:
+        pd.DataFrame: The next chunk of records.
+    """
+    rng = np.random.default_rng(seed)
+    row_ends = np.cumsum(daily_counts)
+    first_day, rows_done = 0, 0
+    while first_day < len(days):
+        # Last day whose records still fit in the chunk (always at least one day)
+        last_day = max(int(np.searchsorted(row_ends, rows_done + chunk_rows, side='right')), first_day + 1)
+        dates = np.repeat(days[first_day:last_day], daily_counts[first_day:last_day])
+        yield generate_violations(dates, first_id=first_id + rows_done, seed=rng, reference_date=reference_date)
+        rows_done += len(dates)
+        first_day = last_day
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 2: Chunked Writer Functions
+# ==================================================================================
+def write_dataset_chunks(chunks, file_path: str, total_rows: int = None, progress_callback=None) -> int:
+    """
+    Writes generated chunks to a CSV or Parquet file (chosen by the file extension) as they are produced.
+    The file is written under a temporary name and renamed at the end, so a partial file is never listed.
+
+    Args:
+        chunks: Iterable of DataFrames with the same columns.
+        file_path (str): Output path ending in '.csv' or '.parquet'.
+        total_rows (int): Expected number of rows, used for the progress fraction.
+        progress_callback: Called as `progress_callback(rows_written, total_rows)` after every chunk.
+
+    Returns:
+        int: The number of rows written.
+    """
+    temp_path = f"{file_path}.part"
+    is_parquet = file_path.endswith(".parquet")
+    rows_written = 0
+    writer = None
+    try:
+        for chunk in chunks:
+            if is_parquet:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    schema = get_parquet_schema(table.schema)
+                    writer = pq.ParquetWriter(temp_path, schema)
+                writer.write_table(table.cast(schema))
+            else:
+                chunk.to_csv(temp_path, mode='w' if rows_written == 0 else 'a', header=rows_written == 0, index=False)
+            rows_written += len(chunk)
+            if progress_callback:
+                progress_callback(rows_written, total_rows)
+        if writer is not None:
+            writer.close()
+            writer = None
+        os.replace(temp_path, file_path)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return rows_written
+# -------------------------------------------------------------------------------
+def get_parquet_schema(schema: pa.Schema) -> pa.Schema:
+    """
+    Uses int32 dictionary indices for every categorical column,
+    since each chunk may have picked a different index width.
+    """
+    fields = []
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            field = field.with_type(pa.dictionary(pa.int32(), field.type.value_type))
+        fields.append(field)
+    return pa.schema(fields, metadata=schema.metadata)
+# -------------------------------------------------------------------------------
+def save_generated_dataset(file_path: str, start_date: str, end_date: str, min_records_per_day: int, max_records_per_day: int,
+                           chunk_rows: int = DEFAULT_CHUNK_ROWS, seed=None, progress_callback=None) -> int:
+    """
+    Generates a dataset chunk by chunk and streams it to `file_path` (CSV or Parquet) at constant memory.
+
+    Returns:
+        int: The number of rows written.
+    """
+    rng = np.random.default_rng(seed)
+    days, daily_counts = draw_daily_counts(start_date, end_date, min_records_per_day, max_records_per_day, rng)
+    chunks = generate_dataset_chunks(days, daily_counts, chunk_rows, rng)
+    return write_dataset_chunks(chunks, file_path, int(daily_counts.sum()), progress_callback)
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 3: Parallel Partitioned Generator Functions
+# ==================================================================================
+def get_year_seed_sequences(seed: int, year: int):
+    """
+    Returns the (daily counts, records) seed sequences of one year.
+    They only depend on the seed and the year, never on how the years are split between workers.
+    """
+    return np.random.SeedSequence(seed, spawn_key=(year,)).spawn(2)
+# -------------------------------------------------------------------------------
+def plan_year_partitions(start_date: str, end_date: str, min_records_per_day: int, max_records_per_day: int, seed: int) -> list:
+    """
+    Splits the date range into one partition per year and draws the daily record counts of each,
+    so every partition knows its first Violation_ID before any record is generated.
+
+    Returns:
+        list: One dict per year with 'year', 'days', 'daily_counts' and 'first_id'.
+    """
+    partitions = []
+    first_id = 1
+    start_year, end_year = int(start_date[:4]), int(end_date[:4])
+    for year in range(start_year, end_year + 1):
+        year_start = max(start_date, f"{year}-01-01")
+        year_end = min(end_date, f"{year}-12-31")
+        counts_sequence, _ = get_year_seed_sequences(seed, year)
+        days, daily_counts = draw_daily_counts(year_start, year_end, min_records_per_day, max_records_per_day, counts_sequence)
+        partitions.append({'year': year, 'days': days, 'daily_counts': daily_counts, 'first_id': first_id})
+        first_id += int(daily_counts.sum())
+    return partitions
+# -------------------------------------------------------------------------------
+def generate_year_partition(partition: dict, output_dir: str, file_format: str, seed: int, chunk_rows: int, reference_date) -> str:
+    """
+    Process pool worker: generates and writes the file of one year partition.
+
+    Returns:
+        str: Path of the written file.
+    """
+    _, records_sequence = get_year_seed_sequences(seed, partition['year'])
+    file_path = os.path.join(output_dir, f"traffic_dataset_{partition['year']}.{file_format}")
+    chunks = generate_dataset_chunks(
+        partition['days'], partition['daily_counts'], chunk_rows, records_sequence,
+        first_id=partition['first_id'], reference_date=reference_date
+    )
+    write_dataset_chunks(chunks, file_path, int(partition['daily_counts'].sum()))
+    return file_path
+# -------------------------------------------------------------------------------
+def generate_partitioned_dataset(output_dir: str, start_date: str, end_date: str, min_records_per_day: int, max_records_per_day: int,
+                                 seed: int, workers: int = None, file_format: str = "parquet",
+                                 chunk_rows: int = DEFAULT_CHUNK_ROWS, reference_date=None) -> list:
+    """
+    Generates a dataset as one file per year, in parallel over a process pool.
+
+    Each year draws from its own seed sequence derived from (seed, year), and the Violation IDs of
+    every year start where the previous year ends. The same arguments therefore give byte-identical
+    files whatever the number of workers.
+
+    Args:
+        output_dir (str): Directory for the 'traffic_dataset_<year>.<format>' files.
+        start_date (str): First day, 'YYYY-MM-DD'.
+        end_date (str): Last day, 'YYYY-MM-DD'.
+        min_records_per_day (int): Minimum records per day.
+        max_records_per_day (int): Maximum records per day.
+        seed (int): Seed of the whole dataset.
+        workers (int): Number of processes. None uses one per CPU, 1 runs in this process.
+        file_format (str): 'parquet' or 'csv'.
+        chunk_rows (int): Records per written chunk inside a year file.
+        reference_date: "Today" for the six-year fine rule. Pass a fixed date to reproduce old runs.
+
+    Returns:
+        list: Paths of the written files, in year order.
+    """
+    if reference_date is None:
+        reference_date = datetime.today().date()
+    os.makedirs(output_dir, exist_ok=True)
+    partitions = plan_year_partitions(start_date, end_date, min_records_per_day, max_records_per_day, seed)
+    task_args = (output_dir, file_format, seed, chunk_rows, reference_date)
+
+    if workers == 1:
+        return [generate_year_partition(partition, *task_args) for partition in partitions]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(generate_year_partition, partition, *task_args) for partition in partitions]
+        return [future.result() for future in futures]
+# ===================================================================================
@@ -0,0 +1,471 @@
+import os
+import glob
+import bisect
+import shutil
+import hashlib
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core.data_variables import TRAFFIC_VIOLATION_COLUMNS, CATEGORY_VOCABULARIES
+
+# This module handles typed loading of traffic violation datasets
+
+# ---------------------------------------------------------
+# SCHEMA CONFIGURATION
+# ---------------------------------------------------------
+# Date column is parsed once at load time with a fixed format
+DATE_COLUMN = 'Date'
+DATE_FORMAT = '%Y-%m-%d'
+
+# Unique per record, kept as plain strings
+ID_COLUMNS = ['Violation_ID']
+
+# Whole number columns, downcast to the smallest signed integer type that fits
+INTEGER_COLUMNS = [
+    'Fine_Amount', 'Vehicle_Model_Year', 'Driver_Age', 'Penalty_Points',
+    'Number_of_Passengers', 'Speed_Limit', 'Recorded_Speed', 'Previous_Violations'
+]
+
+# Decimal columns, kept as float64 so displayed values are unchanged
+FLOAT_COLUMNS = ['Alcohol_Level']
+
+# Low-cardinality text columns, stored as pandas 'category' (int8 / int16 codes + one dictionary per column)
+CATEGORICAL_COLUMNS = [
+    col for col in TRAFFIC_VIOLATION_COLUMNS
+    if col not in ID_COLUMNS + INTEGER_COLUMNS + FLOAT_COLUMNS + [DATE_COLUMN]
+]
+
+# Text columns of other files are dictionary-encoded when at most this share of the values is distinct
+DYNAMIC_CATEGORY_RATIO = 0.5
+
+# Category dictionaries shared by every loaded dataset, keyed by (column, categories)
+SHARED_CATEGORY_DTYPES = {}
+
+# Dataset file types listed in the dataset selectors
+DATASET_EXTENSIONS = ('.csv', '.parquet')
+
+# ---------------------------------------------------------
+# PARQUET CACHE CONFIGURATION
+# ---------------------------------------------------------
+# Typed copies of every loaded CSV are kept here, keyed by source path, mtime and size.
+# Each copy is a directory of Parquet part files: appended records (see core.dataset_append) become a new part.
+CACHE_DIR = ".dataset_cache"
+# Bumped whenever the typed schema or the cache layout changes so older cache files are rebuilt
+CACHE_SCHEMA_VERSION = 4
+CACHE_PART_PATTERN = "part-*.parquet"
+
+# Records appended to a Parquet dataset are stored next to it as '<name>.delta-00001.parquet', ...
+DELTA_PART_MARKER = ".delta-"
+
+# ---------------------------------------------------------
+# DATE INDEX CONFIGURATION
+# ---------------------------------------------------------
+# Marks frames sorted by 'Date' in `DataFrame.attrs` (set by `sort_by_date`).
+# pandas carries attrs over to copies and row filters, which keep the order; frames re-ordered
+# by another column must not be passed to the date functions below with the tag.
+DATE_SORTED_ATTR = 'date_sorted'
+
+
+# ==================================================================================
+# Block 0: Typed CSV Reading Functions
+# ==================================================================================
+def get_read_dtypes(columns: list) -> dict:
+    """
+    Builds the `dtype` mapping passed to `pd.read_csv` for the known schema columns.
+
+    Args:
+        columns (list): Column names present in the file header.
+
+    Returns:
+        dict: Mapping of column name to the dtype used while parsing.
+    """
+    dtypes = {}
+    for col in columns:
+        if col in ID_COLUMNS or col == DATE_COLUMN:
+            dtypes[col] = str
+        elif col in CATEGORICAL_COLUMNS:
+            dtypes[col] = 'category'
+    return dtypes
+# -------------------------------------------------------------------------------
+def parse_date_column(raw_dates: pd.Series) -> pd.Series:
+    """
+    Parses the 'Date' column with the fixed DATE_FORMAT.
+    Only the rows that do not match the format are re-parsed with format='mixed'.
+    """
+    dates = pd.to_datetime(raw_dates, format=DATE_FORMAT, errors='coerce')
+    unparsed = dates.isna() & raw_dates.notna()
+    if unparsed.any():
+        dates[unparsed] = pd.to_datetime(raw_dates[unparsed], format='mixed', errors='coerce')
+    return dates
+# -------------------------------------------------------------------------------
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Converts the known schema columns of an already parsed DataFrame to their compact dtypes.
+    Low-cardinality text columns outside TRAFFIC_VIOLATION_COLUMNS get a dynamic category dictionary,
+    other columns are left untouched.
+    """
+    for col in df.columns:
+        if col in INTEGER_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors='coerce', downcast='integer')
+        elif col in FLOAT_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        elif col in CATEGORICAL_COLUMNS:
+            df[col] = encode_category_column(df[col], col)
+        elif col == DATE_COLUMN and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = parse_date_column(df[col])
+        elif col not in TRAFFIC_VIOLATION_COLUMNS and is_low_cardinality_text(df[col]):
+            df[col] = encode_category_column(df[col], col)
+    return df
+# -------------------------------------------------------------------------------
+def downcast_integer_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Downcasts the INTEGER_COLUMNS stored wider than needed, e.g. in caches written chunk by chunk
+    (see core.dataset_ingest), where every chunk has to use the same 64-bit type.
+    """
+    for col in INTEGER_COLUMNS:
+        if col in df.columns and df[col].dtype == np.int64:
+            df[col] = pd.to_numeric(df[col], downcast='integer')
+    return df
+# -------------------------------------------------------------------------------
+def read_typed_csv(path: str) -> pd.DataFrame:
+    """
+    Reads a CSV file using the traffic violation schema.
+
+    Known columns are read with explicit dtypes: text columns become 'category',
+    integer columns are downcast and 'Date' is parsed once into datetime64.
+    Other columns keep the default pandas dtypes, except low-cardinality text columns.
+    Rows are sorted by 'Date' (see `sort_by_date`).
+
+    Args:
+        path (str): Path of the CSV file.
+
+    Returns:
+        pd.DataFrame: The typed DataFrame.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    df = pd.read_csv(path, dtype=get_read_dtypes(header))
+    return sort_by_date(apply_schema(df))
+# -------------------------------------------------------------------------------
+def read_dataset_head(path: str, n: int = 5) -> pd.DataFrame:
+    """
+    Reads only the first `n` rows of a CSV or Parquet dataset, for previews.
+    """
+    if path.endswith('.parquet'):
+        first_batch = next(pq.ParquetFile(path).iter_batches(batch_size=n), None)
+        return first_batch.to_pandas() if first_batch is not None else pd.DataFrame()
+    return pd.read_csv(path, nrows=n)
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 1: Category Encoding Functions
+# ==================================================================================
+def get_category_dtype(col: str, values) -> pd.CategoricalDtype:
+    """
+    Returns the shared category dictionary for a column.
+
+    The categories are the `CATEGORY_VOCABULARIES` entry of the column plus any other values
+    found in the data, sorted. Datasets with the same categories share one dtype object,
+    so every generated dataset uses the same integer code for the same value.
+
+    Args:
+        col (str): Column name.
+        values: Distinct non-missing values present in the data.
+
+    Returns:
+        pd.CategoricalDtype: The shared dtype.
+    """
+    categories = sorted(set(CATEGORY_VOCABULARIES.get(col, [])).union(values), key=str)
+    key = (col, tuple(categories))
+    if key not in SHARED_CATEGORY_DTYPES:
+        SHARED_CATEGORY_DTYPES[key] = pd.CategoricalDtype(categories)
+    return SHARED_CATEGORY_DTYPES[key]
+# -------------------------------------------------------------------------------
+def encode_category_column(series: pd.Series, col: str) -> pd.Series:
+    """
+    Dictionary-encodes a text column with its shared category dtype.
+    pandas stores the codes as int8 up to 127 categories and int16 up to 32767.
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    return recode_category_column(series, get_category_dtype(col, series.cat.categories))
+# -------------------------------------------------------------------------------
+def recode_category_column(series: pd.Series, dtype: pd.CategoricalDtype) -> pd.Series:
+    """
+    Maps the codes of a categorical column onto `dtype`, whose categories must include the column's.
+    """
+    # Recode explicitly: astype() skips the recode when only the category order differs
+    # The appended -1 keeps missing values (code -1) missing, also for columns without categories
+    codes = np.append(dtype.categories.get_indexer(series.cat.categories), -1)[series.cat.codes]
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=dtype), index=series.index, name=series.name)
+# -------------------------------------------------------------------------------
+def unify_category_dtypes(left: pd.DataFrame, right: pd.DataFrame) -> tuple:
+    """
+    Gives the unordered category columns of two frames one shared dtype, so `pd.concat` keeps
+    them categorical instead of falling back to object columns.
+    Only the columns whose dictionaries differ are recoded, the input frames are not modified.
+
+    Returns:
+        tuple: (left, right) with matching category dtypes.
+    """
+    left, right = left.copy(deep=False), right.copy(deep=False)
+    for col in left.columns.intersection(right.columns):
+        left_dtype = left[col].dtype
+        if not isinstance(left_dtype, pd.CategoricalDtype) or left_dtype.ordered or left_dtype == right[col].dtype:
+            continue
+        if not isinstance(right[col].dtype, pd.CategoricalDtype):
+            right[col] = right[col].astype('category')
+        dtype = get_category_dtype(col, left_dtype.categories.union(right[col].cat.categories))
+        if dtype != left_dtype:
+            left[col] = recode_category_column(left[col], dtype)
+        right[col] = recode_category_column(right[col], dtype)
+    return left, right
+# -------------------------------------------------------------------------------
+def is_low_cardinality_text(series: pd.Series) -> bool:
+    """
+    Checks if a column of an uploaded file is text with few enough distinct values to encode.
+    """
+    if series.dtype != object or series.empty:
+        return False
+    return series.nunique() <= len(series) * DYNAMIC_CATEGORY_RATIO
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 2: Parquet Cache Functions
+# ==================================================================================
+def get_cache_prefix(path: str) -> str:
+    """
+    Returns the cache file prefix shared by every cached version of a source file.
+    """
+    path_hash = hashlib.blake2b(os.path.abspath(path).encode('utf-8'), digest_size=8).hexdigest()
+    file_stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f"{file_stem}-{path_hash}")
+# -------------------------------------------------------------------------------
+def get_cache_path(path: str) -> str:
+    """
+    Returns the Parquet cache directory for the current version (mtime + size) of a source file.
+    """
+    stat = os.stat(path)
+    return f"{get_cache_prefix(path)}-v{CACHE_SCHEMA_VERSION}-{stat.st_mtime_ns}-{stat.st_size}"
+# -------------------------------------------------------------------------------
+def get_part_name(index: int) -> str:
+    """
+    File name of the `index`-th part of a cache directory.
+    """
+    return f"part-{index:05d}.parquet"
+# -------------------------------------------------------------------------------
+def get_cache_parts(path: str) -> list:
+    """
+    Part files of the current cache of a source CSV in record order, empty when there is no current cache.
+    """
+    return sorted(glob.glob(os.path.join(glob.escape(get_cache_path(path)), CACHE_PART_PATTERN)))
+# -------------------------------------------------------------------------------
+def get_source_parts(path: str) -> list:
+    """
+    Files holding the records of a Parquet dataset: the file itself, then its appended delta parts.
+    """
+    stem = os.path.splitext(path)[0]
+    return [path] + sorted(glob.glob(f"{glob.escape(stem)}{DELTA_PART_MARKER}*.parquet"))
+# -------------------------------------------------------------------------------
+def is_delta_part(path: str) -> bool:
+    """
+    Checks if a file is an appended delta part of a Parquet dataset (not a dataset of its own).
+    """
+    return DELTA_PART_MARKER in os.path.basename(path)
+# -------------------------------------------------------------------------------
+def get_parquet_parts(path: str) -> list:
+    """
+    Parquet files to read for a dataset: the source parts of a Parquet dataset,
+    the current cache parts of a CSV (empty when it has no current cache).
+    """
+    if path.endswith('.parquet'):
+        return get_source_parts(path)
+    return get_cache_parts(path)
+# -------------------------------------------------------------------------------
+def read_parquet_parts(parts: list) -> pd.DataFrame:
+    """
+    Reads Parquet part files into one frame. Category columns of the parts get a shared dtype.
+    """
+    frames = [pd.read_parquet(part, engine='pyarrow', memory_map=True) for part in parts]
+    if len(frames) == 1:
+        return frames[0]
+    # The first frame collects every category, then the other parts are recoded to its final dtypes
+    for _ in range(2):
+        for i in range(1, len(frames)):
+            frames[0], frames[i] = unify_category_dtypes(frames[0], frames[i])
+    return pd.concat(frames, ignore_index=True)
+# -------------------------------------------------------------------------------
+def write_parquet_file(df: pd.DataFrame, file_path: str, schema: pa.Schema = None) -> None:
+    """
+    Writes a frame to a Parquet file through a temporary file, so readers never see a partial file.
+    The temporary name starts with a dot, part listings skip it.
+    With a `schema`, the columns are cast to its types, e.g. those of the file the part belongs to.
+    """
+    temp_path = os.path.join(os.path.dirname(file_path), f".{os.path.basename(file_path)}.tmp")
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(table.cast(schema) if schema is not None else table, temp_path)
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+# -------------------------------------------------------------------------------
+def remove_dataset_cache(path: str) -> None:
+    """
+    Deletes every cached version of a source file.
+    """
+    for cache_path in glob.glob(f"{glob.escape(get_cache_prefix(path))}-v*"):
+        try:
+            if os.path.isdir(cache_path):
+                shutil.rmtree(cache_path)
+            else:
+                os.remove(cache_path)
+        except OSError as e:
+            print(f"Error removing cache file {cache_path}: {e}")
+# -------------------------------------------------------------------------------
+def build_dataset_cache(path: str, df: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Writes the typed Parquet cache for a source CSV (as its first part), replacing any stale versions.
+
+    Args:
+        path (str): Path of the source CSV file.
+        df (pd.DataFrame): Already typed data for the file. Read from the CSV when None.
+
+    Returns:
+        pd.DataFrame: The typed DataFrame that was cached.
+    """
+    if df is None:
+        df = read_typed_csv(path)
+
+    cache_path = get_cache_path(path)
+    remove_dataset_cache(path)
+    try:
+        # Filled under a temporary name first so readers never see a partial cache
+        temp_dir = f"{cache_path}.tmp"
+        os.makedirs(temp_dir, exist_ok=True)
+        df.to_parquet(os.path.join(temp_dir, get_part_name(0)), engine='pyarrow', index=False)
+        os.replace(temp_dir, cache_path)
+    except Exception as e:
+        # Columns with mixed value types cannot be stored in Parquet, the CSV stays the source of truth
+        print(f"Error writing dataset cache for {path}: {e}")
+        shutil.rmtree(f"{cache_path}.tmp", ignore_errors=True)
+    return df
+# -------------------------------------------------------------------------------
+def load_dataset(path: str) -> pd.DataFrame:
+    """
+    Loads a dataset through the Parquet cache.
+
+    The cached copy is memory-mapped when it matches the current mtime and size of the CSV,
+    otherwise the CSV is parsed with `read_typed_csv` and the cache is rebuilt.
+    Parquet datasets are already columnar and are read directly, with their appended delta parts.
+
+    Args:
+        path (str): Path of the CSV or Parquet file.
+
+    Returns:
+        pd.DataFrame: The typed DataFrame.
+    """
+    if path.endswith('.parquet'):
+        return sort_by_date(apply_schema(read_parquet_parts(get_source_parts(path))))
+
+    cache_parts = get_cache_parts(path)
+    if cache_parts:
+        try:
+            # Caches written while streaming an upload keep the file's row order and 64-bit integers
+            return sort_by_date(downcast_integer_columns(read_parquet_parts(cache_parts)))
+        except Exception as e:
+            print(f"Error reading dataset cache {get_cache_path(path)}: {e}")
+    return build_dataset_cache(path)
+
+
+# ==================================================================================
+# Block 3: Date Index Functions
+# ==================================================================================
+def sort_by_date(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Sorts a dataset by its datetime 'Date' column (stable, missing dates last) with a fresh RangeIndex,
+    so date ranges are contiguous row blocks found with `slice_by_date`.
+    Frames that are already sorted are returned unchanged. Either way the frame is tagged with
+    DATE_SORTED_ATTR, so the order is checked once here and not again on every date query.
+    Frames without a datetime 'Date' column are returned as they are.
+    """
+    if DATE_COLUMN not in df.columns or not pd.api.types.is_datetime64_any_dtype(df[DATE_COLUMN]):
+        return df
+    if not is_date_column_sorted(df[DATE_COLUMN]):
+        df = df.sort_values(DATE_COLUMN, kind='stable', na_position='last', ignore_index=True)
+    df.attrs[DATE_SORTED_ATTR] = True
+    return df
+# -------------------------------------------------------------------------------
+def is_date_column_sorted(dates: pd.Series) -> bool:
+    """
+    Checks that a datetime 'Date' column is ascending with the missing dates last.
+    The check is a single vectorized pass, no per-row Python objects.
+    """
+    values = dates.to_numpy()
+    valid_count = len(values) - int(np.isnat(values).sum())
+    valid_values = values[:valid_count]
+    return not np.isnat(valid_values).any() and pd.Index(valid_values, copy=False).is_monotonic_increasing
+# -------------------------------------------------------------------------------
+def get_sorted_date_values(df: pd.DataFrame) -> np.ndarray:
+    """
+    Returns the datetime64 'Date' values without the trailing missing dates when the frame is
+    tagged as sorted by date (see `sort_by_date`), else None.
+    The tag is trusted, the end of the dated rows is found by bisection in O(log n).
+    """
+    if not df.attrs.get(DATE_SORTED_ATTR) or DATE_COLUMN not in df.columns:
+        return None
+    values = df[DATE_COLUMN].to_numpy()
+    if values.dtype.kind != 'M':
+        return None
+    valid_count = bisect.bisect_left(range(len(values)), True, key=lambda i: np.isnat(values[i]))
+    return values[:valid_count]
+# -------------------------------------------------------------------------------
+def slice_by_date(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """
+    Returns the records dated from `start` to `end`, both days included.
+
+    On date-sorted datasets (every frame from `load_dataset` and its row filters, which keep the tag)
+    the bounds are found with two `searchsorted` calls in O(log n) and the result is a positional slice,
+    which is a view with Copy-on-Write. Other frames fall back to a boolean mask.
+
+    Args:
+        df (pd.DataFrame): Dataset with a datetime 'Date' column.
+        start: First day (date, Timestamp or 'YYYY-MM-DD'). None means no lower bound.
+        end: Last day, included as a whole day. None means no upper bound.
+
+    Returns:
+        pd.DataFrame: The records in the range.
+    """
+    start = pd.Timestamp(start).normalize() if start is not None else None
+    end_exclusive = pd.Timestamp(end).normalize() + pd.Timedelta(days=1) if end is not None else None
+
+    sorted_values = get_sorted_date_values(df)
+    if sorted_values is None:
+        dates = df[DATE_COLUMN]
+        mask = dates.notna()
+        if start is not None:
+            mask &= dates >= start
+        if end_exclusive is not None:
+            mask &= dates < end_exclusive
+        return df[mask]
+
+    first = sorted_values.searchsorted(start.to_datetime64(), side='left') if start is not None else 0
+    last = sorted_values.searchsorted(end_exclusive.to_datetime64(), side='left') if end_exclusive is not None else len(sorted_values)
+    return df.iloc[first:max(first, last)]
+# -------------------------------------------------------------------------------
+def get_date_range(df: pd.DataFrame) -> tuple:
+    """
+    First and last 'Date' of a dataset as Timestamps (NaT when there are no dates).
+    Date-sorted datasets read them from the ends of the column.
+    """
+    sorted_values = get_sorted_date_values(df)
+    if sorted_values is None:
+        return df[DATE_COLUMN].min(), df[DATE_COLUMN].max()
+    if len(sorted_values) == 0:
+        return pd.NaT, pd.NaT
+    return pd.Timestamp(sorted_values[0]), pd.Timestamp(sorted_values[-1])
+# ===================================================================================
@@ -0,0 +1,340 @@
+import numpy as np
+import pandas as pd
+
+from core import chunked_aggregation
+
+# This module computes the data-quality statistics of a dataset: missing values, distinct values,
+# quartiles and IQR outliers for every column.
+# Exact mode sorts the numeric columns in batches (one sort gives quartiles, distinct and outlier counts).
+# Approximate mode reads the dataset in chunks into mergeable sketches: a HyperLogLog per column for
+# the distinct values and a t-digest per numeric column for the quartiles and outliers.
+
+# ---------------------------------------------------------
+# DATA QUALITY CONFIGURATION
+# ---------------------------------------------------------
+# Outliers lie more than IQR_MULTIPLIER * IQR below Q1 or above Q3
+QUARTILES = [0.25, 0.75]
+IQR_MULTIPLIER = 1.5
+
+# Numeric values sorted at once in exact mode (float64, 8 bytes each), numeric columns are batched to fit
+EXACT_BATCH_CELLS = 16_000_000
+
+# In-memory datasets from this many records use approximate mode, chunked handles always do
+APPROXIMATE_MIN_ROWS = 5_000_000
+
+# HyperLogLog with 2 ** HLL_PRECISION registers, about 1.04 / sqrt(2 ** 14) = 0.8% standard error
+HLL_PRECISION = 14
+
+# t-digest size: about DIGEST_COMPRESSION / 2 centroids per column, smaller ones towards both tails
+DIGEST_COMPRESSION = 200
+
+# Raw statistics per column, see `get_quality_stats`
+QUALITY_STATS_COLUMNS = ['Column Name', 'Rows', 'Missing', 'Unique', 'Q1', 'Q3', 'Outliers']
+
+
+# ==================================================================================
+# Block 0: Exact Statistics Functions
+# ==================================================================================
+def is_quality_numeric(series: pd.Series) -> bool:
+    """
+    Columns that get quartiles and outliers: numeric columns, booleans counted as 0/1.
+    """
+    return pd.api.types.is_numeric_dtype(series.dtype) and not isinstance(series.dtype, pd.CategoricalDtype)
+# -------------------------------------------------------------------------------
+def count_missing_and_distinct(series: pd.Series) -> tuple:
+    """
+    Exact (missing, distinct) counts of a non-numeric column from its integer codes.
+    Category columns already have codes, other columns are factorized once.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        return int((codes < 0).sum()), int(np.count_nonzero(counts))
+    codes, uniques = pd.factorize(series)
+    return int((codes < 0).sum()), len(uniques)
+# -------------------------------------------------------------------------------
+def get_sorted_numeric_stats(values: np.ndarray) -> dict:
+    """
+    Statistics of a batch of numeric columns, one column per row of `values` (float64, NaN = missing).
+
+    Each row is sorted once (missing values sort last): the quartiles are read at their positions with
+    linear interpolation like `Series.quantile`, distinct values are the changes between neighbours and
+    outliers are compared against the bounds in the same sorted array.
+    """
+    sorted_values = np.sort(values, axis=1)
+    row_count = values.shape[1]
+    present = row_count - np.isnan(sorted_values).sum(axis=1)
+
+    quartiles = []
+    for q in QUARTILES:
+        position = q * np.maximum(present - 1, 0)
+        lower = np.floor(position).astype(np.intp)
+        upper = np.ceil(position).astype(np.intp)
+        low_values = np.take_along_axis(sorted_values, lower[:, None], axis=1)[:, 0]
+        high_values = np.take_along_axis(sorted_values, upper[:, None], axis=1)[:, 0]
+        quartiles.append(np.where(present > 0, low_values + (high_values - low_values) * (position - lower), np.nan))
+    q1, q3 = quartiles
+
+    # Only neighbours within the present values of a row count as changes
+    changes = (sorted_values[:, 1:] != sorted_values[:, :-1]) & (np.arange(row_count - 1) < (present - 1)[:, None])
+    distinct = np.where(present > 0, changes.sum(axis=1) + 1, 0)
+
+    iqr = q3 - q1
+    lower_bound = (q1 - IQR_MULTIPLIER * iqr)[:, None]
+    upper_bound = (q3 + IQR_MULTIPLIER * iqr)[:, None]
+    outliers = ((sorted_values < lower_bound) | (sorted_values > upper_bound)).sum(axis=1)
+
+    return {'Missing': row_count - present, 'Unique': distinct, 'Q1': q1, 'Q3': q3, 'Outliers': outliers}
+# -------------------------------------------------------------------------------
+def get_exact_quality_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Exact statistics of every column of an in-memory dataset, see `get_quality_stats`.
+    """
+    row_count = len(df)
+    stats = {col: {'Rows': row_count, 'Missing': 0, 'Unique': 0, 'Q1': np.nan, 'Q3': np.nan, 'Outliers': 0} for col in df.columns}
+
+    numeric_cols = [col for col in df.columns if is_quality_numeric(df[col])]
+    for col in df.columns:
+        if col not in numeric_cols:
+            stats[col]['Missing'], stats[col]['Unique'] = count_missing_and_distinct(df[col])
+
+    # Empty datasets have nothing to sort
+    if row_count == 0:
+        numeric_cols = []
+
+    batch_size = max(1, EXACT_BATCH_CELLS // max(row_count, 1))
+    for start in range(0, len(numeric_cols), batch_size):
+        batch_cols = numeric_cols[start:start + batch_size]
+        values = np.empty((len(batch_cols), row_count), dtype='float64')
+        for i, col in enumerate(batch_cols):
+            values[i] = df[col].to_numpy(dtype='float64', na_value=np.nan)
+        batch_stats = get_sorted_numeric_stats(values)
+        for i, col in enumerate(batch_cols):
+            stats[col].update({name: batch_values[i] for name, batch_values in batch_stats.items()})
+
+    return pd.DataFrame([{'Column Name': col, **stats[col]} for col in df.columns], columns=QUALITY_STATS_COLUMNS)
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 1: HyperLogLog Functions (approximate distinct counts)
+# ==================================================================================
+def get_empty_hll() -> np.ndarray:
+    """
+    Empty HyperLogLog: one rank register per hash bucket.
+    """
+    return np.zeros(2 ** HLL_PRECISION, dtype=np.uint8)
+# -------------------------------------------------------------------------------
+def hash_column_values(series: pd.Series) -> np.ndarray:
+    """
+    64-bit hashes of the present values of a column.
+    Equal values hash equally in every chunk, whatever dtype the chunk was downcast to.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        category_hashes = pd.util.hash_array(np.asarray(series.cat.categories, dtype=object))
+        return category_hashes[codes[codes >= 0]]
+    values = series.dropna()
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return pd.util.hash_array(values.to_numpy(dtype='datetime64[ns]').view('int64'))
+    if is_quality_numeric(values):
+        # Adding 0.0 turns -0.0 into 0.0, they are the same value
+        return pd.util.hash_array(values.to_numpy(dtype='float64') + 0.0)
+    return pd.util.hash_array(values.to_numpy(dtype=object))
+# -------------------------------------------------------------------------------
+def update_hll(registers: np.ndarray, hashes: np.ndarray) -> None:
+    """
+    Adds hashed values to a HyperLogLog. The first HLL_PRECISION bits pick the register, which keeps the
+    highest position of the first 1-bit in the remaining bits.
+    """
+    if hashes.size == 0:
+        return
+    remaining_bits = 64 - HLL_PRECISION
+    buckets = (hashes >> np.uint64(remaining_bits)).astype(np.intp)
+    # The remaining bits fit a float64 exactly, frexp gives their bit length
+    rest = (hashes & np.uint64((1 << remaining_bits) - 1)).astype('float64')
+    _, bit_length = np.frexp(rest)
+    ranks = (remaining_bits - bit_length + 1).astype(np.uint8)
+    np.maximum.at(registers, buckets, ranks)
+# -------------------------------------------------------------------------------
+def estimate_hll(registers: np.ndarray) -> float:
+    """
+    Estimated number of distinct values added to a HyperLogLog (with the small-range correction).
+    """
+    m = registers.size
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int32)))
+    empty_registers = np.count_nonzero(registers == 0)
+    if estimate <= 2.5 * m and empty_registers > 0:
+        estimate = m * np.log(m / empty_registers)
+    return float(estimate)
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 2: t-digest Functions (approximate quantiles)
+# ==================================================================================
+def compress_digest(means: np.ndarray, weights: np.ndarray) -> tuple:
+    """
+    Merges sorted points into t-digest centroids in one vectorized pass.
+
+    Every point goes to the centroid of the integer step of the k1 scale function at its cumulative
+    weight, so centroids hold many points around the median and only a few in the tails.
+
+    Returns:
+        tuple: (centroid means, centroid weights), sorted by mean.
+    """
+    order = np.argsort(means)
+    means, weights = means[order], weights[order]
+    cumulative = np.cumsum(weights)
+    q_left = (cumulative - weights) / cumulative[-1]
+    k = np.floor(DIGEST_COMPRESSION / (2 * np.pi) * np.arcsin(2 * q_left - 1))
+    starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+    centroid_weights = np.add.reduceat(weights, starts)
+    centroid_means = np.add.reduceat(means * weights, starts) / centroid_weights
+    return centroid_means, centroid_weights
+# -------------------------------------------------------------------------------
+def merge_digest(digest: dict, values: np.ndarray) -> dict:
+    """
+    Adds the present values of a chunk to a digest {'means', 'weights', 'min', 'max'} (None = empty).
+    """
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return digest
+    if digest is None:
+        means, weights = compress_digest(values, np.ones(values.size))
+        return {'means': means, 'weights': weights, 'min': values.min(), 'max': values.max()}
+    means, weights = compress_digest(np.r_[digest['means'], values], np.r_[digest['weights'], np.ones(values.size)])
+    return {'means': means, 'weights': weights, 'min': min(digest['min'], values.min()), 'max': max(digest['max'], values.max())}
+# -------------------------------------------------------------------------------
+def get_digest_curve(digest: dict) -> tuple:
+    """
+    Piecewise-linear cumulative distribution of a digest: (values, cumulative weights).
+    Each centroid sits at the middle of its weight, the minimum and maximum close both ends.
+    """
+    centers = np.cumsum(digest['weights']) - digest['weights'] / 2
+    total = digest['weights'].sum()
+    return np.r_[digest['min'], digest['means'], digest['max']], np.r_[0.0, centers, total]
+# -------------------------------------------------------------------------------
+def digest_quantiles(digest: dict, quantiles: list) -> np.ndarray:
+    """
+    Estimated quantiles of the values added to a digest.
+    """
+    values, cumulative = get_digest_curve(digest)
+    return np.interp(np.asarray(quantiles) * cumulative[-1], cumulative, values)
+# -------------------------------------------------------------------------------
+def digest_cdf(digest: dict, points: np.ndarray) -> np.ndarray:
+    """
+    Estimated share of the values added to a digest that lie below each point.
+    """
+    values, cumulative = get_digest_curve(digest)
+    return np.interp(points, values, cumulative) / cumulative[-1]
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 3: Approximate Statistics Functions
+# ==================================================================================
+def iter_frame_chunks(df: pd.DataFrame):
+    """
+    Yields the chunks of a dataset: streamed from the file for chunked handles, row slices otherwise.
+    """
+    if chunked_aggregation.is_chunked(df):
+        source = df.attrs[chunked_aggregation.CHUNKED_ATTR]
+        yield from chunked_aggregation.iter_dataset_chunks(source['path'], list(df.columns), source['start'], source['end'])
+        return
+    for start in range(0, len(df), chunked_aggregation.CHUNK_ROWS):
+        yield df.iloc[start:start + chunked_aggregation.CHUNK_ROWS]
+# -------------------------------------------------------------------------------
+def get_approximate_quality_stats(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Approximate statistics of every column in one pass over the dataset chunks, see `get_quality_stats`.
+    Missing values are counted exactly. Distinct values come from a HyperLogLog, quartiles from a t-digest,
+    and outliers from the digest's distribution at the IQR bounds.
+    """
+    sketches = {col: {'rows': 0, 'missing': 0, 'hll': get_empty_hll(), 'digest': None} for col in df.columns}
+    numeric_cols = {col for col in df.columns if is_quality_numeric(df[col])}
+
+    for chunk in iter_frame_chunks(df):
+        for col in df.columns:
+            sketch = sketches[col]
+            series = chunk[col]
+            sketch['rows'] += len(series)
+            sketch['missing'] += int(series.isna().sum())
+            update_hll(sketch['hll'], hash_column_values(series))
+            if col in numeric_cols:
+                sketch['digest'] = merge_digest(sketch['digest'], series.to_numpy(dtype='float64', na_value=np.nan))
+
+    report = []
+    for col in df.columns:
+        sketch = sketches[col]
+        present = sketch['rows'] - sketch['missing']
+        q1, q3, outliers = np.nan, np.nan, 0
+        if sketch['digest'] is not None:
+            q1, q3 = digest_quantiles(sketch['digest'], QUARTILES)
+            iqr = q3 - q1
+            below, above = digest_cdf(sketch['digest'], np.array([q1 - IQR_MULTIPLIER * iqr, q3 + IQR_MULTIPLIER * iqr]))
+            outliers = int(round(present * (below + 1 - above)))
+        report.append({
+            'Column Name': col,
+            'Rows': sketch['rows'],
+            'Missing': sketch['missing'],
+            'Unique': min(int(round(estimate_hll(sketch['hll']))), present),
+            'Q1': q1,
+            'Q3': q3,
+            'Outliers': outliers,
+        })
+    return pd.DataFrame(report, columns=QUALITY_STATS_COLUMNS)
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 4: Quality Report Functions
+# ==================================================================================
+def is_approximate(df: pd.DataFrame, approximate: bool = None) -> bool:
+    """
+    Whether a dataset gets approximate statistics: always for chunked handles, by size when not chosen.
+    """
+    if chunked_aggregation.is_chunked(df):
+        return True
+    if approximate is None:
+        return len(df) >= APPROXIMATE_MIN_ROWS
+    return approximate
+# -------------------------------------------------------------------------------
+def get_quality_stats(df: pd.DataFrame, approximate: bool = None) -> pd.DataFrame:
+    """
+    Data-quality statistics of every column.
+
+    Args:
+        df (pd.DataFrame): A dataset, or a handle from core.chunked_aggregation.open_chunked_dataset
+            (streamed once per file version, then cached).
+        approximate (bool): Use the sketches instead of exact counts, by default from APPROXIMATE_MIN_ROWS.
+
+    Returns:
+        pd.DataFrame: One row per column with QUALITY_STATS_COLUMNS. Q1 and Q3 are NaN and
+            Outliers 0 for non-numeric columns.
+    """
+    if chunked_aggregation.is_chunked(df):
+        return chunked_aggregation.get_chunked_result(df, 'quality_stats', tuple(df.columns), lambda: get_approximate_quality_stats(df))
+    if is_approximate(df, approximate):
+        return get_approximate_quality_stats(df)
+    return get_exact_quality_stats(df)
+# -------------------------------------------------------------------------------
+def to_percentage(counts: pd.Series, rows: pd.Series) -> pd.Series:
+    """
+    Counts as percentages of the rows, rounded to 2 decimals.
+    """
+    return (counts / rows.replace(0, np.nan) * 100).round(2)
+# -------------------------------------------------------------------------------
+def format_quality_report(stats: pd.DataFrame) -> pd.DataFrame:
+    """
+    Percentages of the statistics per column, as shown on the Numerical Analysis page.
+    """
+    return pd.DataFrame({
+        'Column Name': stats['Column Name'],
+        'Missing (%)': to_percentage(stats['Missing'], stats['Rows']),
+        'Unique (%)': to_percentage(stats['Unique'], stats['Rows']),
+        'Duplicate (%)': to_percentage(stats['Rows'] - stats['Unique'], stats['Rows']),
+        'Outlier (%)': to_percentage(stats['Outliers'], stats['Rows']),
+    })
+# ===================================================================================
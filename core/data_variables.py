@@ -1,5 +1,3 @@
-import random
-
 # ====================================================================================
 # General Data Definations
 # ====================================================================================
@@ -46,35 +44,37 @@ vehicle_types_mapping = {
 }
 
 # -------------------- VEHICLE SAFETY MAPPING -----------------------
+# Every mapping below holds a distribution, not a value: choice lists (repeat an entry to raise
+# its probability) or (low, high) ranges. The generator draws one value per record from them.
 
 seatbelt_worn_mapping = {
-    "Car": random.choice(['Yes', 'No']),
-    "Motorcycle": 'NA',
-    "Truck": random.choice(['Yes', 'No']),
-    "Bus": random.choice(['Yes', 'No']),
-    "Auto-Rickshaw": 'NA',
-    "Bicycle": 'NA',
-    "Van": random.choice(['Yes', 'No']),  
-    "Pickup": random.choice(['Yes', 'No']),
-    "Electric Scooter": 'NA',
-    "Tractor": 'NA',         
-    "E-Rickshaw": 'NA',
-    "Scooty": 'NA'
+    "Car": ['Yes', 'No'],
+    "Motorcycle": ['NA'],
+    "Truck": ['Yes', 'No'],
+    "Bus": ['Yes', 'No'],
+    "Auto-Rickshaw": ['NA'],
+    "Bicycle": ['NA'],
+    "Van": ['Yes', 'No'],  
+    "Pickup": ['Yes', 'No'],
+    "Electric Scooter": ['NA'],
+    "Tractor": ['NA'],         
+    "E-Rickshaw": ['NA'],
+    "Scooty": ['NA']
 }
 
 helmet_worn_mapping = {
-    "Car" : "NA",
-    "Motorcycle" : random.choice(["Yes", "No"]),
-    "Truck" : "NA",
-    "Bus" : "NA",
-    "Auto-Rickshaw" : "NA",
-    "Bicycle" : random.choice(["Yes", "No"]),
-    "Van" : "NA",
-    "Pickup" : "NA",
-    "Electric Scooter" : random.choice(["Yes", "No"]),
-    "Tractor" : "NA",
-    "E-Rickshaw" : "NA",
-    "Scooty" : random.choice(["Yes", "No"])
+    "Car" : ["NA"],
+    "Motorcycle" : ["Yes", "No"],
+    "Truck" : ["NA"],
+    "Bus" : ["NA"],
+    "Auto-Rickshaw" : ["NA"],
+    "Bicycle" : ["Yes", "No"],
+    "Van" : ["NA"],
+    "Pickup" : ["NA"],
+    "Electric Scooter" : ["Yes", "No"],
+    "Tractor" : ["NA"],
+    "E-Rickshaw" : ["NA"],
+    "Scooty" : ["Yes", "No"]
 }
 
 # ------------------------- VEHICLE TYPES ---------------------------
@@ -95,18 +95,18 @@ vehicle_types_list = [
 
 # ----------------------------- FINE MAP -----------------------------
 fine_mapping = {
-    "Overspeeding": random.randint(1000, 4000),
-    "Drunk Driving": random.randint(1000, 1500),
-    "Wrong Lane": random.randint(500, 5000),
-    "Red Light Violation": random.randint(1000, 5000),
-    "No Parking": random.randint(500, 1500),
-    "Seatbelt Violation": random.randint(1000, 5000),
-    "Helmet Violation": random.randint(1000, 5000),
-    "Mobile Phone Usage": random.randint(1000, 5000),
-    "Overloading": random.randint(1000, 5000),
-    "Illegal U Turn": random.randint(500, 1000),
-    "Driving Without License": random.randint(1000, 5000),
-    # "Hit and Run": random.choice([100000, 200000, 300000, 400000, 500000, 600000, 700000, 800000, 900000]),
+    "Overspeeding": (1000, 4000),
+    "Drunk Driving": (1000, 1500),
+    "Wrong Lane": (500, 5000),
+    "Red Light Violation": (1000, 5000),
+    "No Parking": (500, 1500),
+    "Seatbelt Violation": (1000, 5000),
+    "Helmet Violation": (1000, 5000),
+    "Mobile Phone Usage": (1000, 5000),
+    "Overloading": (1000, 5000),
+    "Illegal U Turn": (500, 1000),
+    "Driving Without License": (1000, 5000),
+    # "Hit and Run": [100000, 200000, 300000, 400000, 500000, 600000, 700000, 800000, 900000],
 }
 
 # --------------- VEHICLE SAFETY MAPPING -----------
@@ -123,18 +123,18 @@ driver_genders_list = [
 
 no_of_passengers_mapping = {
     # It will based on vehicle type
-    "Car": random.randint(0, 4),
-    "Motorcycle": random.randint(0, 2),
-    "Truck": random.randint(0, 3),
-    "Bus": random.randint(0, 50),
-    "Auto-Rickshaw": random.randint(0, 3),
-    "Bicycle": random.randint(0, 1),
-    "Van": random.randint(0, 8),
-    "Pickup": random.randint(0, 5),
-    "Electric Scooter": random.randint(0, 2),
-    "Tractor": random.randint(0, 1),
-    "E-Rickshaw": random.randint(0, 4),
-    "Scooty": random.randint(0, 2)
+    "Car": (0, 4),
+    "Motorcycle": (0, 2),
+    "Truck": (0, 3),
+    "Bus": (0, 50),
+    "Auto-Rickshaw": (0, 3),
+    "Bicycle": (0, 1),
+    "Van": (0, 8),
+    "Pickup": (0, 5),
+    "Electric Scooter": (0, 2),
+    "Tractor": (0, 1),
+    "E-Rickshaw": (0, 4),
+    "Scooty": (0, 2)
 }
 
 license_types_list = [
@@ -160,9 +160,10 @@ breathalyzer_results_list = [
 ]
 
 alcohol_levels_mapping = {    
-    "Positive": round(random.uniform(0.08, 0.40), 2), # Legal limit is often 0.08% in many places
-    "Negative": round(random.uniform(0.00, 0.07), 2),
-    "Not Applied": 0.00
+    # (low, high) range, drawn uniformly and rounded to 2 decimals
+    "Positive": (0.08, 0.40), # Legal limit is often 0.08% in many places
+    "Negative": (0.00, 0.07),
+    "Not Applied": (0.00, 0.00)
 }
 
 # -------------------- Environament CONDITIONS --------------------
@@ -215,50 +216,50 @@ states_list = [
 
 # ========================= Date Filteration =========================
 payment_methods_mapping  = {
-    'Yes' : random.choice([
-        'Cash', 'Cash', 'Cash', 'Cash'
+    'Yes' : [
+        'Cash', 'Cash', 'Cash', 'Cash',
         'UPI', 'UPI', 'UPI',
         'Online',
         'Card', 
-    ]),
-    'No' : 'Pending'
+    ],
+    'No' : ['Pending']
 }
 
 # -------------------------- ACTION TAKEN --------------------------
 towing_mapping = {
     # High Possibilities
-    "No Parking": random.choice(["Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "No", "No", "No"]), # 70% -> Yes, 30% -> No
-    "Hit and Run": random.choice(["Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "No", "No", "No"]), # 70% -> Yes, 30% -> No
-    "Drunk Driving": random.choice(["Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "No", "No", "No"]), # 70% -> Yes, 30% -> No
-    "Overloading": random.choice(["Yes", "No"]), # 50% -> Yes, 50% -> No
-    "Driving Without License": random.choice(["Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "No", "No", "No", "No"]), # 60% -> Yes, 40% -> No
+    "No Parking": ["Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "No", "No", "No"], # 70% -> Yes, 30% -> No
+    "Hit and Run": ["Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "No", "No", "No"], # 70% -> Yes, 30% -> No
+    "Drunk Driving": ["Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "No", "No", "No"], # 70% -> Yes, 30% -> No
+    "Overloading": ["Yes", "No"], # 50% -> Yes, 50% -> No
+    "Driving Without License": ["Yes", "Yes", "Yes", "Yes", "Yes", "Yes", "No", "No", "No", "No"], # 60% -> Yes, 40% -> No
 
     # Low Possibilities
-    "Wrong Lane": "No",
-    "Red Light Violation": "No",
-    "Helmet Violation": "No",
-    "Seatbelt Violation": "No",
-    "Mobile Phone Usage": "No",
-    "Illegal U Turn": "No",
+    "Wrong Lane": ["No"],
+    "Red Light Violation": ["No"],
+    "Helmet Violation": ["No"],
+    "Seatbelt Violation": ["No"],
+    "Mobile Phone Usage": ["No"],
+    "Illegal U Turn": ["No"],
 }
 
 court_mapping = {
     # --- SERIOUS OFFENSES (Mandatory Court/Magistrate) ---
-    "Hit and Run": random.choice(["Yes", "Yes", "Yes", "No"]), # 60% -> Yes, 40% -> No
-    "Overloading": random.choice(["Yes", "Yes", "No", "No"]), # 50% -> Yes, 50% -> No,
-    "Drunk Driving": random.choice(["Yes", "Yes", "Yes", "No", "No"]), # 60% -> Yes, 40% -> No,
-    "Driving Without License": random.choice(["Yes", "Yes", "Yes", "No", "No"]), # 60% -> Yes, 40% -> No,
+    "Hit and Run": ["Yes", "Yes", "Yes", "No"], # 60% -> Yes, 40% -> No
+    "Overloading": ["Yes", "Yes", "No", "No"], # 50% -> Yes, 50% -> No,
+    "Drunk Driving": ["Yes", "Yes", "Yes", "No", "No"], # 60% -> Yes, 40% -> No,
+    "Driving Without License": ["Yes", "Yes", "Yes", "No", "No"], # 60% -> Yes, 40% -> No,
     
     # --- STANDARD TRAFFIC VIOLATIONS (Compounding/Spot Fines) ---
-    "Overspeeding": "No",
-    "Red Light Violation": "No",
-    "Wrong Lane": "No", 
-    "No Parking": "No",          
-    "Seatbelt Violation": "No",
-    "Helmet Violation": "No",
-    "Mobile Phone Usage": "No",      
-    "Illegal U Turn": "No",           
-    "Overloading": "No"               
+    "Overspeeding": ["No"],
+    "Red Light Violation": ["No"],
+    "Wrong Lane": ["No"], 
+    "No Parking": ["No"],          
+    "Seatbelt Violation": ["No"],
+    "Helmet Violation": ["No"],
+    "Mobile Phone Usage": ["No"],      
+    "Illegal U Turn": ["No"],           
+    "Overloading": ["No"]               
 }
 
 comments_list = [
@@ -307,4 +308,34 @@ indian_states_coordinates = {
     'Uttar Pradesh': {'latitude': 26.8467, 'longitude': 80.9462},
     'Uttarakhand': {'latitude': 30.0668, 'longitude': 79.0193},
     'West Bengal': {'latitude': 22.9868, 'longitude': 87.8550}
-}
\ No newline at end of file
+}
+# ====================================================================================
+# Category Vocabularies
+# ====================================================================================
+# Every value the generator can emit per categorical column, used by `data_loader` to build
+# shared category dictionaries. Values outside these lists (uploaded files) are added per dataset.
+YES_NO_LIST = ["Yes", "No"]
+
+CATEGORY_VOCABULARIES = {
+    'Violation_Type': violation_types_list + list(fine_mapping.keys()) + list(vehicle_types_mapping.keys()),
+    'Location': states_list + list(indian_states_coordinates.keys()),
+    'Registration_State': states_list + list(indian_states_coordinates.keys()),
+    'Vehicle_Type': vehicle_types_list + [v for types in vehicle_types_mapping.values() for v in types],
+    'Vehicle_Color': vehicle_colors_list,
+    'Driver_Gender': driver_genders_list,
+    'License_Type': license_types_list,
+    'Weather_Condition': weather_conditions_list,
+    'Road_Condition': road_conditions_list,
+    'Issuing_Agency': issuing_agencies_list,
+    'License_Validity': license_validity_list,
+    # "NA" is read back as a missing value by pandas, so only Yes / No are kept
+    'Helmet_Worn': YES_NO_LIST,
+    'Seatbelt_Worn': YES_NO_LIST,
+    'Traffic_Light_Status': ["Red", "Green", "Yellow"],
+    'Breathalyzer_Result': breathalyzer_results_list,
+    'Towed': YES_NO_LIST,
+    'Fine_Paid': YES_NO_LIST,
+    'Payment_Method': [v for methods in payment_methods_mapping.values() for v in methods],
+    'Court_Appearance_Required': YES_NO_LIST,
+    'Comments': comments_list,
+}
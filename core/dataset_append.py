@@ -0,0 +1,190 @@
+import os
+import time
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from core import data_loader, derived_columns, rollup_cube, dataset_catalog
+from core.data_variables import TRAFFIC_VIOLATION_COLUMNS
+
+# This module appends a delta file of new violations to a stored dataset.
+# Only the new records are parsed, enriched, aggregated and written, the existing ones are reused as loaded.
+
+# ---------------------------------------------------------
+# APPEND CONFIGURATION
+# ---------------------------------------------------------
+# Every appended record must have a new, unique value in this column
+APPEND_KEY_COLUMN = 'Violation_ID'
+
+# Appends are stored as extra Parquet parts, a dataset with this many parts is compacted into one file
+MAX_DELTA_PARTS = 32
+
+# Datasets produced by the last append, keyed by (path, modified time) and handed over to
+# core.sidebar, so the next page load does not re-read and re-enrich the whole file
+APPENDED_DATASETS = {}
+
+
+# ==================================================================================
+# Block 0: Validation Functions
+# ==================================================================================
+def validate_delta(delta: pd.DataFrame, existing: pd.DataFrame) -> list:
+    """
+    Checks a delta file before it is appended to a dataset.
+
+    Args:
+        delta (pd.DataFrame): The new records, as read from the delta CSV.
+        existing (pd.DataFrame): The dataset they are appended to.
+
+    Returns:
+        list: Problems found, empty when the delta can be appended.
+    """
+    problems = []
+    missing_columns = [col for col in TRAFFIC_VIOLATION_COLUMNS if col not in delta.columns]
+    if missing_columns:
+        problems.append(f"Missing columns: {', '.join(missing_columns)}")
+    unknown_columns = [col for col in delta.columns if col not in existing.columns]
+    if unknown_columns:
+        problems.append(f"Columns not in the dataset: {', '.join(unknown_columns)}")
+    if delta.empty:
+        problems.append("The file has no records.")
+    if problems:
+        return problems
+
+    ids = delta[APPEND_KEY_COLUMN]
+    if ids.isna().any():
+        problems.append(f"{int(ids.isna().sum())} records have no {APPEND_KEY_COLUMN}.")
+    duplicated = ids[ids.duplicated()].dropna().unique()
+    if len(duplicated):
+        problems.append(f"Repeated {APPEND_KEY_COLUMN}s in the file: {', '.join(map(str, duplicated[:5]))}")
+    known = ids[ids.isin(existing[APPEND_KEY_COLUMN])].unique()
+    if len(known):
+        problems.append(f"{len(known)} {APPEND_KEY_COLUMN}s are already in the dataset, e.g. {', '.join(map(str, known[:5]))}")
+
+    dates = data_loader.parse_date_column(delta['Date'].astype(str))
+    if dates.isna().any():
+        problems.append(f"{int(dates.isna().sum())} records have a missing or unreadable Date.")
+    return problems
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 1: Append Functions
+# ==================================================================================
+def type_delta(delta: pd.DataFrame, existing: pd.DataFrame) -> pd.DataFrame:
+    """
+    Types the delta records like the loaded dataset: same columns and order, compact dtypes, sorted by date.
+    """
+    raw_columns = [col for col in existing.columns if col not in derived_columns.DERIVED_COLUMNS]
+    delta = delta.reindex(columns=raw_columns)
+    delta[APPEND_KEY_COLUMN] = delta[APPEND_KEY_COLUMN].astype(str)
+    return data_loader.sort_by_date(data_loader.apply_schema(delta))
+# -------------------------------------------------------------------------------
+def append_csv_rows(path: str, delta: pd.DataFrame) -> None:
+    """
+    Appends the delta rows at the end of a CSV file.
+    """
+    # Files saved without a final line break would glue the first new record to the last old one
+    needs_newline = False
+    with open(path, 'rb') as f:
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) not in (b'\n', b'\r')
+    with open(path, 'a', newline='') as f:
+        if needs_newline:
+            f.write('\n')
+        delta.to_csv(f, header=False, index=False, date_format=data_loader.DATE_FORMAT)
+# -------------------------------------------------------------------------------
+def bump_modified_time(path: str, previous_stat: os.stat_result) -> None:
+    """
+    Gives a file a new mtime, which versions its caches (see core.data_loader), even on coarse file system clocks.
+    """
+    os.utime(path, ns=(previous_stat.st_atime_ns, max(time.time_ns(), previous_stat.st_mtime_ns + 1)))
+# -------------------------------------------------------------------------------
+def write_delta_to_source(path: str, delta: pd.DataFrame, combined: pd.DataFrame) -> tuple:
+    """
+    Stores the appended records in the dataset file and its typed Parquet copy, writing only the delta.
+
+    CSV files get the delta rows appended at the end and the delta becomes a new part of the cache directory,
+    which is renamed to the new version of the file. Parquet files cannot be extended in place, the delta
+    is written as a new delta part next to the file. Once a dataset has MAX_DELTA_PARTS parts it is
+    compacted into one file from the combined frame (no parsing involved), keeping the file's column types.
+
+    Returns:
+        tuple: (delta part written for a Parquet dataset or None, whether the Parquet dataset was compacted).
+    """
+    if path.endswith('.parquet'):
+        source_parts = data_loader.get_source_parts(path)
+        if len(source_parts) >= MAX_DELTA_PARTS:
+            # The file keeps its column types, the combined frame has the narrower load-time integer types
+            data_loader.write_parquet_file(derived_columns.drop_derived_columns(combined), path, schema=pq.read_schema(path))
+            for delta_part in source_parts[1:]:
+                os.remove(delta_part)
+            return None, True
+        previous_stat = os.stat(path)
+        delta_part = f"{os.path.splitext(path)[0]}{data_loader.DELTA_PART_MARKER}{len(source_parts):05d}.parquet"
+        # Same column types as the file, so the parts are read back as one table
+        data_loader.write_parquet_file(delta, delta_part, schema=pq.read_schema(path))
+        bump_modified_time(path, previous_stat)
+        return delta_part, False
+
+    cache_path = data_loader.get_cache_path(path)
+    cache_parts = data_loader.get_cache_parts(path)
+    append_csv_rows(path, delta)
+    if 0 < len(cache_parts) < MAX_DELTA_PARTS:
+        try:
+            data_loader.write_parquet_file(delta, os.path.join(cache_path, data_loader.get_part_name(len(cache_parts))))
+            os.replace(cache_path, data_loader.get_cache_path(path))
+            return None, False
+        except Exception as e:
+            print(f"Error appending to the dataset cache of {path}: {e}")
+    data_loader.build_dataset_cache(path, derived_columns.drop_derived_columns(combined))
+    return None, False
+# -------------------------------------------------------------------------------
+def append_violations(path: str, delta: pd.DataFrame, existing: pd.DataFrame) -> pd.DataFrame:
+    """
+    Appends new violations to a stored dataset and updates what is derived from it.
+
+    The delta is typed and enriched on its own and concatenated to the already loaded dataset.
+    Then the source file, its typed Parquet copy (see core.data_loader), its rollup cube
+    (see core.rollup_cube) and its catalog entry (see core.dataset_catalog) are extended with the delta only.
+    The existing records are never re-parsed, re-derived or written again.
+
+    Args:
+        path (str): Path of the CSV or Parquet dataset file.
+        delta (pd.DataFrame): The new records, checked with `validate_delta`.
+        existing (pd.DataFrame): The loaded dataset of `path` (with derived columns, see core.sidebar).
+
+    Returns:
+        pd.DataFrame: The dataset after the append, with derived columns.
+    """
+    # The cube and the catalog entry have to be read while they still match the current version of the dataset
+    rollup = rollup_cube.load_rollup(path, existing)
+    previous_stat = os.stat(path)
+
+    typed_delta = type_delta(delta, existing)
+    existing, enriched_delta = data_loader.unify_category_dtypes(existing, derived_columns.add_derived_columns(typed_delta.copy()))
+    # Already sorted (no re-sort) when the delta is newer than the stored records, as with a daily feed.
+    # The combined frame is handed over to core.sidebar, so the next page load does not read the file again
+    combined = pd.concat([existing, enriched_delta], ignore_index=True)
+    # Drop the load-time tags of the old version, core.sidebar tags the new one
+    combined.attrs = {}
+    combined = data_loader.sort_by_date(combined)
+
+    delta_part, compacted = write_delta_to_source(path, typed_delta, combined)
+    if rollup is not None:
+        rollup_cube.save_rollup(path, rollup_cube.merge_rollup(rollup, typed_delta))
+    if compacted:
+        dataset_catalog.register_dataset(path, combined)
+    else:
+        dataset_catalog.register_append(path, previous_stat, typed_delta, delta_part)
+
+    APPENDED_DATASETS.clear()
+    APPENDED_DATASETS[(path, os.path.getmtime(path))] = combined
+    return combined
+# -------------------------------------------------------------------------------
+def pop_appended_dataset(path: str, modified_time: float) -> pd.DataFrame:
+    """
+    Returns (once) the dataset produced by `append_violations` for this version of the file, or None.
+    """
+    return APPENDED_DATASETS.pop((path, modified_time), None)
+# ===================================================================================
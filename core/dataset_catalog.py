@@ -0,0 +1,642 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from core import data_loader, derived_columns, chunked_aggregation
+from core.data_variables import TRAFFIC_VIOLATION_COLUMNS
+
+# This module keeps a persistent catalog (manifest) of the known dataset files.
+# Each entry stores the display name, origin, row count, schema flag, size and a streaming content hash,
+# so the dataset selectors are listed without scanning directories or opening files on every rerun.
+# Row fingerprints and Violation_ID ranges are added when a file is registered (uploaded, generated or
+# appended to), reading it in chunks, to spot overlapping uploads.
+# The column profile of a dataset (see core.column_profile) is stored with its entry after the first load.
+
+# ---------------------------------------------------------
+# DATASET CATALOG CONFIGURATION
+# ---------------------------------------------------------
+# Stored next to the typed Parquet copies, so it is never committed
+CATALOG_PATH = os.path.join(data_loader.CACHE_DIR, "dataset_catalog.json")
+# Bumped whenever the entry layout or the fingerprints change, older catalogs are rebuilt
+CATALOG_VERSION = 5
+
+# Dataset directories in the order they are listed in the selectors.
+# layout: 'flat' = files in the directory, 'dated' = files in one sub-directory per day,
+# 'nested' = files anywhere below the directory (legacy uploads).
+DATASET_SOURCES = [
+    {'directory': "dataset", 'origin': "Sample", 'layout': 'flat', 'extensions': ('.csv',)},
+    {'directory': "generated_fake_traffic_datasets", 'origin': "Fake Generated", 'layout': 'dated', 'extensions': data_loader.DATASET_EXTENSIONS},
+    {'directory': "uploded_file_relateds", 'origin': "Legacy", 'layout': 'flat', 'extensions': ('.csv',)},
+    {'directory': "uploded_file_others", 'origin': "Other CSVs", 'layout': 'flat', 'extensions': ('.csv',)},
+    {'directory': "uploaded_datasets", 'origin': "Legacy", 'layout': 'nested', 'extensions': ('.csv',)},
+]
+
+# Directory mtimes are checked at most this often per process, new or removed files show up after that
+CATALOG_REFRESH_SECONDS = 2.0
+
+# Files are hashed in chunks of this size, never read whole into memory
+HASH_CHUNK_SIZE = 1024 * 1024
+HASH_DIGEST_SIZE = 32
+# The content hash is the hash of a list of HASH_BLOCK_SIZE block hashes (stored with the entry),
+# so after an append only the last block and the new bytes are hashed again
+HASH_BLOCK_SIZE = 16 * HASH_CHUNK_SIZE
+BLOCK_DIGEST_SIZE = 16
+
+# Row fingerprints: the ROW_SKETCH_SIZE smallest 64-bit row hashes of a dataset (a bottom-k sketch).
+# Comparing two sketches estimates how many rows two datasets share without re-reading them.
+ROW_SKETCH_SIZE = 256
+# Estimated share of shared rows from which two datasets are reported as near-duplicates
+NEAR_DUPLICATE_THRESHOLD = 0.5
+
+ID_COLUMN = 'Violation_ID'
+
+# The catalog of this process, re-read from CATALOG_PATH only when it is None
+CATALOG_STATE = {'catalog': None, 'checked_at': 0.0}
+CATALOG_LOCK = threading.RLock()
+
+
+# ==================================================================================
+# Block 0: Fingerprint Functions
+# ==================================================================================
+def hash_file_object(file_object) -> str:
+    """
+    Streams a binary file object (an open file or a Streamlit upload) through BLAKE2b.
+    The read position is restored afterwards.
+    """
+    return get_content_hash(read_file_digest(file_object)[0])
+# -------------------------------------------------------------------------------
+def read_file_digest(file_object, offset: int = 0) -> tuple:
+    """
+    One streaming pass over a binary file object, from `offset` (a multiple of HASH_BLOCK_SIZE) to the end.
+    The read position is restored afterwards.
+
+    Returns:
+        tuple: (BLAKE2b hash of every HASH_BLOCK_SIZE block, number of lines).
+    """
+    block_hashes = []
+    hasher = None
+    block_bytes = 0
+    line_count = 0
+    last_chunk = b''
+    position = file_object.tell()
+    file_object.seek(offset)
+    # Reads never cross a block boundary
+    for chunk in iter(lambda: file_object.read(min(HASH_CHUNK_SIZE, HASH_BLOCK_SIZE - block_bytes)), b''):
+        if hasher is None:
+            hasher = hashlib.blake2b(digest_size=BLOCK_DIGEST_SIZE)
+        hasher.update(chunk)
+        block_bytes += len(chunk)
+        if block_bytes == HASH_BLOCK_SIZE:
+            block_hashes.append(hasher.hexdigest())
+            hasher, block_bytes = None, 0
+        line_count += chunk.count(b'\n')
+        last_chunk = chunk
+    file_object.seek(position)
+    if hasher is not None:
+        block_hashes.append(hasher.hexdigest())
+    # A last line without a line break still counts
+    if last_chunk and not last_chunk.endswith(b'\n'):
+        line_count += 1
+    return block_hashes, line_count
+# -------------------------------------------------------------------------------
+def get_content_hash(block_hashes: list) -> str:
+    """
+    Content hash of a file from its block hashes (see `read_file_digest`).
+    """
+    return hashlib.blake2b(''.join(block_hashes).encode('ascii'), digest_size=HASH_DIGEST_SIZE).hexdigest()
+# -------------------------------------------------------------------------------
+def hash_parquet_parts(path: str) -> list:
+    """
+    Block hashes of a Parquet dataset: those of the file, then those of each appended delta part.
+    """
+    block_hashes = []
+    for part in data_loader.get_source_parts(path):
+        with open(part, 'rb') as f:
+            block_hashes.extend(read_file_digest(f)[0])
+    return block_hashes
+# -------------------------------------------------------------------------------
+def get_row_sketch(df: pd.DataFrame) -> list:
+    """
+    Bottom-k sketch of the rows of a typed dataset (see core.data_loader).
+    Columns are hashed in name order and the row order is ignored, so re-ordered copies match.
+    """
+    if df.empty:
+        return []
+    row_hashes = pd.util.hash_pandas_object(df[sorted(df.columns)], index=False).to_numpy()
+    unique_hashes = np.unique(row_hashes)
+    return [int(value) for value in unique_hashes[:ROW_SKETCH_SIZE]]
+# -------------------------------------------------------------------------------
+def get_id_range(df: pd.DataFrame) -> list:
+    """
+    First and last Violation_ID of a dataset as [prefix, number] pairs, or None when it has none.
+    IDs are ordered by prefix, then by the number they end with, so 'VLT999999' comes before 'VLT1000000'.
+    IDs without a number get -1.
+    """
+    if ID_COLUMN not in df.columns:
+        return None
+    ids = df[ID_COLUMN].dropna().astype(str)
+    if ids.empty:
+        return None
+    parts = ids.str.extract(r'^(.*?)(\d*)$')
+    prefixes = parts[0]
+    numbers = pd.to_numeric(parts[1], errors='coerce').fillna(-1)
+    first_prefix, last_prefix = prefixes.min(), prefixes.max()
+    return [
+        [first_prefix, int(numbers[prefixes == first_prefix].min())],
+        [last_prefix, int(numbers[prefixes == last_prefix].max())],
+    ]
+# -------------------------------------------------------------------------------
+def estimate_row_overlap(sketch_a: list, sketch_b: list) -> float:
+    """
+    Estimated share of rows the two datasets have in common (Jaccard similarity of their row sets).
+    """
+    if not sketch_a or not sketch_b:
+        return 0.0
+    set_a, set_b = set(sketch_a), set(sketch_b)
+    union_sketch = sorted(set_a | set_b)[:ROW_SKETCH_SIZE]
+    shared = sum(1 for value in union_sketch if value in set_a and value in set_b)
+    return shared / len(union_sketch)
+# -------------------------------------------------------------------------------
+def id_ranges_overlap(range_a: list, range_b: list) -> bool:
+    """
+    Checks if two Violation_ID ranges (see `get_id_range`) intersect.
+    """
+    if not range_a or not range_b:
+        return False
+    return range_a[0] <= range_b[1] and range_b[0] <= range_a[1]
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 1: Catalog Entry Functions
+# ==================================================================================
+def get_empty_catalog() -> dict:
+    """
+    Catalog layout:
+        datasets: entry per file path.
+        hashes: path of each content hash, for O(1) duplicate lookups.
+        sources: listed paths per DATASET_SOURCES directory, in display order.
+        directories: mtime of every scanned directory (None when it did not exist).
+    """
+    return {'version': CATALOG_VERSION, 'datasets': {}, 'hashes': {}, 'sources': {}, 'directories': {}}
+# -------------------------------------------------------------------------------
+def get_source(path: str) -> dict:
+    """
+    The DATASET_SOURCES item a file belongs to, or None.
+    """
+    parts = os.path.normpath(path).split(os.sep)
+    return next((source for source in DATASET_SOURCES if parts[0] == source['directory']), None)
+# -------------------------------------------------------------------------------
+def get_display_name(path: str) -> str:
+    """
+    Name of a dataset file in the selectors, e.g. "01_traffic_dataset.csv [Fake Generated - 2025-01-31]".
+    """
+    file_name = os.path.basename(path)
+    source = get_source(path)
+    if source is None:
+        return file_name
+    parent_dir = os.path.basename(os.path.dirname(path))
+    if source['layout'] == 'dated':
+        return f"{file_name} [{source['origin']} - {parent_dir}]"
+    if source['layout'] == 'nested':
+        return f"[{source['origin']}] {parent_dir}/{file_name}"
+    return f"{file_name} [{source['origin']}]"
+# -------------------------------------------------------------------------------
+def read_columns(path: str) -> list:
+    """
+    Column names of a dataset file, read from the CSV header or the Parquet schema only.
+    """
+    if path.endswith('.parquet'):
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+# -------------------------------------------------------------------------------
+def build_entry(path: str, block_hashes: list = None, row_count: int = None) -> dict:
+    """
+    Describes one dataset file from its metadata and at most one streaming read (no parsing of the records).
+    The row count of a CSV is its number of lines minus the header, unless it is given.
+    Parquet datasets are described with their appended delta parts (see core.data_loader).
+    """
+    stat = os.stat(path)
+    source = get_source(path)
+    if path.endswith('.parquet'):
+        row_count = sum(pq.ParquetFile(part).metadata.num_rows for part in data_loader.get_source_parts(path))
+        if block_hashes is None:
+            block_hashes = hash_parquet_parts(path)
+    elif block_hashes is None or row_count is None:
+        with open(path, 'rb') as f:
+            file_hashes, line_count = read_file_digest(f)
+        block_hashes = block_hashes or file_hashes
+        row_count = max(line_count - 1, 0) if row_count is None else row_count
+    return {
+        'display_name': get_display_name(path),
+        'origin': source['origin'] if source else None,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'content_hash': get_content_hash(block_hashes),
+        'block_hashes': block_hashes,
+        'row_count': row_count,
+        'traffic_schema': set(TRAFFIC_VIOLATION_COLUMNS).issubset(read_columns(path)),
+        # Row fingerprints, filled by `register_dataset`
+        'id_range': None,
+        'row_sketch': None,
+        # Column profile, filled by `set_column_profile`
+        'column_profile': None,
+    }
+# -------------------------------------------------------------------------------
+def get_fingerprints(df: pd.DataFrame, previous: dict = None) -> dict:
+    """
+    Row count, Violation_ID range and row sketch of a typed dataset.
+    Datasets read in chunks pass the fingerprints of the previous chunks as `previous`,
+    appends pass the catalog entry of the dataset they extend.
+    """
+    df = derived_columns.drop_derived_columns(df)
+    fingerprints = {'row_count': len(df), 'id_range': get_id_range(df), 'row_sketch': get_row_sketch(df)}
+    if previous is None:
+        return fingerprints
+    # Without the sketch of the previous records only the row count stays exact
+    if previous['row_sketch'] is None:
+        return {'row_count': previous['row_count'] + fingerprints['row_count'], 'id_range': None, 'row_sketch': None}
+
+    ranges = [id_range for id_range in (previous['id_range'], fingerprints['id_range']) if id_range]
+    return {
+        'row_count': previous['row_count'] + fingerprints['row_count'],
+        'id_range': [min(r[0] for r in ranges), max(r[1] for r in ranges)] if ranges else None,
+        'row_sketch': sorted(set(previous['row_sketch']).union(fingerprints['row_sketch']))[:ROW_SKETCH_SIZE],
+    }
+# -------------------------------------------------------------------------------
+def read_fingerprints(path: str) -> dict:
+    """
+    Row fingerprints of a dataset file read in chunks (see core.chunked_aggregation), never loaded whole.
+    None when the file has no records or cannot be read.
+    """
+    fingerprints = None
+    try:
+        for chunk in chunked_aggregation.iter_dataset_chunks(path, read_columns(path)):
+            fingerprints = get_fingerprints(chunk, fingerprints)
+    except Exception as e:
+        print(f"Error fingerprinting dataset {path}: {e}")
+        return None
+    return fingerprints
+# -------------------------------------------------------------------------------
+def is_entry_current(entry: dict, path: str) -> bool:
+    """
+    Checks that a catalog entry still describes the file (same size and mtime).
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False
+    return entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns
+# -------------------------------------------------------------------------------
+def put_entry(catalog: dict, path: str, entry: dict) -> None:
+    """
+    Adds or replaces the entry of a path, keeping the hash index in step.
+    """
+    drop_entry(catalog, path)
+    catalog['datasets'][path] = entry
+    catalog['hashes'][entry['content_hash']] = path
+# -------------------------------------------------------------------------------
+def drop_entry(catalog: dict, path: str) -> None:
+    """
+    Removes the entry of a path. Its hash index item moves to another copy of the same file, if any.
+    """
+    old_entry = catalog['datasets'].pop(path, None)
+    if old_entry is None or catalog['hashes'].get(old_entry['content_hash']) != path:
+        return
+    content_hash = old_entry['content_hash']
+    copy_path = next((other for other, entry in catalog['datasets'].items() if entry['content_hash'] == content_hash), None)
+    if copy_path is None:
+        del catalog['hashes'][content_hash]
+    else:
+        catalog['hashes'][content_hash] = copy_path
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 2: Directory Scan Functions
+# ==================================================================================
+def get_directory_mtime(directory: str) -> int:
+    """
+    mtime of a directory in nanoseconds, None when it does not exist.
+    Adding, removing or renaming a file changes the mtime of its directory.
+    """
+    try:
+        return os.stat(directory).st_mtime_ns
+    except OSError:
+        return None
+# -------------------------------------------------------------------------------
+def is_dataset_file(source: dict, name: str) -> bool:
+    """
+    Checks if a file of a source directory is listed as a dataset. Appended delta parts belong to their dataset.
+    """
+    return name.endswith(source['extensions']) and not data_loader.is_delta_part(name)
+# -------------------------------------------------------------------------------
+def scan_source(source: dict) -> tuple:
+    """
+    Lists the dataset files of one source directory in display order.
+
+    Returns:
+        tuple: (file paths, {scanned directory: mtime}).
+    """
+    root = source['directory']
+    directories = {root: get_directory_mtime(root)}
+    paths = []
+    if directories[root] is None:
+        return paths, directories
+
+    if source['layout'] == 'nested':
+        for current_dir, _, files in os.walk(root):
+            directories[current_dir] = get_directory_mtime(current_dir)
+            paths.extend(os.path.join(current_dir, name) for name in files if is_dataset_file(source, name))
+        return paths, directories
+
+    if source['layout'] == 'dated':
+        # Newest day first
+        day_dirs = [os.path.join(root, name) for name in sorted(os.listdir(root), reverse=True)]
+        scan_dirs = [day_dir for day_dir in day_dirs if os.path.isdir(day_dir)]
+    else:
+        scan_dirs = [root]
+    for scan_dir in scan_dirs:
+        directories[scan_dir] = get_directory_mtime(scan_dir)
+        for name in sorted(os.listdir(scan_dir)):
+            if is_dataset_file(source, name):
+                paths.append(os.path.join(scan_dir, name))
+    return paths, directories
+# -------------------------------------------------------------------------------
+def is_source_current(catalog: dict, source: dict) -> bool:
+    """
+    Checks the stored mtimes of the directories scanned for a source, without listing them.
+    """
+    root = source['directory']
+    scanned = {directory: mtime for directory, mtime in catalog['directories'].items() if get_source(directory) is source}
+    if root not in scanned:
+        return False
+    return all(get_directory_mtime(directory) == mtime for directory, mtime in scanned.items())
+# -------------------------------------------------------------------------------
+def refresh_source(catalog: dict, source: dict) -> None:
+    """
+    Rescans one source directory. Entries of unchanged files are kept, only new or changed files are read.
+    """
+    paths, directories = scan_source(source)
+    old_paths = set(catalog['sources'].get(source['directory'], []))
+    for path in old_paths.difference(paths):
+        drop_entry(catalog, path)
+
+    listed_paths = []
+    for path in paths:
+        entry = catalog['datasets'].get(path)
+        if entry is None or not is_entry_current(entry, path):
+            try:
+                put_entry(catalog, path, build_entry(path))
+            except Exception as e:
+                print(f"Error cataloging dataset {path}: {e}")
+                continue
+        listed_paths.append(path)
+
+    catalog['sources'][source['directory']] = listed_paths
+    catalog['directories'] = {
+        directory: mtime for directory, mtime in catalog['directories'].items() if get_source(directory) is not source
+    }
+    catalog['directories'].update(directories)
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 3: Catalog Storage Functions
+# ==================================================================================
+def load_catalog() -> dict:
+    """
+    Reads the catalog file. A missing, unreadable or outdated catalog is returned empty.
+    """
+    try:
+        with open(CATALOG_PATH, 'r', encoding='utf-8') as f:
+            catalog = json.load(f)
+        if catalog.get('version') == CATALOG_VERSION:
+            return catalog
+    except (OSError, ValueError):
+        pass
+    return get_empty_catalog()
+# -------------------------------------------------------------------------------
+def save_catalog(catalog: dict) -> None:
+    """
+    Writes the catalog file.
+    """
+    try:
+        os.makedirs(os.path.dirname(CATALOG_PATH), exist_ok=True)
+        # Write to a temporary file first so readers never see a partial catalog
+        temp_path = f"{CATALOG_PATH}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(catalog, f)
+        os.replace(temp_path, CATALOG_PATH)
+    except OSError as e:
+        print(f"Error writing dataset catalog {CATALOG_PATH}: {e}")
+# -------------------------------------------------------------------------------
+def get_stored_catalog() -> dict:
+    """
+    Returns the catalog of this process as last refreshed, without checking the directories.
+    """
+    with CATALOG_LOCK:
+        if CATALOG_STATE['catalog'] is None:
+            CATALOG_STATE['catalog'] = load_catalog()
+        return CATALOG_STATE['catalog']
+# -------------------------------------------------------------------------------
+def get_catalog() -> dict:
+    """
+    Returns the catalog of this process, refreshed lazily.
+
+    At most every CATALOG_REFRESH_SECONDS the mtimes of the scanned directories are compared with the
+    stored ones, and only sources with a changed directory are listed again.
+    The returned catalog is shared, callers must not modify it.
+    """
+    with CATALOG_LOCK:
+        catalog = get_stored_catalog()
+
+        if time.monotonic() - CATALOG_STATE['checked_at'] >= CATALOG_REFRESH_SECONDS:
+            changed = False
+            for source in DATASET_SOURCES:
+                if not is_source_current(catalog, source):
+                    refresh_source(catalog, source)
+                    changed = True
+            if changed:
+                save_catalog(catalog)
+            CATALOG_STATE['checked_at'] = time.monotonic()
+        return catalog
+# -------------------------------------------------------------------------------
+def list_datasets(traffic_only: bool = False) -> list:
+    """
+    Cataloged dataset files in display order.
+
+    Args:
+        traffic_only (bool): Only list files with every TRAFFIC_VIOLATION_COLUMNS column.
+
+    Returns:
+        list: (path, entry) pairs.
+    """
+    catalog = get_catalog()
+    datasets = []
+    for source in DATASET_SOURCES:
+        for path in catalog['sources'].get(source['directory'], []):
+            entry = catalog['datasets'].get(path)
+            if entry is not None and (entry['traffic_schema'] or not traffic_only):
+                datasets.append((path, entry))
+    return datasets
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 4: Catalog Update Functions
+# ==================================================================================
+def register_dataset(path: str, df: pd.DataFrame = None, block_hashes: list = None, fingerprints: dict = None) -> dict:
+    """
+    Adds (or refreshes) a dataset file in the catalog, e.g. after it was uploaded or generated.
+
+    Args:
+        path (str): Path of the CSV or Parquet file.
+        df (pd.DataFrame): The typed dataset of the file, used for the row fingerprints when given.
+            Without `df` or `fingerprints` the file is read in chunks for them.
+        block_hashes (list): The file's block hashes when already known, e.g. from the upload buffer
+            (see `read_file_digest`).
+        fingerprints (dict): Row fingerprints already collected while the file was read in chunks
+            (see `get_fingerprints`), used when `df` is not given.
+
+    Returns:
+        dict: The catalog entry of the file.
+    """
+    if df is not None:
+        fingerprints = get_fingerprints(df)
+    elif fingerprints is None:
+        fingerprints = read_fingerprints(path)
+    entry = build_entry(path, block_hashes, fingerprints['row_count'] if fingerprints else None)
+    if fingerprints is not None:
+        entry.update(fingerprints)
+    with CATALOG_LOCK:
+        catalog = get_catalog()
+        put_entry(catalog, path, entry)
+        save_catalog(catalog)
+        # The file's directory changed, list it again on the next lookup
+        CATALOG_STATE['checked_at'] = 0.0
+    return entry
+# -------------------------------------------------------------------------------
+def register_append(path: str, previous_stat: os.stat_result, delta: pd.DataFrame, delta_part: str = None) -> dict:
+    """
+    Updates the entry of a dataset file after records were appended to it (see core.dataset_append).
+    Only what the append changed is read: the new delta part of a Parquet dataset,
+    or the last block and the new bytes of a CSV. The fingerprints of the delta are merged into the entry.
+    A file without an entry for its version before the append is registered from scratch.
+
+    Args:
+        path (str): Path of the CSV or Parquet file.
+        previous_stat (os.stat_result): `os.stat` of the file before the append.
+        delta (pd.DataFrame): The typed appended records.
+        delta_part (str): The delta part file written for a Parquet dataset.
+
+    Returns:
+        dict: The catalog entry of the file.
+    """
+    with CATALOG_LOCK:
+        # The append changed the file's directory, a refresh would hash the whole file again
+        catalog = get_stored_catalog()
+        previous = catalog['datasets'].get(path)
+        if (previous is None or previous.get('size') != previous_stat.st_size
+                or previous.get('mtime_ns') != previous_stat.st_mtime_ns):
+            return register_dataset(path)
+
+        if delta_part is not None:
+            with open(delta_part, 'rb') as f:
+                block_hashes = previous['block_hashes'] + read_file_digest(f)[0]
+        else:
+            # Blocks before the old end of the file are unchanged, the last one may have been partial
+            full_blocks = previous_stat.st_size // HASH_BLOCK_SIZE
+            with open(path, 'rb') as f:
+                block_hashes = previous['block_hashes'][:full_blocks] + read_file_digest(f, full_blocks * HASH_BLOCK_SIZE)[0]
+
+        stat = os.stat(path)
+        entry = dict(previous)
+        entry.update(get_fingerprints(delta, previous))
+        entry.update({
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'content_hash': get_content_hash(block_hashes),
+            'block_hashes': block_hashes,
+            # Profiled again from the loaded dataset on the next load
+            'column_profile': None,
+        })
+        put_entry(catalog, path, entry)
+        save_catalog(catalog)
+        CATALOG_STATE['checked_at'] = 0.0
+    return entry
+# -------------------------------------------------------------------------------
+def unregister_dataset(path: str) -> None:
+    """
+    Removes a deleted dataset file from the catalog.
+    """
+    with CATALOG_LOCK:
+        catalog = get_catalog()
+        drop_entry(catalog, path)
+        save_catalog(catalog)
+        CATALOG_STATE['checked_at'] = 0.0
+# -------------------------------------------------------------------------------
+def get_column_profile(path: str) -> dict:
+    """
+    The stored column profile of a dataset file, or None when it has none or the file changed since.
+    """
+    with CATALOG_LOCK:
+        entry = get_catalog()['datasets'].get(path)
+        if entry is None or not is_entry_current(entry, path):
+            return None
+        return entry.get('column_profile')
+# -------------------------------------------------------------------------------
+def set_column_profile(path: str, profile: dict) -> None:
+    """
+    Stores the column profile of a cataloged dataset file. Files not in the catalog are skipped.
+    """
+    with CATALOG_LOCK:
+        catalog = get_catalog()
+        entry = catalog['datasets'].get(path)
+        if entry is None or not is_entry_current(entry, path):
+            return
+        entry['column_profile'] = profile
+        save_catalog(catalog)
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 5: Duplicate Lookup Functions
+# ==================================================================================
+def find_exact_duplicate(catalog: dict, content_hash: str) -> str:
+    """
+    Path of a cataloged file with exactly the same content, or None.
+    """
+    path = catalog['hashes'].get(content_hash)
+    if path is not None and os.path.exists(path):
+        return path
+    return None
+# -------------------------------------------------------------------------------
+def find_overlapping_datasets(catalog: dict, path: str) -> list:
+    """
+    Other cataloged datasets that share rows or Violation_IDs with a cataloged file.
+
+    Returns:
+        list: (path, estimated share of shared rows, whether the Violation_ID ranges overlap),
+            most similar first.
+    """
+    entry = catalog['datasets'].get(path)
+    if entry is None:
+        return []
+    overlaps = []
+    for other_path, other_entry in catalog['datasets'].items():
+        # Files found by a directory scan have no fingerprints, they are skipped rather than loaded
+        if other_path == path or other_entry['row_sketch'] is None:
+            continue
+        row_overlap = estimate_row_overlap(entry['row_sketch'], other_entry['row_sketch'])
+        id_overlap = id_ranges_overlap(entry['id_range'], other_entry['id_range'])
+        if row_overlap >= NEAR_DUPLICATE_THRESHOLD or id_overlap:
+            overlaps.append((other_path, row_overlap, id_overlap))
+    return sorted(overlaps, key=lambda item: item[1], reverse=True)
+# ===================================================================================
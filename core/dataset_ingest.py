@@ -0,0 +1,212 @@
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from core import data_loader, dataset_catalog
+from core.data_variables import TRAFFIC_VIOLATION_COLUMNS
+
+# This module saves uploaded CSV files at constant memory: the header decides where the file goes,
+# the body is copied and converted to the typed Parquet cache chunk by chunk.
+
+# ---------------------------------------------------------
+# INGEST CONFIGURATION
+# ---------------------------------------------------------
+# Files with every TRAFFIC_VIOLATION_COLUMNS column are saved in the first directory, others in the second
+TRAFFIC_UPLOAD_DIR = "uploded_file_relateds"
+OTHER_UPLOAD_DIR = "uploded_file_others"
+
+# Bytes per copy step and records per parsed chunk, what is held in memory at a time
+COPY_CHUNK_SIZE = 8 * 1024 * 1024
+INGEST_CHUNK_ROWS = 100_000
+
+# Share of the progress bar used by the copy step, the conversion uses the rest
+COPY_PROGRESS_SHARE = 0.2
+
+# Columns whose values are parsed (not only stored as text), checked for unreadable values
+PARSED_COLUMNS = data_loader.INTEGER_COLUMNS + data_loader.FLOAT_COLUMNS + [data_loader.DATE_COLUMN]
+
+
+# ==================================================================================
+# Block 0: Header Functions
+# ==================================================================================
+def read_upload_header(file_object) -> list:
+    """
+    Column names of an uploaded CSV, read from its first line only. The read position is restored.
+    """
+    position = file_object.tell()
+    file_object.seek(0)
+    columns = list(pd.read_csv(file_object, nrows=0).columns)
+    file_object.seek(position)
+    return columns
+# -------------------------------------------------------------------------------
+def get_upload_dir(columns: list) -> str:
+    """
+    Directory an upload is saved in, chosen from its header.
+    """
+    if set(TRAFFIC_VIOLATION_COLUMNS).issubset(columns):
+        return TRAFFIC_UPLOAD_DIR
+    return OTHER_UPLOAD_DIR
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 1: Copy Functions
+# ==================================================================================
+def copy_upload(file_object, file_path: str, progress_callback=None) -> int:
+    """
+    Copies an uploaded file to disk in COPY_CHUNK_SIZE steps.
+    The file is written under a temporary name and renamed at the end, so a partial file is never listed.
+
+    Args:
+        file_object: The uploaded file (any binary file object with `seek` / `read`).
+        file_path (str): Destination path.
+        progress_callback: Called as `progress_callback(bytes_copied)` after every step.
+
+    Returns:
+        int: The number of bytes copied.
+    """
+    temp_path = f"{file_path}.part"
+    bytes_copied = 0
+    file_object.seek(0)
+    try:
+        with open(temp_path, 'wb') as f:
+            for chunk in iter(lambda: file_object.read(COPY_CHUNK_SIZE), b''):
+                f.write(chunk)
+                bytes_copied += len(chunk)
+                if progress_callback:
+                    progress_callback(bytes_copied)
+        os.replace(temp_path, file_path)
+    finally:
+        file_object.seek(0)
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return bytes_copied
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 2: Columnar Conversion Functions
+# ==================================================================================
+def get_stream_schema(schema: pa.Schema) -> pa.Schema:
+    """
+    Parquet schema shared by every chunk: int64 for the integer columns and int32 dictionary indices,
+    since each chunk may have picked a different integer or index width.
+    """
+    fields = []
+    for field in schema:
+        if pa.types.is_dictionary(field.type):
+            field = field.with_type(pa.dictionary(pa.int32(), field.type.value_type))
+        elif field.name in data_loader.INTEGER_COLUMNS:
+            field = field.with_type(pa.int64())
+        fields.append(field)
+    return pa.schema(fields, metadata=schema.metadata)
+# -------------------------------------------------------------------------------
+def count_unreadable_values(raw: pd.DataFrame, typed: pd.DataFrame) -> pd.Series:
+    """
+    Per parsed column, the number of values present in the file but not readable as a number / date.
+    """
+    columns = [col for col in PARSED_COLUMNS if col in raw.columns]
+    return pd.Series({col: int((raw[col].notna() & typed[col].isna()).sum()) for col in columns}, dtype='int64')
+# -------------------------------------------------------------------------------
+def convert_to_cache(file_path: str, progress_callback=None) -> dict:
+    """
+    Parses a saved CSV in chunks of INGEST_CHUNK_ROWS records and writes its typed Parquet cache
+    (see core.data_loader) and its row fingerprints (see core.dataset_catalog) on the way.
+
+    A file whose columns change type between chunks is left without a cache,
+    `data_loader.load_dataset` then builds it from the whole file on first use.
+
+    Args:
+        file_path (str): Path of the saved CSV file.
+        progress_callback: Called as `progress_callback(bytes_read, total_bytes)` after every chunk.
+
+    Returns:
+        dict: 'fingerprints' (None when the conversion failed) and 'unreadable_values' (pd.Series per column).
+    """
+    total_bytes = os.path.getsize(file_path)
+    read_dtypes = data_loader.get_read_dtypes(pd.read_csv(file_path, nrows=0).columns)
+    cache_path = data_loader.get_cache_path(file_path)
+    # The cache directory is filled under a temporary name and renamed at the end
+    temp_dir = f"{cache_path}.tmp"
+    data_loader.remove_dataset_cache(file_path)
+
+    fingerprints = None
+    unreadable_values = pd.Series(dtype='int64')
+    writer = None
+    try:
+        os.makedirs(temp_dir, exist_ok=True)
+        with open(file_path, 'rb') as f:
+            for raw in pd.read_csv(f, dtype=read_dtypes, chunksize=INGEST_CHUNK_ROWS):
+                typed = data_loader.apply_schema(raw.copy(deep=False))
+                unreadable_values = unreadable_values.add(count_unreadable_values(raw, typed), fill_value=0).astype('int64')
+                fingerprints = dataset_catalog.get_fingerprints(typed, fingerprints)
+
+                table = pa.Table.from_pandas(typed, preserve_index=False)
+                if writer is None:
+                    schema = get_stream_schema(table.schema)
+                    writer = pq.ParquetWriter(os.path.join(temp_dir, data_loader.get_part_name(0)), schema)
+                writer.write_table(table.cast(schema))
+                if progress_callback:
+                    progress_callback(min(f.tell(), total_bytes), total_bytes)
+        if writer is not None:
+            writer.close()
+            writer = None
+            os.replace(temp_dir, cache_path)
+    except Exception as e:
+        print(f"Error converting {file_path} to the dataset cache: {e}")
+        fingerprints = None
+    finally:
+        if writer is not None:
+            writer.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+    return {'fingerprints': fingerprints, 'unreadable_values': unreadable_values[unreadable_values > 0]}
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 3: Upload Pipeline Functions
+# ==================================================================================
+def ingest_upload(file_object, file_name: str, block_hashes: list = None, progress_callback=None) -> dict:
+    """
+    Saves an uploaded CSV: classifies it by its header, copies it to its upload directory,
+    converts it to the typed Parquet cache and registers it in the dataset catalog.
+    Memory use is bounded by COPY_CHUNK_SIZE and INGEST_CHUNK_ROWS, not by the file size.
+
+    Args:
+        file_object: The uploaded file.
+        file_name (str): Name to save the file under.
+        block_hashes (list): The upload's block hashes when already computed for the duplicate check
+            (see dataset_catalog.read_file_digest).
+        progress_callback: Called as `progress_callback(fraction, text)` while the file is processed.
+
+    Returns:
+        dict: 'path' and 'save_dir' of the saved file, 'row_count', and 'unreadable_values'
+            (pd.Series of unreadable values per column, empty when every value was read).
+    """
+    save_dir = get_upload_dir(read_upload_header(file_object))
+    os.makedirs(save_dir, exist_ok=True)
+    file_path = os.path.join(save_dir, file_name)
+
+    file_object.seek(0, os.SEEK_END)
+    total_bytes = max(file_object.tell(), 1)
+    def report_copy(bytes_copied):
+        if progress_callback:
+            progress_callback(COPY_PROGRESS_SHARE * bytes_copied / total_bytes, "Saving file ...")
+    def report_conversion(bytes_read, file_bytes):
+        if progress_callback:
+            fraction = COPY_PROGRESS_SHARE + (1 - COPY_PROGRESS_SHARE) * bytes_read / max(file_bytes, 1)
+            progress_callback(fraction, f"Converting records ... {bytes_read / 2**20:,.0f} / {file_bytes / 2**20:,.0f} MB")
+
+    copy_upload(file_object, file_path, report_copy)
+    conversion = convert_to_cache(file_path, report_conversion)
+    entry = dataset_catalog.register_dataset(file_path, block_hashes=block_hashes, fingerprints=conversion['fingerprints'])
+    return {
+        'path': file_path,
+        'save_dir': save_dir,
+        'row_count': entry['row_count'],
+        'unreadable_values': conversion['unreadable_values'],
+    }
+# ===================================================================================
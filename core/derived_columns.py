@@ -0,0 +1,254 @@
+import numpy as np
+import pandas as pd
+
+from core import data_loader
+
+# This module computes the derived columns that are added once to every loaded dataset
+
+# ---------------------------------------------------------
+# SEVERITY SCORE CONFIGURATION
+# ---------------------------------------------------------
+SEVERITY_SCORE_COLUMN = 'Violation_Severity_Score'
+
+# Numeric columns added to the score as value * weight (missing values count as 0)
+SEVERITY_NUMERIC_WEIGHTS = {
+    'Fine_Amount': 1 / 1000,
+    'Penalty_Points': 1,
+    'Alcohol_Level': 10,
+    'Previous_Violations': 1.5,
+}
+
+# Added per km/h above the speed limit
+SEVERITY_OVERSPEED_WEIGHT = 1 / 10
+
+# Flat weight added when a column equals the given value
+SEVERITY_FLAG_WEIGHTS = {
+    'Helmet_Worn': ('No', 10),
+    'Seatbelt_Worn': ('No', 10),
+    'Traffic_Light_Status': ('Red', 15),
+}
+
+# ---------------------------------------------------------
+# DRIVER RISK LEVEL CONFIGURATION
+# ---------------------------------------------------------
+RISK_LEVEL_COLUMN = 'Risk_Level'
+RISK_NUMERIC_WEIGHTS = {'Previous_Violations': 1}
+RISK_FLAG_WEIGHTS = {'Breathalyzer_Result': ('Positive', 1)}
+
+# ---------------------------------------------------------
+# DATE / TIME / SPEED COLUMN CONFIGURATION
+# ---------------------------------------------------------
+HOUR_COLUMN = 'Hour'                # Int8, hour of 'Time'
+WEEKDAY_COLUMN = 'Weekday'          # ordered category, day name of 'Date'
+MONTH_COLUMN = 'Month'              # ordered category, month name of 'Date'
+YEAR_COLUMN = 'Year'                # Int16, year of 'Date'
+YEAR_MONTH_COLUMN = 'Year_Month'    # period[M] of 'Date'
+EXCESS_SPEED_COLUMN = 'Excess_Speed'  # Int16, 'Recorded_Speed' - 'Speed_Limit'
+
+WEEKDAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+MONTH_ORDER = [
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+]
+
+# Columns added by `add_derived_columns`, hidden again wherever the raw dataset is shown
+DERIVED_COLUMNS = [
+    SEVERITY_SCORE_COLUMN, RISK_LEVEL_COLUMN,
+    HOUR_COLUMN, WEEKDAY_COLUMN, MONTH_COLUMN, YEAR_COLUMN, YEAR_MONTH_COLUMN, EXCESS_SPEED_COLUMN
+]
+
+
+# ==================================================================================
+# Block 0: Vectorized Scoring Functions
+# ==================================================================================
+def get_numeric_values(df: pd.DataFrame, col: str) -> np.ndarray:
+    """
+    Returns a column as a float64 NumPy array with missing values set to 0.
+    """
+    values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+    return np.nan_to_num(values, nan=0.0)
+# -------------------------------------------------------------------------------
+def calculate_weighted_score(
+    df: pd.DataFrame,
+    numeric_weights: dict,
+    flag_weights: dict,
+    overspeed_weight: float = 0
+) -> pd.Series:
+    """
+    Calculates a weighted score for every row with column arithmetic and boolean masks.
+    Columns missing from the DataFrame are skipped.
+
+    Args:
+        df (pd.DataFrame): The dataset.
+        numeric_weights (dict): Column -> weight, adds value * weight.
+        flag_weights (dict): Column -> (value, weight), adds weight where the column equals value.
+        overspeed_weight (float): Weight per unit of 'Recorded_Speed' above 'Speed_Limit'.
+
+    Returns:
+        pd.Series: The float64 score aligned to the DataFrame index.
+    """
+    score = np.zeros(len(df), dtype='float64')
+
+    for col, weight in numeric_weights.items():
+        if col in df.columns:
+            score += get_numeric_values(df, col) * weight
+
+    if overspeed_weight and {'Recorded_Speed', 'Speed_Limit'}.issubset(df.columns):
+        overspeed = get_numeric_values(df, 'Recorded_Speed') - get_numeric_values(df, 'Speed_Limit')
+        score += np.clip(overspeed, 0, None) * overspeed_weight
+
+    for col, (value, weight) in flag_weights.items():
+        if col in df.columns:
+            score += df[col].eq(value).to_numpy(dtype=bool, na_value=False) * weight
+
+    return pd.Series(score, index=df.index)
+# -------------------------------------------------------------------------------
+def calculate_severity_score(
+    df: pd.DataFrame,
+    numeric_weights: dict = None,
+    flag_weights: dict = None,
+    overspeed_weight: float = None
+) -> pd.Series:
+    """
+    Calculates the Violation Severity Score. Uses the SEVERITY_* weights unless overridden.
+    """
+    return calculate_weighted_score(
+        df,
+        SEVERITY_NUMERIC_WEIGHTS if numeric_weights is None else numeric_weights,
+        SEVERITY_FLAG_WEIGHTS if flag_weights is None else flag_weights,
+        SEVERITY_OVERSPEED_WEIGHT if overspeed_weight is None else overspeed_weight
+    )
+# -------------------------------------------------------------------------------
+def calculate_risk_level(df: pd.DataFrame) -> pd.Series:
+    """
+    Calculates the driver Risk Level: previous violations plus one for a positive breathalyzer result.
+    """
+    return calculate_weighted_score(df, RISK_NUMERIC_WEIGHTS, RISK_FLAG_WEIGHTS)
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 1: Date / Time / Speed Functions
+# ==================================================================================
+def calculate_hour(times: pd.Series) -> pd.Series:
+    """
+    Extracts the hour of a 'Time' column as Int8.
+    Category columns are parsed once per distinct value instead of once per row.
+    """
+    if isinstance(times.dtype, pd.CategoricalDtype):
+        category_hours = pd.to_datetime(times.cat.categories.astype(str), format='mixed', errors='coerce').hour
+        codes = times.cat.codes.to_numpy()
+        hours = np.where(codes >= 0, np.asarray(category_hours, dtype='float64')[codes], np.nan)
+        return pd.Series(hours, index=times.index).astype('Int8')
+    return pd.to_datetime(times, format='mixed', errors='coerce').dt.hour.astype('Int8')
+# -------------------------------------------------------------------------------
+def calculate_named_period(values: pd.Series, names: list) -> pd.Series:
+    """
+    Builds an ordered category from zero-based period numbers (day of week, month - 1).
+    """
+    codes = values.fillna(-1).astype('int8').to_numpy()
+    return pd.Series(pd.Categorical.from_codes(codes, categories=names, ordered=True), index=values.index)
+# -------------------------------------------------------------------------------
+def get_dates(df: pd.DataFrame) -> pd.Series:
+    """
+    Returns the 'Date' column as datetime, parsing it only when it is not typed yet.
+    """
+    if pd.api.types.is_datetime64_any_dtype(df['Date']):
+        return df['Date']
+    return data_loader.parse_date_column(df['Date'])
+# -------------------------------------------------------------------------------
+def calculate_weekday(dates: pd.Series) -> pd.Series:
+    """
+    Day name of a datetime 'Date' column as an ordered category.
+    """
+    return calculate_named_period(dates.dt.dayofweek, WEEKDAY_ORDER)
+# -------------------------------------------------------------------------------
+def calculate_month(dates: pd.Series) -> pd.Series:
+    """
+    Month name of a datetime 'Date' column as an ordered category.
+    """
+    return calculate_named_period(dates.dt.month - 1, MONTH_ORDER)
+# -------------------------------------------------------------------------------
+def calculate_excess_speed(df: pd.DataFrame) -> pd.Series:
+    """
+    Recorded speed minus speed limit as Int16. Negative values mean the driver was under the limit.
+    """
+    recorded = pd.to_numeric(df['Recorded_Speed'], errors='coerce')
+    limit = pd.to_numeric(df['Speed_Limit'], errors='coerce')
+    return (recorded - limit).round().astype('Int16')
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 2: Derived Column Functions
+# ==================================================================================
+def add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Enrichment stage run once per loaded dataset.
+    Adds the score, date, time and speed columns so the pages and plots read them instead of re-deriving them.
+    Columns are only added when their source columns exist.
+    """
+    for col in DERIVED_COLUMN_SOURCES:
+        if can_derive_column(df, col):
+            df[col] = DERIVED_COLUMN_FUNCTIONS[col](df)
+    return df
+# -------------------------------------------------------------------------------
+def can_derive_column(df: pd.DataFrame, col: str) -> bool:
+    """
+    Checks that the source columns of a derived column are present (and 'Date' is already datetime).
+    """
+    sources = DERIVED_COLUMN_SOURCES[col]
+    if not set(sources).issubset(df.columns):
+        return False
+    return 'Date' not in sources or pd.api.types.is_datetime64_any_dtype(df['Date'])
+# -------------------------------------------------------------------------------
+def get_derived_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """
+    Returns a derived column added at load time, or calculates it when the frame does not have it.
+    """
+    if col in df.columns:
+        return df[col]
+    return DERIVED_COLUMN_FUNCTIONS[col](df)
+# -------------------------------------------------------------------------------
+def get_severity_score(df: pd.DataFrame) -> pd.Series:
+    """
+    Returns the cached severity score column, or calculates it when the column is missing.
+    """
+    return get_derived_column(df, SEVERITY_SCORE_COLUMN)
+# -------------------------------------------------------------------------------
+def get_risk_level(df: pd.DataFrame) -> pd.Series:
+    """
+    Returns the cached risk level column, or calculates it when the column is missing.
+    """
+    return get_derived_column(df, RISK_LEVEL_COLUMN)
+# -------------------------------------------------------------------------------
+def drop_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the dataset without the derived columns, for views of the raw data.
+    """
+    return df.drop(columns=[col for col in DERIVED_COLUMNS if col in df.columns])
+# ===================================================================================
+
+
+# Source columns and calculation of every derived column, in the order they are added.
+# The scores need every weighted column, so datasets without the traffic columns do not get them.
+DERIVED_COLUMN_SOURCES = {
+    SEVERITY_SCORE_COLUMN: list(SEVERITY_NUMERIC_WEIGHTS) + ['Recorded_Speed', 'Speed_Limit'] + list(SEVERITY_FLAG_WEIGHTS),
+    RISK_LEVEL_COLUMN: list(RISK_NUMERIC_WEIGHTS) + list(RISK_FLAG_WEIGHTS),
+    HOUR_COLUMN: ['Time'],
+    WEEKDAY_COLUMN: ['Date'],
+    MONTH_COLUMN: ['Date'],
+    YEAR_COLUMN: ['Date'],
+    YEAR_MONTH_COLUMN: ['Date'],
+    EXCESS_SPEED_COLUMN: ['Recorded_Speed', 'Speed_Limit'],
+}
+DERIVED_COLUMN_FUNCTIONS = {
+    SEVERITY_SCORE_COLUMN: calculate_severity_score,
+    RISK_LEVEL_COLUMN: calculate_risk_level,
+    HOUR_COLUMN: lambda df: calculate_hour(df['Time']),
+    WEEKDAY_COLUMN: lambda df: calculate_weekday(get_dates(df)),
+    MONTH_COLUMN: lambda df: calculate_month(get_dates(df)),
+    YEAR_COLUMN: lambda df: get_dates(df).dt.year.astype('Int16'),
+    YEAR_MONTH_COLUMN: lambda df: get_dates(df).dt.to_period('M'),
+    EXCESS_SPEED_COLUMN: calculate_excess_speed,
+}
@@ -0,0 +1,197 @@
+import io
+import os
+import hashlib
+import inspect
+
+import pandas as pd
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from PIL import Image
+
+from core import summary_cache
+
+# This module caches rendered plots as PNG bytes, so reruns with unchanged inputs skip matplotlib
+
+# ---------------------------------------------------------
+# FIGURE CACHE CONFIGURATION
+# ---------------------------------------------------------
+# Same output settings as st.pyplot, so cached images look like the live figures did
+FIGURE_FORMAT = 'png'
+FIGURE_DPI = 200
+# st.image / st.pyplot downsize wider images on every display, cached images are stored at this width
+FIGURE_MAX_WIDTH = 2 * 730
+
+# Disk tier, shared by every process. Oldest used files are removed above the byte budget.
+FIGURE_CACHE_DIR = ".figure_cache"
+FIGURE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# Bumped whenever the plot functions change their output
+FIGURE_CACHE_VERSION = 1
+
+# Inputs with at most this many rows are hashed by content.
+# Larger frames tagged by core.sidebar are row slices of a loaded dataset and are keyed by the
+# dataset fingerprint, their row labels and their columns, which avoids hashing every value.
+CONTENT_HASH_MAX_ROWS = 50_000
+
+
+# ==================================================================================
+# Block 0: Cache Key Functions
+# ==================================================================================
+def get_frame_fingerprint(data) -> str:
+    """
+    Fingerprint of a DataFrame or Series passed to a plot function.
+    """
+    hasher = hashlib.blake2b(digest_size=16)
+    columns = data.dtypes.items() if isinstance(data, pd.DataFrame) else [(data.name, data.dtype)]
+    hasher.update(repr([(str(col), str(dtype)) for col, dtype in columns]).encode('utf-8'))
+
+    dataset_fingerprint = data.attrs.get(summary_cache.FINGERPRINT_ATTR)
+    if dataset_fingerprint is not None and len(data) > CONTENT_HASH_MAX_ROWS:
+        hasher.update(dataset_fingerprint.encode('utf-8'))
+        hasher.update(pd.util.hash_pandas_object(data.index).to_numpy().tobytes())
+    else:
+        hasher.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return hasher.hexdigest()
+# -------------------------------------------------------------------------------
+def get_style_fingerprint(plot_func) -> str:
+    """
+    Fingerprint of the style constants (UPPER_CASE globals: sizes, palettes, ...) of a plot module.
+    """
+    module = inspect.getmodule(plot_func)
+    constants = sorted((name, repr(value)) for name, value in vars(module).items() if name.isupper())
+    return repr(constants)
+# -------------------------------------------------------------------------------
+def get_figure_key(plot_func, args: tuple, kwargs: dict) -> str:
+    """
+    Cache key of one plot: function, input data fingerprints, other arguments and style.
+    """
+    def describe(value):
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            return get_frame_fingerprint(value)
+        return repr(value)
+
+    parts = [
+        FIGURE_CACHE_VERSION, FIGURE_FORMAT, FIGURE_DPI,
+        plot_func.__module__, plot_func.__qualname__, get_style_fingerprint(plot_func),
+        [describe(arg) for arg in args],
+        sorted((name, describe(value)) for name, value in kwargs.items()),
+    ]
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 1: Rendering and Disk Tier Functions
+# ==================================================================================
+def render_figure(fig: Figure) -> bytes:
+    """
+    Renders a figure to PNG bytes, at most FIGURE_MAX_WIDTH pixels wide, and closes it.
+    """
+    image = io.BytesIO()
+    fig.savefig(image, format=FIGURE_FORMAT, dpi=FIGURE_DPI, bbox_inches='tight')
+    plt.close(fig)
+
+    pil_image = Image.open(image)
+    width, height = pil_image.size
+    if width <= FIGURE_MAX_WIDTH:
+        return image.getvalue()
+    # Same downsizing Streamlit would do when showing the image, done once here instead
+    pil_image = pil_image.resize((FIGURE_MAX_WIDTH, int(height * FIGURE_MAX_WIDTH / width)), resample=Image.BILINEAR)
+    resized = io.BytesIO()
+    pil_image.save(resized, format=FIGURE_FORMAT)
+    return resized.getvalue()
+# -------------------------------------------------------------------------------
+def get_figure_cache_path(key: str) -> str:
+    """
+    Returns the disk tier path of a cache key.
+    """
+    return os.path.join(FIGURE_CACHE_DIR, f"{key}.{FIGURE_FORMAT}")
+# -------------------------------------------------------------------------------
+def read_cached_figure(key: str) -> bytes:
+    """
+    Reads a rendered figure from the disk tier, or returns None.
+    The file time is refreshed so eviction removes the least recently used files first.
+    """
+    path = get_figure_cache_path(key)
+    try:
+        with open(path, 'rb') as f:
+            image = f.read()
+        os.utime(path)
+        return image
+    except OSError:
+        return None
+# -------------------------------------------------------------------------------
+def write_cached_figure(key: str, image: bytes) -> None:
+    """
+    Stores a rendered figure in the disk tier and trims the tier to FIGURE_CACHE_MAX_BYTES.
+    """
+    path = get_figure_cache_path(key)
+    try:
+        os.makedirs(FIGURE_CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial image
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(image)
+        os.replace(temp_path, path)
+        evict_figure_cache()
+    except OSError as e:
+        print(f"Error writing figure cache {path}: {e}")
+# -------------------------------------------------------------------------------
+def evict_figure_cache() -> None:
+    """
+    Removes the least recently used images until the disk tier fits FIGURE_CACHE_MAX_BYTES.
+    """
+    entries = []
+    for entry in os.scandir(FIGURE_CACHE_DIR):
+        if entry.is_file() and entry.name.endswith(f".{FIGURE_FORMAT}"):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total_size <= FIGURE_CACHE_MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total_size -= size
+        except OSError as e:
+            print(f"Error removing figure cache file {path}: {e}")
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 2: Cached Plot Functions
+# ==================================================================================
+def load_or_render_figure(key: str, plot_func, args: tuple, kwargs: dict) -> bytes:
+    """
+    Reads a plot from the disk tier, or draws and renders it and stores it there.
+    Returns None when the plot function returns no figure.
+    """
+    image = read_cached_figure(key)
+    if image is None:
+        fig = plot_func(*args, **kwargs)
+        if fig is None:
+            return None
+        image = render_figure(fig)
+        write_cached_figure(key, image)
+    return image
+# -------------------------------------------------------------------------------
+def get_figure_image(plot_func, *args, **kwargs) -> bytes:
+    """
+    Returns the PNG bytes of `plot_func(*args, **kwargs)`, drawing the figure only on a cache miss.
+
+    Recently used images are kept in memory by core.summary_cache, older ones are read from
+    FIGURE_CACHE_DIR. Show the result with `st.image(image, width='stretch')`.
+
+    Args:
+        plot_func (callable): A plot function returning a matplotlib Figure (or None).
+        *args, **kwargs: Arguments of the plot function. DataFrames and Series are fingerprinted.
+
+    Returns:
+        bytes: The rendered PNG image, or None when the plot function returned no figure.
+    """
+    key = get_figure_key(plot_func, args, kwargs)
+    return summary_cache.get_or_compute(
+        ('figure', key),
+        lambda: load_or_render_figure(key, plot_func, args, kwargs)
+    )
+# ===================================================================================
@@ -0,0 +1,321 @@
+import os
+import json
+import hashlib
+
+import numpy as np
+
+# This module prepares the state polygons of the choropleth maps.
+# The GeoJSON is simplified once per tolerance and cached on disk, so maps ship a light copy
+# of the geometry instead of the full-resolution file.
+
+# ---------------------------------------------------------
+# GEOMETRY CONFIGURATION
+# ---------------------------------------------------------
+GEOJSON_PATH = "map_data/01_INDIA_STATES.geojson"
+
+# Feature property holding the state name matched against the dataset's location values
+STATE_NAME_PROPERTY = "STNAME_SH"
+
+# Simplified variants, as the largest allowed deviation from the source lines in degrees
+SIMPLIFY_TOLERANCES = [0.0025, 0.01, 0.04]
+
+# Largest deviation allowed on screen, in pixels at the displayed zoom level
+MAX_ERROR_PIXELS = 0.5
+
+# Decimals kept per coordinate in the variants (4 decimals are about 11 m)
+COORDINATE_DECIMALS = 4
+
+# Disk tier of the variants, rebuilt when the source file or GEOMETRY_CACHE_VERSION changes
+GEOMETRY_CACHE_DIR = ".geometry_cache"
+GEOMETRY_CACHE_VERSION = 1
+
+# Prepared geometry published for the browser (Streamlit static file serving, see .streamlit/config.toml).
+# File names carry a content hash, so browsers can keep them for the whole session.
+STATIC_GEOMETRY_DIR = "static/geometry"
+STATIC_GEOMETRY_URL = "app/static/geometry"
+
+
+# ==================================================================================
+# Block 0: Line Simplification Functions
+# ==================================================================================
+def simplify_line(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Douglas-Peucker simplification of a line. The first and last points are always kept.
+
+    Args:
+        points (np.ndarray): (n, 2) array of coordinates.
+        tolerance (float): Largest allowed distance between the line and the dropped points.
+
+    Returns:
+        np.ndarray: The kept points, in order.
+    """
+    if len(points) < 3:
+        return points
+    keep = np.zeros(len(points), dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        start, end = points[first], points[last]
+        inner = points[first + 1:last]
+        segment = end - start
+        length = np.hypot(*segment)
+        if length == 0:
+            distances = np.hypot(*(inner - start).T)
+        else:
+            distances = np.abs(segment[0] * (inner[:, 1] - start[1]) - segment[1] * (inner[:, 0] - start[0])) / length
+        farthest = int(np.argmax(distances))
+        if distances[farthest] > tolerance:
+            split = first + 1 + farthest
+            keep[split] = True
+            stack.extend([(first, split), (split, last)])
+    return points[keep]
+# -------------------------------------------------------------------------------
+def get_polygons(geometry: dict) -> list:
+    """
+    The polygons (lists of rings) of a Polygon or MultiPolygon geometry.
+    """
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    return geometry['coordinates']
+# -------------------------------------------------------------------------------
+def find_junctions(rings: list) -> set:
+    """
+    Points where the borders of different rings meet or split.
+
+    A point is a junction when its neighbours are not the same in every ring that uses it.
+    Rings without any junction get their smallest point as one, so equal rings are cut alike.
+    """
+    neighbours = {}
+    for ring in rings:
+        for i in range(len(ring) - 1):
+            pair = frozenset((ring[i - 1] if i > 0 else ring[-2], ring[i + 1]))
+            neighbours.setdefault(ring[i], set()).add(pair)
+    junctions = {point for point, pairs in neighbours.items() if len(pairs) > 1}
+    for ring in rings:
+        if not junctions.intersection(ring):
+            junctions.add(min(ring))
+    return junctions
+# -------------------------------------------------------------------------------
+def simplify_ring(ring: list, junctions: set, tolerance: float, arc_cache: dict) -> list:
+    """
+    Simplifies a closed ring arc by arc between its junctions.
+    Arcs shared by two states are simplified once (`arc_cache`), so neighbouring borders stay identical.
+    """
+    points = ring[:-1]
+    start = next(i for i, point in enumerate(points) if point in junctions)
+    points = points[start:] + points[:start] + [points[start]]
+
+    simplified = [points[0]]
+    arc = [points[0]]
+    for point in points[1:]:
+        arc.append(point)
+        if point not in junctions:
+            continue
+        key = tuple(arc) if arc[0] <= arc[-1] else tuple(reversed(arc))
+        if key not in arc_cache:
+            arc_cache[key] = [tuple(p) for p in simplify_line(np.array(key), tolerance)]
+        kept = arc_cache[key] if key[0] == arc[0] else arc_cache[key][::-1]
+        simplified.extend(kept[1:])
+        arc = [point]
+    return simplified
+# -------------------------------------------------------------------------------
+def round_ring(ring: list) -> list:
+    """
+    Rounds a ring to COORDINATE_DECIMALS and drops the points that became repeated.
+    """
+    rounded = []
+    for x, y in ring:
+        point = [round(x, COORDINATE_DECIMALS), round(y, COORDINATE_DECIMALS)]
+        if not rounded or point != rounded[-1]:
+            rounded.append(point)
+    return rounded
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 1: GeoJSON Simplification Functions
+# ==================================================================================
+def simplify_geojson(geojson: dict, tolerance: float) -> dict:
+    """
+    Topology-preserving simplification of a GeoJSON FeatureCollection of (Multi)Polygons.
+
+    Rings are cut into arcs at the points where states meet, every arc is simplified once with
+    `simplify_line` and the rings are rebuilt from the shared arcs, so no gaps or overlaps appear
+    between neighbours. Holes and islands that collapse below a triangle are left out.
+
+    Args:
+        geojson (dict): The source FeatureCollection.
+        tolerance (float): Largest deviation from the source lines, in coordinate units (degrees).
+
+    Returns:
+        dict: A new FeatureCollection with the same properties and lighter geometries.
+    """
+    def to_ring(coordinates):
+        ring = [tuple(point[:2]) for point in coordinates]
+        return ring if ring[0] == ring[-1] else ring + [ring[0]]
+    rings = [to_ring(ring) for feature in geojson['features'] for polygon in get_polygons(feature['geometry']) for ring in polygon]
+    junctions = find_junctions(rings)
+    arc_cache = {}
+
+    features = []
+    for feature in geojson['features']:
+        polygons = []
+        for polygon in get_polygons(feature['geometry']):
+            simplified = [round_ring(simplify_ring(to_ring(ring), junctions, tolerance, arc_cache)) for ring in polygon]
+            exterior, holes = simplified[0], [ring for ring in simplified[1:] if len(ring) >= 4]
+            if len(exterior) >= 4:
+                polygons.append([exterior] + holes)
+        if not polygons:
+            # Features never disappear, a state smaller than the tolerance keeps its rounded outline
+            polygons = [[round_ring(to_ring(ring)) for ring in get_polygons(feature['geometry'])[0]]]
+
+        if len(polygons) == 1:
+            geometry = {'type': 'Polygon', 'coordinates': polygons[0]}
+        else:
+            geometry = {'type': 'MultiPolygon', 'coordinates': polygons}
+        features.append({'type': 'Feature', 'properties': dict(feature['properties']), 'geometry': geometry})
+
+    simplified_geojson = {key: value for key, value in geojson.items() if key != 'features'}
+    simplified_geojson['features'] = features
+    return simplified_geojson
+# -------------------------------------------------------------------------------
+def count_points(geojson: dict) -> int:
+    """
+    Number of coordinates in a FeatureCollection of (Multi)Polygons.
+    """
+    return sum(len(ring) for feature in geojson['features'] for polygon in get_polygons(feature['geometry']) for ring in polygon)
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 2: Variant Cache Functions
+# ==================================================================================
+def get_pixel_degrees(zoom: float) -> float:
+    """
+    Width of one screen pixel in degrees of longitude at a web map zoom level (256 px tiles).
+    """
+    return 360 / (256 * 2 ** zoom)
+# -------------------------------------------------------------------------------
+def pick_tolerance(zoom: float) -> float:
+    """
+    Largest SIMPLIFY_TOLERANCES entry whose error stays below MAX_ERROR_PIXELS at `zoom`, or 0
+    (the source geometry) when even the finest variant is too coarse.
+    """
+    allowed = get_pixel_degrees(zoom) * MAX_ERROR_PIXELS
+    return max((tolerance for tolerance in SIMPLIFY_TOLERANCES if tolerance <= allowed), default=0)
+# -------------------------------------------------------------------------------
+def get_variant_path(path: str, tolerance: float) -> str:
+    """
+    Cache path of a simplified variant for the current version (mtime + size) of a GeoJSON file.
+    """
+    stat = os.stat(path)
+    path_hash = hashlib.blake2b(os.path.abspath(path).encode('utf-8'), digest_size=8).hexdigest()
+    file_stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(
+        GEOMETRY_CACHE_DIR,
+        f"{file_stem}-{path_hash}-v{GEOMETRY_CACHE_VERSION}-{tolerance:g}-{stat.st_mtime_ns}-{stat.st_size}.geojson"
+    )
+# -------------------------------------------------------------------------------
+def read_geojson(path: str) -> dict:
+    """
+    Reads a GeoJSON file.
+    """
+    with open(path, "r") as f:
+        return json.load(f)
+# -------------------------------------------------------------------------------
+def build_geometry_variants(path: str = GEOJSON_PATH) -> dict:
+    """
+    Writes every SIMPLIFY_TOLERANCES variant of a GeoJSON file that is not cached yet.
+
+    Returns:
+        dict: {tolerance: variant path}.
+    """
+    variant_paths = {tolerance: get_variant_path(path, tolerance) for tolerance in SIMPLIFY_TOLERANCES}
+    missing = [tolerance for tolerance, variant_path in variant_paths.items() if not os.path.exists(variant_path)]
+    if missing:
+        geojson = read_geojson(path)
+        os.makedirs(GEOMETRY_CACHE_DIR, exist_ok=True)
+        for tolerance in missing:
+            # Write to a temporary file first so readers never see a partial variant
+            temp_path = f"{variant_paths[tolerance]}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(simplify_geojson(geojson, tolerance), f, separators=(',', ':'))
+            os.replace(temp_path, variant_paths[tolerance])
+    return variant_paths
+# -------------------------------------------------------------------------------
+def load_geometry(path: str = GEOJSON_PATH, zoom: float = None) -> dict:
+    """
+    Loads the lightest cached variant of a GeoJSON file that is accurate enough at `zoom`
+    (see `pick_tolerance`), building the variants on first use. Without a zoom, or when the
+    variants cannot be written, the source file is returned.
+    """
+    tolerance = pick_tolerance(zoom) if zoom is not None else 0
+    if tolerance:
+        try:
+            return read_geojson(build_geometry_variants(path)[tolerance])
+        except Exception as e:
+            print(f"Error preparing simplified geometry for {path}: {e}")
+    return read_geojson(path)
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 3: Prepared Geometry Functions
+# ==================================================================================
+def prepare_geometry(geojson: dict, state_prop_name: str = STATE_NAME_PROPERTY) -> dict:
+    """
+    Prepares a loaded FeatureCollection for the maps, once per process.
+    Every feature gets its position as 'id', and the lower-case state names are indexed,
+    so map values are joined to the polygons by id without touching the features again.
+
+    Returns:
+        dict: 'geojson' (read-only from here on), 'state_prop_name' and
+            'state_index' (lower-case state name -> feature id).
+    """
+    state_index = {}
+    for i, feature in enumerate(geojson['features']):
+        feature['id'] = str(i)
+        state_index[str(feature['properties'][state_prop_name]).lower()] = feature['id']
+    return {'geojson': geojson, 'state_prop_name': state_prop_name, 'state_index': state_index}
+# -------------------------------------------------------------------------------
+def get_value_layer(geometry: dict, map_data, location_col: str, value_col: str) -> dict:
+    """
+    The values of a map, keyed by feature id. Locations are matched case-insensitively,
+    locations without a state polygon are left out.
+    """
+    feature_ids = map_data[location_col].astype(str).str.lower().map(geometry['state_index'])
+    matched = feature_ids.notna()
+    return dict(zip(feature_ids[matched], map_data[value_col][matched].tolist()))
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 4: Published Geometry Functions
+# ==================================================================================
+def publish_geometry(geometry: dict, base_url_path: str = "") -> str:
+    """
+    Writes the prepared geometry (with its feature ids) to STATIC_GEOMETRY_DIR, once per content.
+    Maps can then load the polygons in the browser from the returned URL instead of embedding them.
+
+    Args:
+        geometry (dict): The prepared geometry from `prepare_geometry`.
+        base_url_path (str): Streamlit's server.baseUrlPath setting.
+
+    Returns:
+        str: The absolute URL path of the published file.
+    """
+    content = json.dumps(geometry['geojson'], separators=(',', ':'))
+    content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+    file_name = f"states-{content_hash}.geojson"
+    file_path = os.path.join(STATIC_GEOMETRY_DIR, file_name)
+    if not os.path.exists(file_path):
+        os.makedirs(STATIC_GEOMETRY_DIR, exist_ok=True)
+        temp_path = f"{file_path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(content)
+        os.replace(temp_path, file_path)
+    return "/" + "/".join(part for part in [base_url_path.strip("/"), STATIC_GEOMETRY_URL, file_name] if part)
+# ===================================================================================
@@ -1,75 +1,196 @@
 import streamlit as st
-import json
+import numpy as np
+import pandas as pd
 import folium
+from branca.colormap import StepColormap
+from branca.element import MacroElement
+from branca.utilities import color_brewer
+from jinja2 import Template
 
-@st.cache_data
-def load_geojson(file_path="map_data/01_INDIA_STATES.geojson"):
+from core import map_geometry
+
+# ---------------------------------------------------------
+# MAP VIEW CONFIGURATION
+# ---------------------------------------------------------
+MAP_CENTER = [22, 82]
+MAP_ZOOM_START = 4
+
+# Choropleth styling, shared by the embedded and the value-layer maps
+COLOR_BINS = 6
+FILL_OPACITY = 0.7
+LINE_OPACITY = 0.5
+LINE_WEIGHT = 1
+LINE_COLOR = "black"
+NAN_FILL_COLOR = "gray"
+NAN_FILL_OPACITY = 0.4
+
+TOOLTIP_STYLE = """
+    background-color: #F0F0F0;
+    border: 2px solid black;
+    border-radius: 3px;
+    box-shadow: 3px 3px 3px 0px rgba(0,0,0,0.2);
+    max-width: 800px;
+"""
+
+@st.cache_resource
+def load_map_geometry(file_path=map_geometry.GEOJSON_PATH, zoom=MAP_ZOOM_START):
     """
-    Loads GeoJSON data from a file and returns the data along with the property name for state names.
+    Loads and prepares the state polygons once per process (see core.map_geometry).
+    The polygons are the lightest simplified variant that is accurate at `zoom`.
+    With Streamlit static file serving enabled they are also published for the browser ('url'),
+    so maps send only their values. The result is shared by every session and map, it must not be modified.
     Returns:
-        tuple: (geojson_data, state_prop_name)
+        dict: The prepared geometry, or None when the file cannot be read.
     """
     try:
-        with open(file_path, "r") as f:
-            geojson_data = json.load(f)
-        # In a more advanced version, we could auto-detect this, but for now we return the known key.
-        
-        state_prop_name = "STNAME_SH"
-        return geojson_data, state_prop_name
-
+        geometry = map_geometry.prepare_geometry(map_geometry.load_geometry(file_path, zoom))
     except Exception as e:
         print(f"Error loading GeoJSON file: {e}")
-        return None, None
+        return None
+
+    geometry['url'] = None
+    if st.get_option("server.enableStaticServing"):
+        try:
+            geometry['url'] = map_geometry.publish_geometry(geometry, st.get_option("server.baseUrlPath"))
+        except Exception as e:
+            print(f"Error publishing map geometry: {e}")
+    return geometry
+
+
+class ValueTooltip(MacroElement):
+    """
+    Tooltip of a choropleth layer showing the state name and its value.
+    The values are a small {feature id: value} object joined in the browser, the features are not changed.
+    """
+    _template = Template("""
+        {% macro header(this, kwargs) %}
+            <style>
+                .{{ this.get_name() }} { {{ this.style }} }
+            </style>
+        {% endmacro %}
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }}_values = {{ this.values|tojson }};
+            {{ this._parent.get_name() }}.bindTooltip(function(layer) {
+                var value = {{ this.get_name() }}_values[layer.feature.id];
+                value = (value === undefined || value === null) ? 0 : value;
+                return '<b>State:</b> ' + layer.feature.properties[{{ this.name_property|tojson }}]
+                    + '<br><b>' + {{ this.value_label|tojson }} + ':</b> ' + value.toLocaleString();
+            }, {sticky: false, className: {{ this.get_name()|tojson }}});
+        {% endmacro %}
+    """)
+
+    def __init__(self, values, name_property, value_label, style=TOOLTIP_STYLE):
+        super().__init__()
+        self._name = "ValueTooltip"
+        self.values = values
+        self.name_property = name_property
+        self.value_label = f"{value_label}"
+        self.style = " ".join(style.split())
 
-def plot_choropleth_map(map_data, geojson_data, location_col, value_col, state_prop_name="STNAME_SH", color_theme="YlGnBu"):
+
+class ValueLayer(ValueTooltip):
+    """
+    Choropleth layer whose polygons are loaded by the browser from the published geometry URL.
+    The map itself only carries the {feature id: value} object and the colour scale. The geometry
+    is fetched once per page and kept (and HTTP-cached) across map updates.
+    """
+    _template = Template("""
+        {% macro header(this, kwargs) %}
+            <style>
+                .{{ this.get_name() }} { {{ this.style }} }
+            </style>
+        {% endmacro %}
+        {% macro script(this, kwargs) %}
+            (function() {
+                var values = {{ this.values|tojson }};
+                var edges = {{ this.edges|tojson }};
+                var colors = {{ this.colors|tojson }};
+                var line = {{ this.line|tojson }};
+                function style(feature) {
+                    var value = values[feature.id];
+                    if (value === undefined || value === null || isNaN(value)) {
+                        return Object.assign({fillColor: {{ this.nan_fill_color|tojson }}, fillOpacity: {{ this.nan_fill_opacity }}}, line);
+                    }
+                    var i = 0;
+                    while (i < colors.length - 1 && value >= edges[i + 1]) { i++; }
+                    return Object.assign({fillColor: colors[i], fillOpacity: {{ this.fill_opacity }}}, line);
+                }
+                var url = {{ this.url|tojson }};
+                window.stateGeometry = window.stateGeometry || {};
+                if (!window.stateGeometry[url]) {
+                    window.stateGeometry[url] = fetch(url).then(function(response) { return response.json(); });
+                    // A failed request is tried again by the next map update
+                    window.stateGeometry[url].catch(function() { delete window.stateGeometry[url]; });
+                }
+                window.stateGeometry[url].then(function(geojson) {
+                    var layer = L.geoJson(geojson, {style: style}).addTo({{ this._parent.get_name() }});
+                    layer.bindTooltip(function(item) {
+                        var value = values[item.feature.id];
+                        value = (value === undefined || value === null) ? 0 : value;
+                        return '<b>State:</b> ' + item.feature.properties[{{ this.name_property|tojson }}]
+                            + '<br><b>' + {{ this.value_label|tojson }} + ':</b> ' + value.toLocaleString();
+                    }, {sticky: false, className: {{ this.get_name()|tojson }}});
+                });
+            })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, url, values, edges, colors, name_property, value_label):
+        super().__init__(values, name_property, value_label)
+        self._name = "ValueLayer"
+        self.url = url
+        self.edges = [float(edge) for edge in edges]
+        self.colors = colors
+        self.line = {'weight': LINE_WEIGHT, 'opacity': LINE_OPACITY, 'color': LINE_COLOR}
+        self.fill_opacity = FILL_OPACITY
+        self.nan_fill_color = NAN_FILL_COLOR
+        self.nan_fill_opacity = NAN_FILL_OPACITY
+
+def get_color_scale(values, color_theme):
+    """
+    Bin edges and colours of a map, the same equal-width COLOR_BINS bins as folium.Choropleth.
+    Returns:
+        tuple: (bin_edges, colors)
+    """
+    real_values = np.array(list(values.values()), dtype='float64')
+    real_values = real_values[~np.isnan(real_values)]
+    _, bin_edges = np.histogram(real_values, bins=COLOR_BINS)
+    return bin_edges, color_brewer(color_theme, n=COLOR_BINS)
+
+def plot_choropleth_map(map_data, geometry, location_col, value_col, color_theme="YlGnBu"):
     """
     Generates a Folium Choropleth map.
+    The prepared geometry is used as is, the map values are a separate layer joined by feature id.
+    When the geometry is published ('url'), the polygons are not embedded: the browser loads them
+    once and every map update only sends the values and the colour scale.
     """
-    
-    # Normalize location names for matching FIRST
-    map_data[location_col] = map_data[location_col].astype(str).str.lower()
-    
-    # Create simple lookup dictionary for values
-    val_dict = map_data.set_index(location_col)[value_col].to_dict()
-
-    # Inject value into GeoJSON properties for Tooltip
-    for feature in geojson_data['features']:
-        # Create a lower-case property for matching if it doesn't exist
-        st_name_lower = feature['properties'][state_prop_name].lower()
-        feature['properties']['st_nm_lower'] = st_name_lower
-        
-        # safely get value or 0/N/A
-        val = val_dict.get(st_name_lower, 0)
-        feature['properties'][value_col] = val
-    
-    m = folium.Map(location=[22, 82], zoom_start=4, tiles="CartoDB positron")
+    values = map_geometry.get_value_layer(geometry, map_data, location_col, value_col)
+
+    m = folium.Map(location=MAP_CENTER, zoom_start=MAP_ZOOM_START, tiles="CartoDB positron")
+
+    if geometry.get('url'):
+        bin_edges, colors = get_color_scale(values, color_theme)
+        ValueLayer(geometry['url'], values, bin_edges, colors, geometry['state_prop_name'], value_col).add_to(m)
+        StepColormap(
+            colors, index=list(bin_edges), vmin=min(bin_edges), vmax=max(bin_edges), caption=f"{value_col}"
+        ).add_to(m)
+        return m
 
     choropleth = folium.Choropleth(
-        geo_data=geojson_data,
-        data=map_data,
-        columns=[location_col, value_col],
-        key_on="feature.properties.st_nm_lower",
+        geo_data=geometry['geojson'],
+        data=pd.Series(values, dtype='float64'),
+        key_on="feature.id",
         fill_color=color_theme,
-        fill_opacity=0.7,
-        line_opacity=0.5,
-        nan_fill_color="gray", # Explicitly set no data color to gray
-        nan_fill_opacity=0.4,
+        bins=COLOR_BINS,
+        fill_opacity=FILL_OPACITY,
+        line_opacity=LINE_OPACITY,
+        line_weight=LINE_WEIGHT,
+        line_color=LINE_COLOR,
+        nan_fill_color=NAN_FILL_COLOR, # Explicitly set no data color to gray
+        nan_fill_opacity=NAN_FILL_OPACITY,
         legend_name=f"{value_col}",
     ).add_to(m)
 
-    folium.features.GeoJsonTooltip(
-        fields=[state_prop_name, value_col],
-        aliases=['State:', f'{value_col}:'],
-        localize=True,
-        sticky=False,
-        labels=True,
-        style="""
-            background-color: #F0F0F0;
-            border: 2px solid black;
-            border-radius: 3px;
-            box-shadow: 3px 3px 3px 0px rgba(0,0,0,0.2);
-        """,
-        max_width=800,
-    ).add_to(choropleth.geojson)
+    ValueTooltip(values, geometry['state_prop_name'], value_col).add_to(choropleth.geojson)
 
     return m
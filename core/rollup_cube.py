@@ -0,0 +1,223 @@
+import os
+import glob
+
+import pandas as pd
+
+from core import data_loader, derived_columns
+
+# This module builds and queries the daily rollup cube of a dataset:
+# one row per (Date, Location, Violation_Type, Fine_Paid) with the violation count and fine total.
+# Charts that only need counts and fine sums read the cube instead of the raw records.
+
+# ---------------------------------------------------------
+# ROLLUP CUBE CONFIGURATION
+# ---------------------------------------------------------
+ROLLUP_DIMENSIONS = ['Location', 'Violation_Type', 'Fine_Paid']
+ROLLUP_COUNT_COLUMN = 'Violations'
+ROLLUP_SUM_COLUMNS = ['Fine_Amount']
+
+# Time groupings a query can use besides 'Date' (calculated from the cube's Date column)
+ROLLUP_TIME_GROUPS = [
+    derived_columns.YEAR_COLUMN, derived_columns.MONTH_COLUMN,
+    derived_columns.YEAR_MONTH_COLUMN, derived_columns.WEEKDAY_COLUMN
+]
+
+# Marks cube frames (and slices of them) in `DataFrame.attrs`
+ROLLUP_ATTR = 'rollup_cube'
+
+# Bumped whenever the cube layout changes so older persisted cubes are rebuilt
+ROLLUP_VERSION = 1
+
+
+# ==================================================================================
+# Block 0: Build Functions
+# ==================================================================================
+def can_build_rollup(df: pd.DataFrame) -> bool:
+    """
+    Checks that a dataset has the date, dimension and measure columns of the cube.
+    """
+    columns = ['Date'] + ROLLUP_DIMENSIONS + ROLLUP_SUM_COLUMNS
+    return set(columns).issubset(df.columns) and pd.api.types.is_datetime64_any_dtype(df['Date'])
+# -------------------------------------------------------------------------------
+def build_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aggregates a dataset into the daily rollup cube.
+
+    Args:
+        df (pd.DataFrame): The typed dataset (see core.data_loader).
+
+    Returns:
+        pd.DataFrame: Date + ROLLUP_DIMENSIONS + count and sum columns, sorted by Date.
+            Records without a date are kept in cells with a missing Date and missing dimension values
+            get their own cells, so the cube counts every record like the raw dataset (`count_records`).
+            Date-range queries leave the undated cells out, as `slice_by_date` does for raw records.
+    """
+    keys = [df['Date'].dt.normalize()] + [df[col] for col in ROLLUP_DIMENSIONS]
+    # Integer columns are downcast at load time (see data_loader.INTEGER_COLUMNS) and would overflow once summed
+    measures = pd.DataFrame({col: widen_integer_dtype(df[col]) for col in ROLLUP_SUM_COLUMNS})
+    grouped = measures.groupby(keys, observed=True, sort=True, dropna=False)
+    rollup = grouped.sum()
+    rollup.insert(0, ROLLUP_COUNT_COLUMN, grouped.size())
+    return mark_rollup(rollup.reset_index())
+# -------------------------------------------------------------------------------
+def widen_integer_dtype(values: pd.Series) -> pd.Series:
+    """
+    Casts integer columns to 64 bits (keeping nullable integers nullable), other columns are returned as is.
+    """
+    if not pd.api.types.is_integer_dtype(values):
+        return values
+    if isinstance(values.dtype, pd.api.extensions.ExtensionDtype):
+        return values.astype('Int64')
+    return values.astype('int64')
+# -------------------------------------------------------------------------------
+def mark_rollup(rollup: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tags a frame as a rollup cube, so the helpers below count its rows by ROLLUP_COUNT_COLUMN,
+    and as sorted by date (see data_loader.sort_by_date), so date queries on it are O(log n).
+    """
+    rollup = data_loader.sort_by_date(rollup)
+    rollup.attrs[ROLLUP_ATTR] = True
+    return rollup
+# -------------------------------------------------------------------------------
+def is_rollup(df: pd.DataFrame) -> bool:
+    """
+    Checks if a frame is a rollup cube (or a slice of one).
+    """
+    return bool(df.attrs.get(ROLLUP_ATTR, False))
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 1: Persistence Functions
+# ==================================================================================
+def get_rollup_prefix(path: str) -> str:
+    """
+    Returns the file prefix shared by every persisted cube of a source file.
+    """
+    return f"{data_loader.get_cache_prefix(path)}-rollup"
+# -------------------------------------------------------------------------------
+def get_rollup_path(path: str) -> str:
+    """
+    Returns the cube path for the current version (mtime + size) of a source file,
+    next to its typed Parquet copy in data_loader.CACHE_DIR.
+    """
+    stat = os.stat(path)
+    return f"{get_rollup_prefix(path)}-v{ROLLUP_VERSION}-{stat.st_mtime_ns}-{stat.st_size}.parquet"
+# -------------------------------------------------------------------------------
+def save_rollup(path: str, rollup: pd.DataFrame) -> None:
+    """
+    Writes the cube of a source file, replacing the cubes of older versions.
+    """
+    rollup_path = get_rollup_path(path)
+    for old_path in glob.glob(f"{glob.escape(get_rollup_prefix(path))}-*.parquet"):
+        try:
+            os.remove(old_path)
+        except OSError as e:
+            print(f"Error removing rollup file {old_path}: {e}")
+    try:
+        os.makedirs(data_loader.CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial cube
+        temp_path = f"{rollup_path}.tmp"
+        rollup.to_parquet(temp_path, engine='pyarrow', index=False)
+        os.replace(temp_path, rollup_path)
+    except Exception as e:
+        print(f"Error writing rollup for {path}: {e}")
+# -------------------------------------------------------------------------------
+def load_rollup(path: str, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the rollup cube of a dataset file, reading the persisted cube when it matches the
+    current file version and building + persisting it from `df` otherwise.
+
+    Args:
+        path (str): Path of the source CSV or Parquet file.
+        df (pd.DataFrame): The loaded dataset of that file.
+
+    Returns:
+        pd.DataFrame: The cube, or None when the dataset lacks the cube columns.
+    """
+    if not can_build_rollup(df):
+        return None
+
+    rollup_path = get_rollup_path(path)
+    if os.path.exists(rollup_path):
+        try:
+            return mark_rollup(pd.read_parquet(rollup_path, engine='pyarrow'))
+        except Exception as e:
+            print(f"Error reading rollup {rollup_path}: {e}")
+
+    rollup = build_rollup(df)
+    save_rollup(path, rollup)
+    return rollup
+# -------------------------------------------------------------------------------
+def merge_rollup(rollup: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+    """
+    Adds newly appended records to a cube without rebuilding it.
+
+    Only the cube cells from the first day of the delta onwards are re-aggregated with the
+    delta's own cube, earlier days are kept as they are. For a daily feed that is the last day.
+
+    Args:
+        rollup (pd.DataFrame): The cube of the dataset before the append.
+        delta (pd.DataFrame): The appended records (typed, see core.data_loader).
+
+    Returns:
+        pd.DataFrame: The cube of the dataset after the append.
+    """
+    delta_rollup = build_rollup(delta)
+    if delta_rollup.empty:
+        return rollup
+    rollup, delta_rollup = data_loader.unify_category_dtypes(rollup, delta_rollup)
+
+    split = int(rollup['Date'].searchsorted(delta_rollup['Date'].iloc[0]))
+    tail = pd.concat([rollup.iloc[split:], delta_rollup], ignore_index=True)
+    measures = [ROLLUP_COUNT_COLUMN] + ROLLUP_SUM_COLUMNS
+    tail = tail.groupby(['Date'] + ROLLUP_DIMENSIONS, observed=True, sort=True, dropna=False)[measures].sum()
+    return mark_rollup(pd.concat([rollup.iloc[:split], tail.reset_index()], ignore_index=True))
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 2: Query Functions
+# ==================================================================================
+def query_rollup(rollup: pd.DataFrame, group_by: list, start=None, end=None, filters: dict = None) -> pd.DataFrame:
+    """
+    Answers a count / fine-sum aggregate from the cube.
+
+    Args:
+        rollup (pd.DataFrame): The cube from `load_rollup`.
+        group_by (list): Cube dimensions, 'Date' or ROLLUP_TIME_GROUPS columns.
+        start, end: Optional first and last day (both included), see data_loader.slice_by_date.
+        filters (dict): Optional {dimension: list of values to keep}. Empty lists are ignored.
+
+    Returns:
+        pd.DataFrame: One row per group with the ROLLUP_COUNT_COLUMN and ROLLUP_SUM_COLUMNS totals.
+    """
+    cells = data_loader.slice_by_date(rollup, start, end)
+    for col, values in (filters or {}).items():
+        if values:
+            cells = cells[cells[col].isin(values)]
+
+    keys = [
+        derived_columns.get_derived_column(cells, col).rename(col) if col in ROLLUP_TIME_GROUPS else cells[col]
+        for col in group_by
+    ]
+    measures = [ROLLUP_COUNT_COLUMN] + ROLLUP_SUM_COLUMNS
+    return cells.groupby(keys, observed=True)[measures].sum().reset_index()
+# -------------------------------------------------------------------------------
+def count_records(df: pd.DataFrame) -> int:
+    """
+    Number of violations in a raw dataset or in a cube slice.
+    """
+    return int(df[ROLLUP_COUNT_COLUMN].sum()) if is_rollup(df) else len(df)
+# -------------------------------------------------------------------------------
+def count_by(df: pd.DataFrame, col: str) -> pd.Series:
+    """
+    Violations per value of a column, most frequent first, like `value_counts` on raw records.
+    Values without violations are left out.
+    """
+    if is_rollup(df):
+        counts = df.groupby(col, observed=True)[ROLLUP_COUNT_COLUMN].sum().sort_values(ascending=False, kind='stable')
+    else:
+        counts = df[col].value_counts()
+    return counts[counts > 0]
+# ===================================================================================
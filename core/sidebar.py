@@ -2,6 +2,62 @@ import streamlit as st
 import pandas as pd
 import os
 from streamlit_local_storage import LocalStorage
+from core import data_loader, derived_columns, summary_cache, rollup_cube, dataset_append, dataset_catalog, column_profile
+
+# Key in `DataFrame.attrs` holding the (path, modified_time) a dataset was loaded from
+DATASET_SOURCE_ATTR = 'dataset_source'
+
+@st.cache_resource(max_entries=8)
+def load_data(path: str, modified_time: float) -> pd.DataFrame:
+    """
+    Loads a dataset once per process and shares the same frame between all sessions and reruns.
+    `modified_time` is part of the cache key so edited files are reloaded.
+    Derived columns are added here so they are computed once per dataset.
+    The frame is tagged with a fingerprint that keys the dashboard summary cache.
+    Right after an append (see core.dataset_append) the already enriched result is reused.
+    """
+    df = dataset_append.pop_appended_dataset(path, modified_time)
+    if df is None:
+        df = data_loader.load_dataset(path)
+        df = derived_columns.add_derived_columns(df)
+    df.attrs[DATASET_SOURCE_ATTR] = (path, modified_time)
+    return summary_cache.set_dataset_fingerprint(df, path, modified_time)
+
+@st.cache_resource(max_entries=8)
+def load_rollup(path: str, modified_time: float) -> pd.DataFrame:
+    """
+    Loads (or builds and persists) the daily rollup cube of a dataset once per process.
+    """
+    return rollup_cube.load_rollup(path, load_data(path, modified_time))
+
+def get_dataset_rollup(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the rollup cube of the dataset returned by `render_sidebar`, or None when the frame was
+    not loaded by the sidebar or lacks the cube columns.
+    The cube covers the whole dataset: pass the unfiltered frame and filter through the cube queries.
+    """
+    source = df.attrs.get(DATASET_SOURCE_ATTR)
+    if source is None:
+        return None
+    return load_rollup(*source)
+
+@st.cache_resource(max_entries=8)
+def load_profile(path: str, modified_time: float) -> dict:
+    """
+    Loads (or builds and stores in the dataset catalog) the column profile of a dataset once per process.
+    Only the stored columns are profiled, the derived columns added at load time are not offered in the column pickers.
+    """
+    return column_profile.load_profile(path, derived_columns.drop_derived_columns(load_data(path, modified_time)))
+
+def get_dataset_profile(df: pd.DataFrame) -> dict:
+    """
+    Returns the column profile (see core.column_profile) of the dataset returned by `render_sidebar`.
+    Like the rollup cube it describes the whole dataset. Frames not loaded by the sidebar are profiled directly.
+    """
+    source = df.attrs.get(DATASET_SOURCE_ATTR)
+    if source is None:
+        return column_profile.profile_columns(derived_columns.drop_derived_columns(df))
+    return load_profile(*source)
 
 def render_sidebar() -> pd.DataFrame:
     """
@@ -10,51 +66,8 @@ def render_sidebar() -> pd.DataFrame:
     """
     st.sidebar.header("Dataset Selector")
     
-    # Get the list of available datasets
-    dataset_folder = "dataset"
-    uploaded_dataset_folder = "uploaded_datasets"
-    related_uploads_folder = "uploded_file_relateds"
-    generated_dataset_folder = "generated_fake_traffic_datasets"
-    other_party_uploads_folder = "uploded_file_others"
-    
-    dataset_options = {}
-
-    # Add datasets from the 'dataset' folder
-    if os.path.exists(dataset_folder):
-        for filename in os.listdir(dataset_folder):
-            if filename.endswith(".csv"):
-                dataset_options[f"{filename} [Sample]"] = os.path.join(dataset_folder, filename)
-
-    # Function to scan a directory and add to options
-    def scan_and_add_datasets(directory, prefix):
-        if os.path.exists(directory):
-            # Scan for date-based directories (for generated data)
-            if "generated" in directory:
-                for date_dir in sorted(os.listdir(directory), reverse=True):
-                    full_date_dir = os.path.join(directory, date_dir)
-                    if os.path.isdir(full_date_dir):
-                        for file_name in sorted(os.listdir(full_date_dir)):
-                            if file_name.endswith('.csv'):
-                                display_name = f"{file_name} [{prefix} - {date_dir}]"
-                                dataset_options[display_name] = os.path.join(full_date_dir, file_name)
-            else: # Original logic for other directories
-                for file_name in sorted(os.listdir(directory)):
-                    if file_name.endswith('.csv'):
-                        dataset_options[f"{file_name} [{prefix}]"] = os.path.join(directory, file_name)
-
-    # Scan new directories in the desired order
-    scan_and_add_datasets(generated_dataset_folder, "Fake Generated")
-    scan_and_add_datasets(related_uploads_folder, "Legacy")
-    scan_and_add_datasets(other_party_uploads_folder, "Other CSVs")
-
-    # Add datasets from the 'uploaded_datasets' folder (legacy)
-    if os.path.exists(uploaded_dataset_folder):
-        for root, dirs, files in os.walk(uploaded_dataset_folder):
-            for filename in files:
-                if filename.endswith(".csv"):
-                    # Get the parent directory name for context
-                    parent_dir = os.path.basename(root)
-                    dataset_options[f"[Legacy] {parent_dir}/{filename}"] = os.path.join(root, filename)
+    # Datasets are listed from the dataset catalog, directories are only re-scanned when they change
+    dataset_options = {entry['display_name']: path for path, entry in dataset_catalog.list_datasets()}
 
     # ==========================================================================================================    
     # Persistence with Local Storage
@@ -95,14 +108,11 @@ def render_sidebar() -> pd.DataFrame:
     selected_dataset_path = dataset_options[selected_dataset_display_name]
 
     # 4. Load the selected dataset
-    @st.cache_data
-    def load_data(path):
-        df = pd.read_csv(path)
-        return df.copy() # Return a copy to prevent mutation of cached data
-    df = load_data(selected_dataset_path)
+    df = load_data(selected_dataset_path, os.path.getmtime(selected_dataset_path))
     
     # 4. Display Success Message
     st.sidebar.success(f"Loaded dataset: **{selected_dataset_display_name}**")
     
     # 5. Return the loaded dataset
-    return df.copy()
+    # Shallow copy: with Copy-on-Write (see core/__init__.py) page edits never reach the cached frame
+    return df.copy(deep=False)
@@ -0,0 +1,116 @@
+import sys
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# This module memoizes dashboard summary results per (dataset, filter) so reruns reuse them
+
+# ---------------------------------------------------------
+# SUMMARY CACHE CONFIGURATION
+# ---------------------------------------------------------
+# Least recently used results are evicted once the estimated size or entry count is exceeded
+SUMMARY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+SUMMARY_CACHE_MAX_ENTRIES = 256
+
+# Key in `DataFrame.attrs` holding the dataset fingerprint (set by core.sidebar at load time)
+FINGERPRINT_ATTR = 'dataset_fingerprint'
+
+# Shared by every session of the process: key -> (result, estimated size in bytes)
+SUMMARY_CACHE = OrderedDict()
+SUMMARY_CACHE_LOCK = threading.Lock()
+SUMMARY_CACHE_STATS = {'hits': 0, 'misses': 0, 'evictions': 0, 'bytes': 0}
+
+
+# ==================================================================================
+# Block 0: Dataset Fingerprint Functions
+# ==================================================================================
+def set_dataset_fingerprint(df: pd.DataFrame, path: str, modified_time: float) -> pd.DataFrame:
+    """
+    Tags a loaded dataset with the path and mtime it was read from.
+    pandas carries `attrs` over to copies and row slices, so filtered frames keep the tag.
+    """
+    df.attrs[FINGERPRINT_ATTR] = f"{path}:{modified_time}"
+    return df
+# -------------------------------------------------------------------------------
+def get_dataset_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Returns the fingerprint of a dataset. Frames without the load-time tag are hashed by content.
+    """
+    fingerprint = df.attrs.get(FINGERPRINT_ATTR)
+    if fingerprint is None:
+        row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+        content = row_hashes.tobytes() + ','.join(map(str, df.columns)).encode('utf-8')
+        fingerprint = hashlib.blake2b(content, digest_size=16).hexdigest()
+    return fingerprint
+# ===================================================================================
+
+
+# ==================================================================================
+# Block 1: Result Cache Functions
+# ==================================================================================
+def estimate_size(value) -> int:
+    """
+    Rough memory footprint of a cached result in bytes.
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+# -------------------------------------------------------------------------------
+def evict_to_budget() -> None:
+    """
+    Drops least recently used entries until the cache fits its byte and entry budgets.
+    Must be called with SUMMARY_CACHE_LOCK held.
+    """
+    while SUMMARY_CACHE and (
+        SUMMARY_CACHE_STATS['bytes'] > SUMMARY_CACHE_MAX_BYTES or len(SUMMARY_CACHE) > SUMMARY_CACHE_MAX_ENTRIES
+    ):
+        _, (_, size) = SUMMARY_CACHE.popitem(last=False)
+        SUMMARY_CACHE_STATS['bytes'] -= size
+        SUMMARY_CACHE_STATS['evictions'] += 1
+# -------------------------------------------------------------------------------
+def get_or_compute(key: tuple, compute):
+    """
+    Returns the cached result for `key`, or calls `compute()` and caches its result.
+
+    Args:
+        key (tuple): Hashable key, normally (dataset fingerprint, summary name, *filter params).
+        compute (callable): Builds the result. Only called on a cache miss, so any slicing of
+            the dataset should happen inside it.
+
+    Returns:
+        The cached or freshly computed result. Cached results are shared, callers must not modify them.
+    """
+    with SUMMARY_CACHE_LOCK:
+        if key in SUMMARY_CACHE:
+            SUMMARY_CACHE.move_to_end(key)
+            SUMMARY_CACHE_STATS['hits'] += 1
+            return SUMMARY_CACHE[key][0]
+        SUMMARY_CACHE_STATS['misses'] += 1
+
+    # Computed outside the lock so other sessions are not blocked meanwhile
+    result = compute()
+    size = estimate_size(result)
+
+    with SUMMARY_CACHE_LOCK:
+        if key in SUMMARY_CACHE:
+            SUMMARY_CACHE_STATS['bytes'] -= SUMMARY_CACHE.pop(key)[1]
+        SUMMARY_CACHE[key] = (result, size)
+        SUMMARY_CACHE_STATS['bytes'] += size
+        evict_to_budget()
+    return result
+# -------------------------------------------------------------------------------
+def clear_summary_cache() -> None:
+    """
+    Empties the cache, e.g. after a dataset was replaced in place.
+    """
+    with SUMMARY_CACHE_LOCK:
+        SUMMARY_CACHE.clear()
+        SUMMARY_CACHE_STATS['bytes'] = 0
+# ===================================================================================
@@ -3,6 +3,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import matplotlib.ticker as mtick
+from core import derived_columns
 
 # This module handles plots for Trend Analysis
 
@@ -163,18 +164,11 @@ def plot_categorical_heatmap(percent_pivot, annot, x_label, y_label):
 
 def plot_peak_hour_traffic(df):
     apply_trend_plot_style()
-    df = df.copy()
     if 'Time' in df.columns:
-        try:
-            df['hour'] = pd.to_datetime(df['Time'], format='%H:%M:%S', errors='coerce').dt.hour
-            if df['hour'].isnull().any():
-                 df['hour'] = pd.to_datetime(df['Time'], format='%H:%M', errors='coerce').dt.hour
-            if df['hour'].isnull().all():
-                 df['hour'] = df['Time'].astype(str).str.split(':').str[0].astype(float)
-        except:
-             return None
-
-        hour_counts = df['hour'].value_counts().sort_index()
+        hour_counts = derived_columns.get_derived_column(df, derived_columns.HOUR_COLUMN).value_counts().sort_index()
+        if hour_counts.empty:
+            return None
+
         fig, ax = plt.subplots(figsize=TREND_FIG_SIZE)
         sns.lineplot(x=hour_counts.index, y=hour_counts.values, marker="o", linewidth=3, color="teal", ax=ax)
         ax.set_title("Peak Hour Traffic Violations", fontsize=TREND_TITLE_SIZE, fontweight='bold')
@@ -189,11 +183,9 @@ def plot_peak_hour_traffic(df):
 
 def plot_fines_per_year(df):
     apply_trend_plot_style()
-    df = df.copy()
     if 'Date' in df.columns:
-        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-        df['Year'] = df['Date'].dt.year
-        fines_per_year = df.groupby('Year')['Fine_Amount'].sum()
+        years = derived_columns.get_derived_column(df, derived_columns.YEAR_COLUMN)
+        fines_per_year = df['Fine_Amount'].groupby(years).sum()
         
         fig, ax = plt.subplots(figsize=TREND_FIG_SIZE)
         ax.plot(fines_per_year.index, fines_per_year.values, marker='o', linewidth=3, markersize=8, color="skyblue")
@@ -210,7 +202,7 @@ def plot_fines_per_year(df):
 
 def plot_avg_fine_location_line(df):
     apply_trend_plot_style()
-    fine_location = df.groupby('Location')['Fine_Amount'].mean().reset_index()
+    fine_location = df.groupby('Location', observed=True)['Fine_Amount'].mean().reset_index()
     fig, ax = plt.subplots(figsize=TREND_FIG_SIZE)
     ax.plot(
         fine_location['Location'],
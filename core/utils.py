@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 from streamlit_folium import st_folium
-from core import map_plot
+from core import map_plot, derived_columns, data_loader, chunked_aggregation, column_profile, data_quality
 """
 All Fields in the dataset:
     Violation_ID                  object
@@ -78,8 +78,11 @@ def filter_the_dataset(df: pd.DataFrame) -> pd.DataFrame:
         Comments                      object
     """
     # Date and Time Filteration
-    df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
-    df['Time'] = pd.to_datetime(df['Time'], errors='coerce', format='mixed')
+    # Frames from core.data_loader already carry a parsed 'Date' and a categorical 'Time'
+    if not pd.api.types.is_datetime64_any_dtype(df['Date']):
+        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+    if pd.api.types.is_object_dtype(df['Time']):
+        df['Time'] = pd.to_datetime(df['Time'], errors='coerce', format='mixed')
 
     #===================
     # More refiners if required
@@ -99,17 +102,23 @@ def get_last_n_days_data(df: pd.DataFrame, n: int) -> pd.DataFrame:
     """
     today = pd.Timestamp.now().normalize()
     n_days_ago = today - pd.Timedelta(days=n)
-    filtered_df = df[(df['Date'] >= n_days_ago) & (df['Date'] <= today)]
-    return filtered_df.copy()
+    return data_loader.slice_by_date(df, n_days_ago, today)
 # ----------------------------------------------------------------------------
-def find_location_columns(df, known_locations, sample_size=20, threshold=0.8) -> list:
+def get_years_data(df: pd.DataFrame, years: tuple) -> pd.DataFrame:
     """
-    Analyzes a DataFrame to find columns that likely contain location names.
+    Filters the DataFrame to the records dated within a (first year, last year) range, both included.
+    """
+    return data_loader.slice_by_date(df, f"{years[0]}-01-01", f"{years[1]}-12-31")
+# ----------------------------------------------------------------------------
+def find_location_columns(profile: dict, known_locations, sample_size=20, threshold=0.8) -> list:
+    """
+    Analyzes the column profile of a dataset to find columns that likely contain location names.
+    Only the profiled sample of each column's distinct values is checked, the records are not read.
 
     Args:
-        df (pd.DataFrame): The DataFrame to analyze.
+        profile (dict): The column profile of the dataset (see core.column_profile, core.sidebar.get_dataset_profile).
         known_locations (set): A set of known location names (e.g., from a GeoJSON file), in lowercase.
-        sample_size (int): The number of unique values to sample from each column.
+        sample_size (int): The number of unique values to check from each column (at most PROFILE_SAMPLE_SIZE).
         threshold (float): The percentage of matches required to consider a column as a location column (0.0 to 1.0).
 
     Returns:
@@ -118,17 +127,11 @@ def find_location_columns(df, known_locations, sample_size=20, threshold=0.8) ->
     potential_location_cols = []
     
     # Consider only object/categorical columns
-    categorical_cols = df.select_dtypes(include=['object']).columns
+    categorical_cols = column_profile.get_profile_columns(profile, kind=column_profile.CATEGORICAL_KIND, min_unique=1)
     
     for col in categorical_cols:
-        # Drop nulls and get unique values
-        unique_values = df[col].dropna().unique()
-        
-        if len(unique_values) == 0:
-            continue
-            
-        # Take a sample to check against
-        sample = unique_values[:sample_size]
+        # Take the sample to check against
+        sample = profile['columns'][col]['sample'][:sample_size]
         
         match_count = 0
         for val in sample:
@@ -149,49 +152,16 @@ def find_location_columns(df, known_locations, sample_size=20, threshold=0.8) ->
 # Block 1: Data Quality Analysis Functions
 # ===================== Data Quality Analysis Functions ============================
 
-def get_data_quality_analysis(df: pd.DataFrame) -> pd.DataFrame:
+def get_data_quality_analysis(df: pd.DataFrame, approximate: bool = None) -> pd.DataFrame:
     """
-    Calculates missing, unique, and duplicate statistics for each column.
+    Calculates missing, unique, duplicate and outlier (IQR method) statistics for each column.
+    All columns are computed in batched NumPy passes (see core.data_quality). Large datasets and
+    chunked handles use approximate distinct counts and quartiles.
     
     Returns:
         pd.DataFrame: A formatted DataFrame with percentage metrics.
     """
-    total_rows = len(df)
-    report = []
-    
-    for col in df.columns:
-        missing_count = df[col].isnull().sum()
-        unique_count = df[col].nunique()
-        redundant_count = total_rows - unique_count
-        
-        # present_pct = ((total_rows - missing_count) / total_rows) * 100
-        missing_pct = (missing_count / total_rows) * 100
-        unique_pct = (unique_count / total_rows) * 100
-        duplicate_pct = (redundant_count / total_rows) * 100
-        
-        # Outlier Calculation (IQR Method) for numeric columns
-        outlier_pct = 0.0
-        if pd.api.types.is_numeric_dtype(df[col]):
-            Q1 = df[col].quantile(0.25)
-            Q3 = df[col].quantile(0.75)
-            IQR = Q3 - Q1
-            lower_bound = Q1 - 1.5 * IQR
-            upper_bound = Q3 + 1.5 * IQR
-            
-            outliers = df[(df[col] < lower_bound) | (df[col] > upper_bound)]
-            outlier_pct = (len(outliers) / total_rows) * 100
-
-        report.append({
-            'Column Name': col,
-            # 'Present (%)': round(present_pct, 2),
-            'Missing (%)': round(missing_pct, 2),
-            'Unique (%)': round(unique_pct, 2),
-            'Duplicate (%)': round(duplicate_pct, 2),
-            'Outlier (%)': round(outlier_pct, 2)
-        })
-        
-
-    return pd.DataFrame(report)
+    return data_quality.format_quality_report(data_quality.get_quality_stats(df, approximate))
 
 # ===================== End of Data Quality Analysis Functions =====================
 
@@ -207,7 +177,8 @@ def get_violation_stats_table(df: pd.DataFrame) -> pd.DataFrame:
     if 'Violation_Type' not in df.columns or 'Fine_Amount' not in df.columns:
         return pd.DataFrame()
     
-    stats = df.groupby('Violation_Type')['Fine_Amount'].agg(['count', 'sum', 'mean', 'min', 'max']).reset_index()
+    stats = chunked_aggregation.group_aggregate(df, ['Violation_Type'], {'Fine_Amount': ['count', 'sum', 'mean', 'min', 'max']})
+    stats = stats['Fine_Amount'].reset_index()
     stats.columns = ['Violation Type', 'Total Incidents', 'Total Fines', 'Average Fine', 'Min Fine', 'Max Fine']
     stats = stats.sort_values(by='Total Fines', ascending=False)
     return stats
@@ -219,7 +190,8 @@ def get_demographic_pivot(df: pd.DataFrame) -> pd.DataFrame:
     if 'Violation_Type' not in df.columns or 'Driver_Gender' not in df.columns:
         return pd.DataFrame()
     
-    pivot = df.pivot_table(index='Violation_Type', columns='Driver_Gender', values='Violation_ID', aggfunc='count', fill_value=0)
+    counts = chunked_aggregation.group_aggregate(df, ['Violation_Type', 'Driver_Gender'], {'Violation_ID': ['count']})
+    pivot = counts[('Violation_ID', 'count')].unstack('Driver_Gender', fill_value=0)
     pivot['Total'] = pivot.sum(axis=1)
     pivot = pivot.sort_values(by='Total', ascending=False)
     return pivot
@@ -232,7 +204,8 @@ def get_vehicle_analysis_table(df: pd.DataFrame) -> pd.DataFrame:
     if not all(col in df.columns for col in cols_needed):
         return pd.DataFrame()
         
-    stats = df.groupby(['Vehicle_Type', 'Vehicle_Model_Year'])['Fine_Amount'].agg(['count', 'mean']).reset_index()
+    stats = chunked_aggregation.group_aggregate(df, ['Vehicle_Type', 'Vehicle_Model_Year'], {'Fine_Amount': ['count', 'mean']})
+    stats = stats['Fine_Amount'].reset_index()
     stats.columns = ['Vehicle Type', 'Model Year', 'Violation Count', 'Avg Fine']
     stats = stats.sort_values(by='Violation Count', ascending=False)
     return stats
@@ -245,9 +218,9 @@ def get_speeding_analysis_by_zone(df: pd.DataFrame) -> pd.DataFrame:
     if not all(col in df.columns for col in cols_needed):
         return pd.DataFrame()
     
-    df_speed = df.copy()
-    df_speed['Excess_Speed'] = df_speed['Recorded_Speed'] - df_speed['Speed_Limit']
-    df_speed = df_speed[df_speed['Excess_Speed'] > 0] # Only actual speeding
+    excess_speed = derived_columns.get_derived_column(df, derived_columns.EXCESS_SPEED_COLUMN)
+    speeding = excess_speed > 0 # Only actual speeding
+    df_speed = pd.DataFrame({'Speed_Limit': df['Speed_Limit'][speeding], 'Excess_Speed': excess_speed[speeding]})
     
     if df_speed.empty:
         return pd.DataFrame()
@@ -264,7 +237,7 @@ def get_environmental_stats(df: pd.DataFrame) -> pd.DataFrame:
     if not all(col in df.columns for col in cols_needed):
         return pd.DataFrame()
         
-    stats = df.groupby(['Weather_Condition', 'Road_Condition']).size().reset_index(name='Violation Count')
+    stats = chunked_aggregation.group_size(df, ['Weather_Condition', 'Road_Condition']).reset_index(name='Violation Count')
     stats = stats.sort_values(by='Violation Count', ascending=False)
     return stats
 # -------------------------------------------------------------------------------
@@ -275,17 +248,17 @@ def get_hourly_patterns_table(df: pd.DataFrame) -> pd.DataFrame:
     if 'Time' not in df.columns or 'Date' not in df.columns:
         return pd.DataFrame()
         
-    temp_df = df.copy()
-    # Fix UserWarning: parse dates/times with format='mixed' to handle inconsistencies
-    temp_df['Hour'] = pd.to_datetime(temp_df['Time'], format='mixed', errors='coerce').dt.hour
-    temp_df['Day'] = pd.to_datetime(temp_df['Date'], format='mixed', errors='coerce').dt.day_name()
-    
-    # Order days correctly
-    days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    temp_df['Day'] = pd.Categorical(temp_df['Day'], categories=days_order, ordered=True)
+    # Hour and Weekday are added once at load time, Weekday is already ordered Monday..Sunday
+    temp_df = pd.DataFrame({
+        'Day': derived_columns.get_derived_column(df, derived_columns.WEEKDAY_COLUMN),
+        'Hour': derived_columns.get_derived_column(df, derived_columns.HOUR_COLUMN),
+        'Violation_ID': df['Violation_ID'],
+    })
     
     # Fix FutureWarning: specify observed=False for categorical data
     pivot = temp_df.pivot_table(index='Day', columns='Hour', values='Violation_ID', aggfunc='count', fill_value=0, observed=False)
+    # Plain int hour labels, the pandas Styler cannot index nullable Int8 columns
+    pivot.columns = pivot.columns.astype(int)
     return pivot
 # -------------------------------------------------------------------------------
 def get_custom_grouping(df: pd.DataFrame, group_cols: list, agg_cols: list, agg_funcs: list) -> pd.DataFrame:
@@ -299,7 +272,8 @@ def get_custom_grouping(df: pd.DataFrame, group_cols: list, agg_cols: list, agg_
     agg_dict = {col: agg_funcs for col in agg_cols}
     
     try:
-        grouped_df = df.groupby(group_cols).agg(agg_dict).reset_index()
+        # Chunked dataset handles are aggregated chunk by chunk, see core.chunked_aggregation
+        grouped_df = chunked_aggregation.group_aggregate(df, group_cols, agg_dict).reset_index()
         
         # Flatten MultiIndex columns (e.g., ('Fine_Amount', 'sum') -> 'Fine_Amount_sum')
         new_cols = []
@@ -328,7 +302,7 @@ def get_custom_grouping(df: pd.DataFrame, group_cols: list, agg_cols: list, agg_
 # Block 4: Map Visualization Functions
 # ========================= Map Visualization Functions ==========================
 
-def render_choropleth_map_on_page(map_data, geojson_data, location_col, value_col, state_prop_name, color_theme="YlGnBu", title="Map"):
+def render_choropleth_map_on_page(map_data, geometry, location_col, value_col, color_theme="YlGnBu", title="Map"):
     """
     Renders a Folium Choropleth map using the core module and displays it on Streamlit.
     """
@@ -352,7 +326,7 @@ def render_choropleth_map_on_page(map_data, geojson_data, location_col, value_co
         """, unsafe_allow_html=True)
 
         # Generate Map Object using core Logic
-        m = map_plot.plot_choropleth_map(map_data, geojson_data, location_col, value_col, state_prop_name, color_theme)
+        m = map_plot.plot_choropleth_map(map_data, geometry, location_col, value_col, color_theme)
         st_folium(m, width='stretch', height=500, key=f"map_{title.replace(' ', '_')}", returned_objects=[])
 
     with col2:
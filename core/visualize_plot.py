@@ -2,6 +2,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
 import matplotlib.ticker as mtick
+from core import derived_columns
 
 # ---------------------------------------------------------
 # UNIFORM STYLE CONFIGURATION
@@ -60,7 +61,8 @@ def plot_speed_exceeded_vs_weather(df):
 
     fig, ax = plt.subplots(figsize=FIG_SIZE)
 
-    avg_speed = df.groupby('Weather_Condition')['Speed_Exceeded'].mean().sort_values(ascending=False)
+    avg_speed = df.groupby('Weather_Condition', observed=True)['Speed_Exceeded'].mean().sort_values(ascending=False)
+    avg_speed.index = avg_speed.index.astype(str) # Plot only the observed categories
 
     sns.barplot(
         x=avg_speed.index,
@@ -91,7 +93,8 @@ def plot_avg_fine_by_violation_type(df):
     apply_plot_style()
     fig, ax = plt.subplots(figsize=FIG_SIZE)
 
-    avg_fines = df.groupby('Violation_Type')['Fine_Amount'].mean().sort_values(ascending=False)
+    avg_fines = df.groupby('Violation_Type', observed=True)['Fine_Amount'].mean().sort_values(ascending=False)
+    avg_fines.index = avg_fines.index.astype(str) # Plot only the observed categories
 
     sns.scatterplot(
         x=avg_fines.index, 
@@ -120,12 +123,16 @@ def plot_bar_or_count(df, x_col, y_col):
     apply_plot_style()
     fig, ax = plt.subplots(figsize=FIG_SIZE)
 
+    # Restrict the axis to the observed categories
+    x_counts = df[x_col].value_counts()
+    x_order = x_counts[x_counts > 0].index
+
     if y_col == 'Count':
-        sns.countplot(x=x_col, data=df, ax=ax, order=df[x_col].value_counts().index, palette=UNI_PALETTE)
+        sns.countplot(x=x_col, data=df, ax=ax, order=x_order, palette=UNI_PALETTE)
         ax.set_title(f"Count of {x_col}")
         ax.set_ylabel("Count")
     else:
-        sns.barplot(x=x_col, y=y_col, hue=x_col, legend=False, data=df, ax=ax, estimator=lambda x: x.mean(), palette=UNI_PALETTE)
+        sns.barplot(x=x_col, y=y_col, hue=x_col, legend=False, data=df, ax=ax, estimator=lambda x: x.mean(), palette=UNI_PALETTE, order=x_order, hue_order=x_order)
         ax.set_title(f"Mean of {y_col} by {x_col}")
         ax.set_ylabel(f"Mean {y_col}")
 
@@ -171,6 +178,8 @@ def plot_top_5_locations_violation(df):
     apply_plot_style()
     fig = plt.figure(figsize=FIG_SIZE)
     Location_Count = df['Location'].value_counts().head(5)
+    Location_Count = Location_Count[Location_Count > 0]
+    Location_Count.index = Location_Count.index.astype(str)
     sns.barplot(x=Location_Count.index, y=Location_Count.values, hue=Location_Count.index, legend=False, palette="viridis")
     plt.title("Top 5 Locations (Violations)")
     plt.xlabel("Location")
@@ -183,7 +192,10 @@ def plot_top_5_locations_violation(df):
 def plot_vehicle_type_vs_violation_type(df):
     apply_plot_style()
     fig = plt.figure(figsize=FIG_SIZE)
-    sns.countplot(data=df, x='Violation_Type', hue='Vehicle_Type', palette=UNI_PALETTE)
+    sns.countplot(
+        data=df, x='Violation_Type', hue='Vehicle_Type', palette=UNI_PALETTE,
+        order=df['Violation_Type'].dropna().unique(), hue_order=df['Vehicle_Type'].dropna().unique()
+    )
     plt.title('Vehicle Type vs Violation Type')
     plt.xlabel('Violation Type')
     plt.ylabel('Number of Violations')
@@ -201,6 +213,7 @@ def plot_vehicle_type_vs_violation_type(df):
 def plot_violation_type_percentage(df):
     apply_plot_style()
     violation_counts = df['Violation_Type'].value_counts()
+    violation_counts = violation_counts[violation_counts > 0] # Skip unobserved categories
     fig = plt.figure(figsize=FIG_SIZE)
     
     # Use distinct colors
@@ -249,6 +262,8 @@ def plot_repeat_offenders(df):
 def plot_violation_by_location_pie(df):
     apply_plot_style()
     location_counts = df["Location"].value_counts()
+    location_counts = location_counts[location_counts > 0]
+    location_counts.index = location_counts.index.astype(str) # Allows adding the 'Others' label
     if len(location_counts) > 10:
         top_n = location_counts.head(10)
         others_count = location_counts.iloc[10:].sum()
@@ -290,12 +305,13 @@ def plot_violation_by_location_pie(df):
 
 def plot_speeding_vs_road_condition(df):
     apply_plot_style()
-    df = df.copy()
+    df = df.copy(deep=False)
     if 'Recorded_Speed' in df.columns and 'Speed_Limit' in df.columns:
         df['Speeding'] = df['Recorded_Speed'] - df['Speed_Limit']
         speed_df = df[df['Speeding'] > 0]
         
-        avg_speeding = speed_df.groupby('Road_Condition')['Speeding'].mean().reset_index()
+        avg_speeding = speed_df.groupby('Road_Condition', observed=True)['Speeding'].mean().reset_index()
+        avg_speeding['Road_Condition'] = avg_speeding['Road_Condition'].astype(str)
         
         fig = plt.figure(figsize=FIG_SIZE)
         sns.barplot(
@@ -319,7 +335,8 @@ def plot_speeding_vs_road_condition(df):
 def plot_fines_vs_weather_severity(df):
     apply_plot_style()
     fig = plt.figure(figsize=FIG_SIZE)
-    df_severity = df.groupby('Weather_Condition')['Fine_Amount'].mean().sort_values()
+    df_severity = df.groupby('Weather_Condition', observed=True)['Fine_Amount'].mean().sort_values()
+    df_severity.index = df_severity.index.astype(str)
     
     sns.barplot(
         x=df_severity.values,
@@ -342,29 +359,16 @@ def plot_fines_vs_weather_severity(df):
 
 def plot_severity_heatmap_by_location(df):
     apply_plot_style()
-    df = df.copy()
+    df = df.copy(deep=False)
     
-    def calc_severity_score(row):
-        severity = 0
-        if pd.notnull(row.get('Fine_Amount')): severity += row['Fine_Amount'] / 1000
-        if pd.notnull(row.get('Penalty_Points')): severity += row['Penalty_Points'] 
-        if pd.notnull(row.get('Recorded_Speed')) and pd.notnull(row.get('Speed_Limit')):
-            overspeed = row['Recorded_Speed'] - row['Speed_Limit']
-            if overspeed > 0: severity += overspeed /10
-        if pd.notnull(row.get('Alcohol_Level')): severity += row['Alcohol_Level'] * 10
-        if row.get('Helmet_Worn') == 'No': severity += 10
-        if row.get('Seatbelt_Worn') == 'No': severity += 10
-        if row.get('Traffic_Light_Status') == 'Red': severity += 15
-        if pd.notnull(row.get('Previous_Violations')): severity += row['Previous_Violations'] * 1.5
-        return severity
-
-    df['Violation_Severity_Score'] = df.apply(calc_severity_score, axis=1)
+    df['Violation_Severity_Score'] = derived_columns.get_severity_score(df)
     
     location_heatmap = df.pivot_table(
         values='Violation_Severity_Score',
         index='Location',
         columns='Violation_Type',
-        aggfunc='mean'
+        aggfunc='mean',
+        observed=True
     )
 
     fig = plt.figure(figsize=FIG_SIZE)
@@ -397,6 +401,7 @@ def plot_avg_fine_by_violation_type_2(df):
 def plot_violation_by_road_condition(df):
     apply_plot_style()
     road_counts = df['Road_Condition'].value_counts()
+    road_counts = road_counts[road_counts > 0]
     
     fig, ax = plt.subplots(figsize=FIG_SIZE)
     
@@ -436,7 +441,8 @@ def plot_weather_impact_heatmap(df):
         columns="Weather_Condition",
         values="Violation_ID",
         aggfunc="count",
-        fill_value=0
+        fill_value=0,
+        observed=True
     )
     fig = plt.figure(figsize=FIG_SIZE)
     sns.heatmap(
@@ -462,13 +468,15 @@ def plot_weather_impact_heatmap(df):
 
 def plot_vehicle_risk_countplot(df):
     apply_plot_style()
-    vehicle_counts = df['Vehicle_Type'].value_counts().index
+    vehicle_counts = df['Vehicle_Type'].value_counts()
+    vehicle_counts = vehicle_counts[vehicle_counts > 0].index
     fig = plt.figure(figsize=FIG_SIZE)
     sns.countplot(
         y=df['Vehicle_Type'],
         order=vehicle_counts,
         palette='Reds_r', # Intensity indicates risk/freq
         hue=df['Vehicle_Type'],
+        hue_order=vehicle_counts,
         legend=False
     )
     plt.title('Vehicle-Type Based Risk Analysis')
@@ -482,7 +490,7 @@ def plot_vehicle_risk_countplot(df):
 
 def plot_age_alcohol_heatmap(df):
     apply_plot_style()
-    df = df.copy()
+    df = df.copy(deep=False)
     bins = [0, 25, 35, 45, 60, 100]
     labels = ["18-25", "26-35", "36-45", "46-60", "60+"]
     
@@ -521,7 +529,7 @@ def plot_age_alcohol_heatmap(df):
 
 def plot_fine_vs_vehicle_pie(df):
     apply_plot_style()
-    fine_data = df.groupby('Vehicle_Type')['Fine_Amount'].sum()
+    fine_data = df.groupby('Vehicle_Type', observed=True)['Fine_Amount'].sum()
     fig, ax = plt.subplots(figsize=FIG_SIZE)
     
     wedges, texts, autotexts = ax.pie(
@@ -550,7 +558,7 @@ def plot_fine_vs_vehicle_pie(df):
 
 def plot_license_validity_by_gender(df):
     apply_plot_style()
-    validity_gender = df.groupby(['License_Validity', 'Driver_Gender']).size().unstack(fill_value=0)
+    validity_gender = df.groupby(['License_Validity', 'Driver_Gender'], observed=True).size().unstack(fill_value=0)
     
     fig, ax = plt.subplots(figsize=FIG_SIZE)
     validity_gender.plot(
@@ -571,6 +579,7 @@ def plot_license_validity_by_gender(df):
 def plot_fine_amount_distribution_vs_weather(df):
     apply_plot_style()
     plt.figure(figsize=FIG_SIZE)
+    weather_order = df['Weather_Condition'].dropna().unique()
     sns.violinplot(
         data=df, 
         x='Weather_Condition', 
@@ -578,6 +587,8 @@ def plot_fine_amount_distribution_vs_weather(df):
         inner='box', 
         palette="muted",
         hue='Weather_Condition',
+        order=weather_order,
+        hue_order=weather_order,
         legend=False
     )
     
@@ -614,13 +625,11 @@ def plot_violation_types_vs_weather_heatmap(df):
 
 def plot_driver_risk_by_age(df):
     apply_plot_style()
-    df = df.copy()
+    df = df.copy(deep=False)
     bins = [0, 25, 35, 45, 60, 100]
     labels = ["18-25", "26-35", "36-45", "46-60", "60+"]
     df["Age_Group"] = pd.cut(df["Driver_Age"], bins=bins, labels=labels, include_lowest=True)
-    
-    df['Alcohol_Flag'] = (df['Breathalyzer_Result'] == "Positive").astype(int)
-    df["Risk_Level"] = df["Previous_Violations"] + df["Alcohol_Flag"]
+    df["Risk_Level"] = derived_columns.get_risk_level(df)
 
     risk_by_age = df.groupby("Age_Group", observed=False)["Risk_Level"].mean().reset_index()
     risk_by_age = risk_by_age.sort_values("Age_Group")
@@ -1,7 +1,9 @@
+import os
+
 import streamlit as st
 import pandas as pd
-from core.sidebar import render_sidebar
-from core import utils
+from core.sidebar import render_sidebar, DATASET_SOURCE_ATTR
+from core import utils, derived_columns, data_loader, chunked_aggregation
 
 # ------------------------------
 # PAGE CONFIG
@@ -149,7 +151,7 @@ except Exception as e:
 # ------------------------------
 with st.expander("Filters", expanded=True):
     start_date, end_date = None, None
-    df = df_original.copy() # Work with a copy
+    df = df_original.copy(deep=False) # Work with a shallow copy
 
     try:
         if 'Date' in df.columns:
@@ -175,7 +177,7 @@ with st.expander("Filters", expanded=True):
         if start_date > end_date:
             st.error("Error: End date must fall after start date.")
             st.stop()
-        df_filtered = df[(df['Date'].dt.date >= start_date) & (df['Date'].dt.date <= end_date)]
+        df_filtered = data_loader.slice_by_date(df, start_date, end_date)
     else:
         df_filtered = df
 
@@ -184,15 +186,30 @@ with st.expander("Filters", expanded=True):
         df_filtered['Violation_ID'] = df_filtered['Violation_ID'].astype(str)
         
     st.write(f"### Showing data for `{df_filtered.shape[0]}`x`{df_filtered.shape[1]}` records based on the selected filters.")
+
+    # Large dataset files are aggregated chunk by chunk from disk for the grouped tables below
+    df_tables = df_filtered
+    dataset_source = df_original.attrs.get(DATASET_SOURCE_ATTR)
+    if dataset_source and os.path.getsize(dataset_source[0]) >= chunked_aggregation.OUT_OF_CORE_MIN_BYTES:
+        df_tables = chunked_aggregation.open_chunked_dataset(dataset_source[0], start_date, end_date)
+        st.caption("Large dataset: the grouped tables are computed in chunks from the dataset file.")
 st.markdown("---")
 
 st.markdown('<h2 id="dataset-info" style="text-align: center;">Dataset Information</h3>', unsafe_allow_html=True)
+# Dataset information describes the stored columns, the derived columns added at load time are left out
+df_stored = derived_columns.drop_derived_columns(df)
+df_filtered_stored = derived_columns.drop_derived_columns(df_filtered)
 # -----------------------------------d
 # Missing Duplicate Value Analysis
 # -----------------------------------
 st.subheader("Missing Duplicate Value Analysis")
 st.write("This section provides a combined view of column names, data types, and descriptive statistics for the filtered data.")
-data_quality_df = utils.get_data_quality_analysis(df)
+# Large dataset files are profiled chunk by chunk from disk with approximate distinct counts and quartiles
+df_quality = df_stored
+if dataset_source and os.path.getsize(dataset_source[0]) >= chunked_aggregation.OUT_OF_CORE_MIN_BYTES:
+    df_quality = derived_columns.drop_derived_columns(chunked_aggregation.open_chunked_dataset(dataset_source[0]))
+    st.caption("Large dataset: unique values, quartiles and outliers are estimated (HyperLogLog and t-digest sketches).")
+data_quality_df = utils.get_data_quality_analysis(df_quality)
 st.dataframe(data_quality_df, width='stretch', hide_index=True)   
 # -----------------------------------
 # 5 Sample Rows
@@ -200,7 +217,7 @@ st.dataframe(data_quality_df, width='stretch', hide_index=True)
 st.subheader("5 Sample Rows of the Dataset")
 st.write("This section provides a combined view of column names, data types, and descriptive statistics for the filtered data.")
 with st.expander("5 Sample Rows", expanded=True):
-    st.write(df_filtered.sample(5))
+    st.write(df_filtered_stored.sample(5))
 st.markdown("---")
 # -----------------------------------
 # Column Information
@@ -210,8 +227,8 @@ st.write("This section provides a combined view of column names, data types, and
 with st.expander("Column Information", expanded=True):
     # Create a new dataframe for column information
     info_df = pd.DataFrame({
-        'Field': df_filtered.columns,
-        'Data Type': [str(x) for x in df_filtered.dtypes]
+        'Field': df_filtered_stored.columns,
+        'Data Type': [str(x) for x in df_filtered_stored.dtypes]
     })
     # Explicitly ensure 'Data Type' is treated as string for Arrow
     info_df['Data Type'] = info_df['Data Type'].astype(str)
@@ -219,7 +236,7 @@ with st.expander("Column Information", expanded=True):
     info_df = info_df.reset_index(drop=True)
 
     # Get the descriptive statistics & Merge the two dataframes
-    desc_df = df_filtered.describe(include='all').transpose()
+    desc_df = df_filtered_stored.describe(include='all').transpose()
     for col in desc_df.columns:
         if desc_df[col].dtype == 'object':
             desc_df[col] = desc_df[col].astype(str)
@@ -238,7 +255,7 @@ st.markdown("---")
 st.markdown('<h2 id="violation-stats" style="text-align: center;">Violation Statistics & Fine Analysis</h3>', unsafe_allow_html=True)
 st.write("This section provides a combined view of column names, data types, and descriptive statistics for the filtered data.")
 with st.expander("Analysis by Violation Type", expanded=True):
-    violation_stats = utils.get_violation_stats_table(df_filtered)
+    violation_stats = utils.get_violation_stats_table(df_tables)
     if not violation_stats.empty:
         # Format currency columns if they exist
         format_dict = {}
@@ -260,7 +277,7 @@ st.markdown("---")
 st.markdown('<h2 id="vehicle-analysis" style="text-align: center;">Vehicle & Fine Analysis</h3>', unsafe_allow_html=True)
 st.write("This section provides a combined view of column names, data types, and descriptive statistics for the filtered data.")
 with st.expander("Fines by Vehicle Type & Year", expanded=True):
-    vehicle_stats = utils.get_vehicle_analysis_table(df_filtered)
+    vehicle_stats = utils.get_vehicle_analysis_table(df_tables)
     if not vehicle_stats.empty:
         format_dict = {}
         if "Avg Fine" in vehicle_stats.columns:
@@ -280,7 +297,7 @@ st.markdown("---")
 st.markdown('<h2 id="environmental-impact" style="text-align: center;">Environmental Impact</h3>', unsafe_allow_html=True)
 st.write("This section provides a combined view of column names, data types, and descriptive statistics for the filtered data.")
 with st.expander("Violations by Weather & Road Condition", expanded=True):
-    env_stats = utils.get_environmental_stats(df_filtered)
+    env_stats = utils.get_environmental_stats(df_tables)
     if not env_stats.empty:
         st.dataframe(env_stats, width='stretch', hide_index=True)
     else:
@@ -308,8 +325,8 @@ st.write("This section provides a combined view of column names, data types, and
 
 with st.expander("🛠️ Custom Grouping & Aggregation", expanded=True):
     # Separate columns by type
-    cat_cols = df_filtered.select_dtypes(include=['object', 'category', 'bool']).columns.tolist()
-    num_cols = df_filtered.select_dtypes(include=['number']).columns.tolist()
+    cat_cols = df_tables.select_dtypes(include=['object', 'category', 'bool']).columns.tolist()
+    num_cols = df_tables.select_dtypes(include=['number']).columns.tolist()
 
     c1, c2, c3 = st.columns(3)
     with c1:
@@ -320,7 +337,7 @@ with st.expander("🛠️ Custom Grouping & Aggregation", expanded=True):
         selected_funcs = st.multiselect("3. Select Aggregation Functions", ['count', 'sum', 'mean', 'min', 'max', 'std'], default=['count', 'mean'])
 
     if selected_group_cols and selected_agg_cols and selected_funcs:
-        custom_df = utils.get_custom_grouping(df_filtered, selected_group_cols, selected_agg_cols, selected_funcs)
+        custom_df = utils.get_custom_grouping(df_tables, selected_group_cols, selected_agg_cols, selected_funcs)
         
         if not custom_df.empty:
             st.write(f"### Resulting Table: {custom_df.shape[0]} rows")
@@ -1,7 +1,10 @@
 import streamlit as st
 import pandas as pd
-from core.sidebar import render_sidebar
+from core.sidebar import render_sidebar, get_dataset_profile
 import core.visualize_plot as visualize_plot
+import core.figure_cache as figure_cache
+import core.data_loader as data_loader
+import core.column_profile as column_profile
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -213,16 +216,18 @@ def render_plot_item(title, insight, plot_func, team_member_name, df_local, key_
         key_start = f"start_{key_suffix}"
         key_end = f"end_{key_suffix}"
         
-        filtered_df = df_local.copy()
+        filtered_df = df_local.copy(deep=False)
         
         # Determine min/max date if possible
         min_d, max_d = None, None
         if 'Date' in df_local.columns:
             try:
-                temp_dates = pd.to_datetime(df_local['Date'], errors='coerce').dropna()
-                if not temp_dates.empty:
-                    min_d = temp_dates.min().date()
-                    max_d = temp_dates.max().date()
+                if not pd.api.types.is_datetime64_any_dtype(filtered_df['Date']):
+                    filtered_df['Date'] = pd.to_datetime(filtered_df['Date'], errors='coerce')
+                first_date, last_date = data_loader.get_date_range(filtered_df)
+                if pd.notna(first_date):
+                    min_d = first_date.date()
+                    max_d = last_date.date()
             except:
                 pass
 
@@ -239,13 +244,8 @@ def render_plot_item(title, insight, plot_func, team_member_name, df_local, key_
                 if s_date > e_date:
                     st.error("Start Date must be before End Date.")
                 else:
-                    if filtered_df['Date'].dtype == 'object':
-                            filtered_df['Date'] = pd.to_datetime(filtered_df['Date'], errors='coerce')
-                    
-                    filtered_df = filtered_df[
-                        (filtered_df['Date'].dt.date >= s_date) & 
-                        (filtered_df['Date'].dt.date <= e_date)
-                    ]
+                    # Binary search on the date-sorted dataset instead of comparing every row
+                    filtered_df = data_loader.slice_by_date(filtered_df, s_date, e_date)
         
         if filtered_df.empty:
             st.warning("No data available for the selected range.")
@@ -258,9 +258,9 @@ def render_plot_item(title, insight, plot_func, team_member_name, df_local, key_
             
             with col_plot:
                 try:
-                    fig = plot_func(filtered_df)
-                    if fig:
-                        st.pyplot(fig, width='stretch')
+                    image = figure_cache.get_figure_image(plot_func, filtered_df)
+                    if image:
+                        st.image(image, width='stretch')
                     else:
                         st.write("Plot could not be generated with the selected data.")
                 except Exception as e:
@@ -465,8 +465,10 @@ with st.expander("Custom Bar/Count Plot", expanded=True):
     
     with st.form(key="bar_plot_form"):
         # --- Bar Plot Controls ---
-        all_categorical_cols = [col for col in df.columns if df[col].dtype == 'object' and df[col].nunique() < 100]
-        all_numerical_cols = df.select_dtypes(include=['float64', 'int64']).columns.tolist()
+        # Distinct value counts come from the column profile, computed once per dataset
+        profile = get_dataset_profile(df)
+        all_categorical_cols = column_profile.get_profile_columns(profile, kind=column_profile.CATEGORICAL_KIND, max_unique=99)
+        all_numerical_cols = column_profile.get_profile_columns(profile, kind=column_profile.NUMERIC_KIND)
 
         if not all_categorical_cols:
             st.warning("No suitable categorical columns found for the X-axis of a bar plot.")
@@ -481,7 +483,7 @@ with st.expander("Custom Bar/Count Plot", expanded=True):
 
             # --- Date Range Selector ---
             bar_start_date, bar_end_date = None, None
-            plot_df_bar = df.copy()
+            plot_df_bar = df.copy(deep=False)
             # Date filtering setup (simplified for form context if needed, but keeping logic)
             # Note: Inputs in form is fine.
 
@@ -516,20 +518,21 @@ with st.expander("Custom Bar/Count Plot", expanded=True):
         else:
             # Filter by date if applicable
             if bar_start_date and bar_end_date:
-                plot_df_bar = plot_df_bar[(plot_df_bar['Date'].dt.date >= bar_start_date) & (plot_df_bar['Date'].dt.date <= bar_end_date)]
+                plot_df_bar = data_loader.slice_by_date(plot_df_bar, bar_start_date, bar_end_date)
             
             if plot_df_bar.empty:
                 st.warning("No data available for the selected criteria.")
             else:
-                fig = visualize_plot.plot_bar_or_count(plot_df_bar, x_col_bar, y_col_bar)
-                st.pyplot(fig, width='stretch')
+                image = figure_cache.get_figure_image(visualize_plot.plot_bar_or_count, plot_df_bar, x_col_bar, y_col_bar)
+                st.image(image, width='stretch')
 
                 # Display the underlying data in an expander
                 with st.expander("View Data"):
                     if y_col_bar == 'Count':
-                        st.dataframe(plot_df_bar[x_col_bar].value_counts())
+                        x_counts = plot_df_bar[x_col_bar].value_counts()
+                        st.dataframe(x_counts[x_counts > 0])
                     else:
-                        st.dataframe(plot_df_bar.groupby(x_col_bar)[y_col_bar].mean())
+                        st.dataframe(plot_df_bar.groupby(x_col_bar, observed=True)[y_col_bar].mean())
 
 # ====================================== Removed Plots =======================================================
 
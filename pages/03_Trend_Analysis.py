@@ -2,6 +2,12 @@ import streamlit as st
 import pandas as pd
 from core.sidebar import render_sidebar
 import core.trend_plot as trend_plot
+import core.figure_cache as figure_cache
+import core.data_loader as data_loader
+import core.derived_columns as derived_columns
+import core.rollup_cube as rollup_cube
+import core.column_profile as column_profile
+from core.sidebar import get_dataset_rollup, get_dataset_profile
 import matplotlib.pyplot as plt
 
 # ------------------------------
@@ -169,7 +175,7 @@ def render_hardcoded_trend_plots(df):
          return
     
     # Create working copy
-    df_plot = df.copy()
+    df_plot = df.copy(deep=False)
     df_plot['Date'] = pd.to_datetime(df_plot['Date'], errors='coerce')
     df_plot = df_plot.dropna(subset=['Date'])
     
@@ -177,6 +183,9 @@ def render_hardcoded_trend_plots(df):
         st.warning("No valid dates found for trend plotting.")
         return
 
+    # Daily rollup cube of the dataset, None when it cannot be built
+    rollup = get_dataset_rollup(df)
+
     # --- Helper Function for Independent Sections ---
     def render_single_trend_section(dataset, timeframe_col, title, key_suffix, plot_func_x_label):
         st.markdown(f"### {title}")
@@ -222,44 +231,40 @@ def render_hardcoded_trend_plots(df):
         # Note: In Streamlit forms, the script basically re-runs on submit. 
         # The values `sel_viol`, `start_d` etc. are updated.
 
-        # Filter Date
-        data_filtered = dataset.copy()
-        if start_d and end_d:
-            if start_d > end_d:
-                st.error("End Date must be after Start Date")
-                return
-            data_filtered = data_filtered[(data_filtered['Date'].dt.date >= start_d) & (data_filtered['Date'].dt.date <= end_d)]
+        if start_d and end_d and start_d > end_d:
+            st.error("End Date must be after Start Date")
+            return
+
+        # --- Counting Logic ---
+        if rollup is not None:
+            # Counts per day are pre-aggregated in the rollup cube, only its cells are filtered and summed
+            counts = rollup_cube.query_rollup(
+                rollup, [timeframe_col, 'Violation_Type'], start_d, end_d, {'Violation_Type': sel_viol}
+            ).rename(columns={rollup_cube.ROLLUP_COUNT_COLUMN: 'Count'})
+        else:
+            # Filter Date
+            data_filtered = dataset.copy(deep=False)
+            if start_d and end_d:
+                data_filtered = data_loader.slice_by_date(data_filtered, start_d, end_d)
 
-        # Filter Violation
-        if sel_viol:
-            data_filtered = data_filtered[data_filtered['Violation_Type'].isin(sel_viol)]
+            # Filter Violation
+            if sel_viol:
+                data_filtered = data_filtered[data_filtered['Violation_Type'].isin(sel_viol)]
 
-        if data_filtered.empty:
+            # Month and Year are added at load time, Month is an ordered category so the pivot is already in calendar order
+            data_filtered[timeframe_col] = derived_columns.get_derived_column(data_filtered, timeframe_col)
+            counts = data_filtered.groupby([timeframe_col, 'Violation_Type'], observed=True).size().reset_index(name='Count')
+
+        if counts.empty:
             st.info(f"No data available for {title} with current filters.")
             return
 
         # --- Plotting Logic ---
+        pivot_data = counts.pivot(index=timeframe_col, columns='Violation_Type', values='Count').fillna(0)
         if timeframe_col == 'Month':
-            data_filtered['Month'] = data_filtered['Date'].dt.month_name()
-            counts = data_filtered.groupby(['Month', 'Violation_Type']).size().reset_index(name='Count')
-            if not counts.empty:
-                pivot_data = counts.pivot(index='Month', columns='Violation_Type', values='Count').fillna(0)
-                month_order = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
-                pivot_data = pivot_data.reindex(month_order).dropna()
-                fig = trend_plot.plot_trend_analysis_line(pivot_data, plot_func_x_label, "Violation_Type")
-                st.pyplot(fig, width='stretch')
-            else:
-                st.info("No data to plot.")
-
-        elif timeframe_col == 'Year':
-            data_filtered['Year'] = data_filtered['Date'].dt.year
-            counts = data_filtered.groupby(['Year', 'Violation_Type']).size().reset_index(name='Count')
-            if not counts.empty:
-                pivot_data = counts.pivot(index='Year', columns='Violation_Type', values='Count').fillna(0)
-                fig = trend_plot.plot_trend_analysis_line(pivot_data, plot_func_x_label, "Violation_Type")
-                st.pyplot(fig, width='stretch')
-            else:
-                 st.info("No data to plot.")
+            pivot_data.index = pivot_data.index.astype(str)
+        image = figure_cache.get_figure_image(trend_plot.plot_trend_analysis_line, pivot_data, plot_func_x_label, "Violation_Type")
+        st.image(image, width='stretch')
 
     # 1. Monthly Trend Section
     render_single_trend_section(df_plot, 'Month', "Monthly Trend by Violation Type", "monthly", "Month")
@@ -285,15 +290,17 @@ def render_plot_item(title, insight, plot_func, team_member_name, df_local, key_
         key_start = f"start_{key_suffix}"
         key_end = f"end_{key_suffix}"
         
-        filtered_df = df_local.copy()
+        filtered_df = df_local.copy(deep=False)
         
         min_d, max_d = None, None
         if 'Date' in df_local.columns:
             try:
-                temp_dates = pd.to_datetime(df_local['Date'], errors='coerce').dropna()
-                if not temp_dates.empty:
-                    min_d = temp_dates.min().date()
-                    max_d = temp_dates.max().date()
+                if not pd.api.types.is_datetime64_any_dtype(filtered_df['Date']):
+                    filtered_df['Date'] = pd.to_datetime(filtered_df['Date'], errors='coerce')
+                first_date, last_date = data_loader.get_date_range(filtered_df)
+                if pd.notna(first_date):
+                    min_d = first_date.date()
+                    max_d = last_date.date()
             except:
                 pass
 
@@ -309,27 +316,22 @@ def render_plot_item(title, insight, plot_func, team_member_name, df_local, key_
                 if s_date > e_date:
                     st.error("Start Date must be before End Date.")
                 else:
-                    if filtered_df['Date'].dtype == 'object':
-                            filtered_df['Date'] = pd.to_datetime(filtered_df['Date'], errors='coerce')
-                    
-                    filtered_df = filtered_df[
-                        (filtered_df['Date'].dt.date >= s_date) & 
-                        (filtered_df['Date'].dt.date <= e_date)
-                    ]
+                    # Binary search on the date-sorted dataset instead of comparing every row
+                    filtered_df = data_loader.slice_by_date(filtered_df, s_date, e_date)
         
         if filtered_df.empty:
             st.warning("No data available for the selected range.")
         else:
-            total_records = len(filtered_df)
+            total_records = rollup_cube.count_records(filtered_df)
             date_range_str = f"`{s_date}` to `{e_date}`" if s_date and e_date else "All Time"
 
             col_plot, col_insight = st.columns([4, 1])
             
             with col_plot:
                 try:
-                    fig = plot_func(filtered_df)
-                    if fig:
-                        st.pyplot(fig, width='stretch')
+                    image = figure_cache.get_figure_image(plot_func, filtered_df)
+                    if image:
+                        st.image(image, width='stretch')
                     else:
                         st.write("Plot could not be generated with the selected data.")
                 except Exception as e:
@@ -427,9 +429,7 @@ def render_trend_analysis_line_plot_section():
                 st.error("No categorical columns available in the dataset to use for trend lines.")
                 st.stop()
 
-            start_date_dt = pd.to_datetime(start_date)
-            end_date_dt = pd.to_datetime(end_date)
-            df_filtered = df[(df['Date'] >= start_date_dt) & (df['Date'] <= end_date_dt)].copy()
+            df_filtered = data_loader.slice_by_date(df, start_date, end_date)
 
             # --- Apply Multi-Filter ---
             if selected_filter_values:
@@ -439,15 +439,11 @@ def render_trend_analysis_line_plot_section():
                 st.warning("No data available for the selected date range.")
                 st.stop()
 
-            if X_axis == 'Year':
-                df_filtered['Year'] = df_filtered['Date'].dt.year
-            elif X_axis == 'Month':
-                df_filtered['Month'] = df_filtered['Date'].dt.month_name()
-            elif X_axis == "Year_Month":
-                df_filtered['Year_Month'] = df_filtered['Date'].dt.to_period('M')
+            if X_axis in ['Year', 'Month', 'Year_Month']:
+                df_filtered[X_axis] = derived_columns.get_derived_column(df_filtered, X_axis)
 
             try:
-                attribute_based_counts = df_filtered.groupby([X_axis, Lines]).size().reset_index(name='Count')
+                attribute_based_counts = df_filtered.groupby([X_axis, Lines], observed=True).size().reset_index(name='Count')
             except KeyError:
                 st.error(f"The selected columns '{X_axis}' or '{Lines}' are not found in the dataset.")
                 st.stop()
@@ -462,15 +458,15 @@ def render_trend_analysis_line_plot_section():
                 attribute_based_pivot.index = attribute_based_pivot.index.to_timestamp()
 
             if X_axis == 'Month':
-                month_order = ["January", "February", "March", "April", "May", "June", "July", "August", "September", "October", "November", "December"]
-                attribute_based_pivot = attribute_based_pivot.reindex(month_order).dropna()
+                # Ordered category, already in calendar order
+                attribute_based_pivot.index = attribute_based_pivot.index.astype(str)
 
             st.markdown(f"## `{Lines.replace('_',' ').title()}` Trend based on `{X_axis.replace('_',' ').title()}`")
             st.markdown(f"##### Date Range: `{start_date}` to `{end_date}`")
 
             if plot_type == "Matplotlib":
-                fig = trend_plot.plot_trend_analysis_line(attribute_based_pivot, X_axis, Lines)
-                st.pyplot(fig, width='stretch')
+                image = figure_cache.get_figure_image(trend_plot.plot_trend_analysis_line, attribute_based_pivot, X_axis, Lines)
+                st.image(image, width='stretch')
             elif plot_type == "Streamlit Default":
                 st.line_chart(attribute_based_pivot,width='stretch',x_label= X_axis, y_label="Count")
             else:
@@ -488,7 +484,8 @@ def render_categorical_heatmap_section():
     st.markdown("Analyze the percentage of a specific outcome (e.g., 'Court Appearance Required') across different categories.")
 
     with st.expander("Configure Categorical Heatmap", expanded=False):
-        all_categorical_cols = [col for col in df.columns if df[col].dtype == 'object' and df[col].nunique() > 1 and df[col].nunique() < 50]
+        # Distinct value counts come from the column profile, computed once per dataset
+        all_categorical_cols = column_profile.get_profile_columns(get_dataset_profile(df), kind=column_profile.CATEGORICAL_KIND, min_unique=2, max_unique=49)
         
         if not all_categorical_cols:
             st.warning("No suitable categorical columns found for this analysis.")
@@ -544,25 +541,21 @@ def render_categorical_heatmap_section():
                 if start_date_cat > end_date_cat:
                     st.error("Error: End date must fall after start date.")
                     st.stop()
-                df_filtered = df[(df['Date'].dt.date >= start_date_cat) & (df['Date'].dt.date <= end_date_cat)].copy()
+                df_filtered = data_loader.slice_by_date(df, start_date_cat, end_date_cat)
             else:
-                df_filtered = df.copy()
+                df_filtered = df.copy(deep=False)
 
             # --- Merged plotting logic ---
             df_copy = df_filtered
             if x_col in ['Year', 'Month', 'DayOfWeek'] and 'Date' in df_copy.columns:
-                # Date conversion already done, just extract parts
-                if x_col == 'Year':
-                    df_copy[x_col] = df_copy['Date'].dt.year
-                elif x_col == 'Month':
-                    df_copy[x_col] = df_copy['Date'].dt.month_name()
-                elif x_col == 'DayOfWeek':
-                    df_copy[x_col] = df_copy['Date'].dt.day_name()
+                # Date parts are added at load time, DayOfWeek reads the Weekday column
+                derived_col = 'Weekday' if x_col == 'DayOfWeek' else x_col
+                df_copy[x_col] = derived_columns.get_derived_column(df_copy, derived_col)
 
             df_copy['_flag'] = df_copy[category_col].astype(str).str.lower()
             
-            totals = df_copy.groupby([group_col, x_col]).size().reset_index(name='Total')
-            positive_cases = df_copy[df_copy['_flag'] == str(positive_value).lower()].groupby([group_col, x_col]).size().reset_index(name='Yes')
+            totals = df_copy.groupby([group_col, x_col], observed=True).size().reset_index(name='Total')
+            positive_cases = df_copy[df_copy['_flag'] == str(positive_value).lower()].groupby([group_col, x_col], observed=True).size().reset_index(name='Yes')
             
             merged = totals.merge(positive_cases, on=[group_col, x_col], how='left')
             merged['Yes'] = merged['Yes'].fillna(0)
@@ -573,10 +566,10 @@ def render_categorical_heatmap_section():
             
             annot = yes_pivot.astype(int).astype(str) + "\n(" + percent_pivot.round(1).astype(str) + "%)"
             
-            fig = trend_plot.plot_categorical_heatmap(percent_pivot, annot, x_col, group_col)
+            image = figure_cache.get_figure_image(trend_plot.plot_categorical_heatmap, percent_pivot, annot, x_col, group_col)
             st.markdown(f"## {category_col} ('{positive_value}') — Count & Percentage Heatmap")
             st.markdown(f"##### Date Range: `{start_date_cat}` to `{end_date_cat}`")
-            st.pyplot(fig, width='stretch')
+            st.image(image, width='stretch')
         else:
             st.info("Configure the plot options above and click 'Generate Categorical Heatmap' to see the analysis.")
 
@@ -599,11 +592,13 @@ st.markdown("---")
 
 # 2. FINANCIAL IMPACT
 st.markdown('<h2 id="financial-impact-analysis" style="text-align: center;">Financial Impact Analysis</h3>', unsafe_allow_html=True)
+# Yearly fine totals only need the daily rollup cube, not the raw records
+fines_rollup = get_dataset_rollup(df)
 render_plot_item(
     "Total Fines Per Year", 
     "This trend line visualizes the total revenue generated from fines over the years. Sharp rises or drops may indicate changes in traffic laws, enforcement intensity, or driver behavior.",
     trend_plot.plot_fines_per_year,
-    "Amith", df, "amith_2_moved"
+    "Amith", df if fines_rollup is None else fines_rollup, "amith_2_moved"
 )
 # ===================== Removed Plot ===========================
 # render_plot_item(
@@ -1,12 +1,15 @@
 import streamlit as st
 import pandas as pd
-from core.sidebar import render_sidebar
+from core.sidebar import render_sidebar, get_dataset_rollup, get_dataset_profile
 from core.utils import (
     find_location_columns,
     render_choropleth_map_on_page,
-    
+    get_years_data,
 )
 import core.map_plot as map_plot
+import core.data_loader as data_loader
+import core.rollup_cube as rollup_cube
+import core.column_profile as column_profile
 from core.data_variables import TRAFFIC_VIOLATION_COLUMNS
 
 # ------------------------------
@@ -51,26 +54,27 @@ min_year, max_year = 2000, 2024
 if 'Date' in df.columns:
     df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
     if not df['Date'].isna().all():
-        min_year = int(df['Date'].dt.year.min())
-        max_year = int(df['Date'].dt.year.max())
+        first_date, last_date = data_loader.get_date_range(df)
+        min_year, max_year = int(first_date.year), int(last_date.year)
 
 
 # ------------------------------
 # PREPARE MAP RESOURCES
 # ------------------------------
-geojson_data, state_prop_name = map_plot.load_geojson()
-if geojson_data is None:
+map_geometry = map_plot.load_map_geometry()
+if map_geometry is None:
      st.error("Could not load GeoJSON data.")
      st.stop()
      
-known_states = {feature['properties'][state_prop_name].lower() for feature in geojson_data['features']} if geojson_data else set()
+known_states = set(map_geometry['state_index'])
 
-# Find Location Column
-valid_location_cols = find_location_columns(df, known_states)
+# Find Location Column (from the column profile computed once per dataset)
+profile = get_dataset_profile(df)
+valid_location_cols = find_location_columns(profile, known_states)
 
 if not valid_location_cols:
     # Fallback to categorical columns
-    valid_location_cols = [col for col in df.select_dtypes(include=['object']).columns if df[col].nunique() < 50]
+    valid_location_cols = column_profile.get_profile_columns(profile, kind=column_profile.CATEGORICAL_KIND, max_unique=49)
     if not valid_location_cols:
         st.error("No suitable location/categorical column found.")
         st.stop()
@@ -92,14 +96,17 @@ if min_year == max_year:
 else:
     sel_years_viol = st.slider("Filter by Year", min_year, max_year, (min_year, max_year), key="viol_slider")
 
-# Filter
-mask_viol = (df['Date'].dt.year >= sel_years_viol[0]) & (df['Date'].dt.year <= sel_years_viol[1])
-df_viol = df[mask_viol]
+# Filter (counts per location come from the daily rollup cube when it has the location column)
+rollup = get_dataset_rollup(df)
+if rollup is not None and default_loc_col in rollup_cube.ROLLUP_DIMENSIONS:
+    df_viol = get_years_data(rollup, sel_years_viol)
+else:
+    df_viol = get_years_data(df, sel_years_viol)
 
 try:
-    map_data_count = df_viol[default_loc_col].value_counts().reset_index()
+    map_data_count = rollup_cube.count_by(df_viol, default_loc_col).reset_index()
     map_data_count.columns = [default_loc_col, 'Count']
-    render_choropleth_map_on_page(map_data_count, geojson_data, default_loc_col, 'Count', state_prop_name, color_theme="YlOrRd", title="Violations Count")
+    render_choropleth_map_on_page(map_data_count, map_geometry, default_loc_col, 'Count', color_theme="YlOrRd", title="Violations Count")
 except Exception as e:
     st.error(f"Could not generate Violations Count map: {e}")
 
@@ -119,15 +126,14 @@ if 'Driver_Age' in df.columns:
             sel_years_age = st.slider("Filter by Year", min_year, max_year, (min_year, max_year), key="age_slider")
 
         # Filter
-        mask_age = (df['Date'].dt.year >= sel_years_age[0]) & (df['Date'].dt.year <= sel_years_age[1])
-        df_age = df[mask_age].copy()
+        df_age = get_years_data(df, sel_years_age)
 
         # Ensure numeric
         df_age['Driver_Age'] = pd.to_numeric(df_age['Driver_Age'], errors='coerce')
-        map_data_age = df_age.groupby(default_loc_col)['Driver_Age'].mean().reset_index()
+        map_data_age = df_age.groupby(default_loc_col, observed=True)['Driver_Age'].mean().reset_index()
         map_data_age.columns = [default_loc_col, 'Avg Age']
         #All Color Themes Options: OrRd, YlOrRd, PuBuGn, YlGnBu, RdBu, BrBG, PiYG, PRGn, PuOr, Set1, Set2, Set3, Pastel1, Pastel2, Accent, Dark2, Paired, Set1, Set2, Set3, Pastel1, Pastel2, Accent, Dark2, Paired
-        render_choropleth_map_on_page(map_data_age, geojson_data, default_loc_col, 'Avg Age', state_prop_name, color_theme="BrBG", title="Average Driver's Age")
+        render_choropleth_map_on_page(map_data_age, map_geometry, default_loc_col, 'Avg Age', color_theme="BrBG", title="Average Driver's Age")
     except Exception as e:
          st.error(f"Could not generate Avg Driver's Age map: {e}")
 else:
@@ -155,7 +161,7 @@ with st.expander("Configure Custom Map", expanded=True):
         # end_date input removed
 
         
-        numerical_cols = df.select_dtypes(include=['float64', 'int64']).columns.tolist()
+        numerical_cols = column_profile.get_profile_columns(profile, kind=column_profile.NUMERIC_KIND)
         # Exclude Fine_Amount_Num helper if exists
         numerical_cols = [c for c in numerical_cols if c != 'Fine_Amount_Num']
         
@@ -171,17 +177,17 @@ with st.expander("Configure Custom Map", expanded=True):
 
     if st.button("Generate Custom Map"):
         # Filter
-        mask_custom = (df['Date'].dt.year >= sel_years_custom[0]) & (df['Date'].dt.year <= sel_years_custom[1])
-        plot_df = df[mask_custom].copy()
+        plot_df = get_years_data(df, sel_years_custom)
 
         # Aggregate
         if value_col == 'Count of Violations':
-            custom_map_data = plot_df[location_col].value_counts().reset_index()
+            location_counts = plot_df[location_col].value_counts()
+            custom_map_data = location_counts[location_counts > 0].reset_index()
             custom_map_data.columns = [location_col, 'Count']
             viz_val_col = 'Count'
         else:
             agg_map = {'Mean': 'mean', 'Sum': 'sum', 'Median': 'median'}
-            custom_map_data = plot_df.groupby(location_col)[value_col].agg(agg_map[agg_func]).reset_index()
+            custom_map_data = plot_df.groupby(location_col, observed=True)[value_col].agg(agg_map[agg_func]).reset_index()
             viz_val_col = value_col
         
         # Store in Session State
@@ -198,10 +204,9 @@ if 'custom_map_state' in st.session_state:
     state = st.session_state.custom_map_state
     render_choropleth_map_on_page(
         state['map_data'], 
-        geojson_data, 
+        map_geometry, 
         state['location_col'], 
         state['value_col'], 
-        state_prop_name, 
         state['color_theme'], 
         state['title']
     )
@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+import core.column_profile as column_profile
 
 st.set_page_config(
     page_title="Auto Data Analyzer", 
@@ -45,8 +46,9 @@ if uploaded:
         )
         clean_df[col] = pd.to_numeric(clean_df[col], errors="ignore")
 
-    # Ensure numeric columns are actually numeric
-    numeric_cols = clean_df.select_dtypes(include=["number"]).columns.tolist()
+    # Ensure numeric columns are actually numeric (column kinds from one profile of the cleaned data)
+    profile = column_profile.profile_columns(clean_df)
+    numeric_cols = column_profile.get_profile_columns(profile, kind=column_profile.NUMERIC_KIND)
     categorical_cols = [c for c in df.columns if c not in numeric_cols]
 
     # Explicitly cast Violation_ID to string to avoid PyArrow serialization errors
@@ -4,7 +4,9 @@ from datetime import datetime
 import streamlit as st
 import pandas as pd
 import numpy as np
-from core.data_generator import generate_dataset_by_days
+from core.data_generator import save_generated_dataset
+from core import data_loader, dataset_append, dataset_catalog, dataset_ingest
+from core.sidebar import load_data
 
 # ------------------------------
 # PAGE CONFIG
@@ -40,63 +42,47 @@ with st.expander("🤖 Generate Fake Traffic Dataset"):
         min_records_per_day = st.number_input("Enter the minimum number of records per day:", min_value=1, max_value=100, value=1, step=1)
         max_records_per_day = st.number_input("Enter the maximum number of records per day:", min_value=1, max_value=100, value=10, step=1)
 
-
+    file_format = st.radio("File format", ["CSV", "Parquet"], horizontal=True, help="Parquet files are smaller and load faster.")
+    file_extension = ".parquet" if file_format == "Parquet" else ".csv"
 
     if st.button("Generate and Save Dataset"):
-        with st.spinner("Generating dataset ..."):
-            df = pd.DataFrame(
-                generate_dataset_by_days(
-                    start_date=start_date.strftime('%Y-%m-%d'), 
-                    end_date=end_date.strftime('%Y-%m-%d'), 
-                    min_records_per_day=min_records_per_day, 
-                    max_records_per_day=max_records_per_day
-                )
+        # --- Save the generated dataset ---
+        save_dir = f"generated_fake_traffic_datasets/{datetime.now().strftime('%Y-%m-%d')}"
+        os.makedirs(save_dir, exist_ok=True)
+        
+        dataset_id = 1
+        while (dataset_id <= 99) and any(os.path.exists(os.path.join(save_dir, f"{dataset_id:02d}_traffic_dataset{ext}")) for ext in data_loader.DATASET_EXTENSIONS):
+            dataset_id += 1
+        
+        if dataset_id <= 99:
+            file_path = os.path.join(save_dir, f"{dataset_id:02d}_traffic_dataset{file_extension}")
+            # Records are generated and written in chunks, so memory use does not grow with the date range
+            progress_bar = st.progress(0.0, text="Generating dataset ...")
+            def update_progress(rows_written, total_rows):
+                progress_bar.progress(rows_written / total_rows, text=f"Generating dataset ... {rows_written:,} / {total_rows:,} records")
+
+            rows_written = save_generated_dataset(
+                file_path,
+                start_date=start_date.strftime('%Y-%m-%d'), 
+                end_date=end_date.strftime('%Y-%m-%d'), 
+                min_records_per_day=min_records_per_day, 
+                max_records_per_day=max_records_per_day,
+                progress_callback=update_progress
             )
-        with st.spinner("Saving dataset ..."):
-            # --- Save the generated dataset ---
-            save_dir = f"generated_fake_traffic_datasets/{datetime.now().strftime('%Y-%m-%d')}"
-            os.makedirs(save_dir, exist_ok=True)
-            
-            dataset_id = 1
-            while (dataset_id <= 99) and (os.path.exists(os.path.join(save_dir, f"{dataset_id:02d}_traffic_dataset.csv"))):
-                dataset_id += 1
-            
-            if dataset_id <= 99:
-                file_path = os.path.join(save_dir, f"{dataset_id:02d}_traffic_dataset.csv")
-                df.to_csv(file_path, index=False)
-                st.success(f"Successfully generated and saved '{os.path.basename(file_path)}' in the `{save_dir}` directory.")
-                st.dataframe(df.head())
-            else:
-                st.warning("Dataset generation limit (99) reached for today. Please try again tomorrow.")
+            progress_bar.empty()
+            with st.spinner("Caching dataset ..."):
+                typed_df = data_loader.build_dataset_cache(file_path) if file_extension == ".csv" else None
+                dataset_catalog.register_dataset(file_path, typed_df)
+            st.success(f"Successfully generated and saved '{os.path.basename(file_path)}' ({rows_written:,} records) in the `{save_dir}` directory.")
+            st.dataframe(data_loader.read_dataset_head(file_path))
+        else:
+            st.warning("Dataset generation limit (99) reached for today. Please try again tomorrow.")
 
 st.markdown("---")
 st.markdown("### Upload and save new datasets")
 
-# --- Gather existing datasets for duplicate check ---
-root_upload_dir = "uploaded_datasets"
+# Sample datasets are protected from deletion and appends
 local_dataset_dir = "dataset"
-all_dataset_paths = []
-if os.path.exists(local_dataset_dir):
-    for file_name in os.listdir(local_dataset_dir):
-        if file_name.endswith('.csv'):
-            all_dataset_paths.append(os.path.join(local_dataset_dir, file_name))
-if os.path.exists(root_upload_dir):
-    for root, _, files in os.walk(root_upload_dir):
-        for file_name in files:
-            if file_name.endswith('.csv'):
-                all_dataset_paths.append(os.path.join(root, file_name))
-
-# --- Traffic Violation Columns ---
-TRAFFIC_VIOLATION_COLUMNS = [
-    'Violation_ID', 'Violation_Type', 'Fine_Amount', 'Location', 'Date', 'Time', 
-    'Vehicle_Type', 'Vehicle_Color', 'Vehicle_Model_Year', 'Registration_State', 
-    'Driver_Age', 'Driver_Gender', 'License_Type', 'Penalty_Points', 
-    'Weather_Condition', 'Road_Condition', 'Officer_ID', 'Issuing_Agency', 
-    'License_Validity', 'Number_of_Passengers', 'Helmet_Worn', 'Seatbelt_Worn', 
-    'Traffic_Light_Status', 'Speed_Limit', 'Recorded_Speed', 'Alcohol_Level', 
-    'Breathalyzer_Result', 'Towed', 'Fine_Paid', 'Payment_Method', 
-    'Court_Appearance_Required', 'Previous_Violations', 'Comments'
-]
 
 # --- File Uploader ---
 uploaded_file = st.file_uploader("Choose a CSV file to upload", type="csv", key="datasets_page_uploader")
@@ -109,42 +95,40 @@ if uploaded_file is not None:
         uploaded_file.seek(0)
 
         if st.button("Upload and Save Dataset"):
-            # ... (duplicate check and save logic)
+            # Exact duplicates are found by content hash in the dataset catalog, whatever their file name
             is_duplicate = False
             try:
-                for existing_path in all_dataset_paths:
-                    existing_basename = os.path.basename(existing_path)
-                    parts = existing_basename.split('_', 1)
-                    unprefixed_name = parts[1] if len(parts) == 2 and parts[0].isdigit() else existing_basename
-                    if unprefixed_name == uploaded_file.name:
-                        existing_df_head = pd.read_csv(existing_path, nrows=5)
-                        if preview_df.equals(existing_df_head):
-                            is_duplicate = True
-                            st.error(f"Duplicate of '{existing_basename}' found. Upload cancelled.")
-                            break
+                block_hashes = dataset_catalog.read_file_digest(uploaded_file)[0]
+                content_hash = dataset_catalog.get_content_hash(block_hashes)
+                catalog = dataset_catalog.get_catalog()
+                duplicate_path = dataset_catalog.find_exact_duplicate(catalog, content_hash)
+                if duplicate_path is not None:
+                    is_duplicate = True
+                    st.error(f"Duplicate of '{os.path.basename(duplicate_path)}' found. Upload cancelled.")
             except Exception as e:
                 st.error(f"An error occurred during duplicate check: {e}")
                 is_duplicate = True
 
             if not is_duplicate:
                 try:
-                    # Check columns to decide the folder
-                    uploaded_df = pd.read_csv(uploaded_file)
-                    uploaded_file.seek(0) # Reset file pointer
-                    uploaded_columns = set(uploaded_df.columns)
-                    
-                    if set(TRAFFIC_VIOLATION_COLUMNS).issubset(uploaded_columns):
-                        save_dir = "uploded_file_relateds"
-                    else:
-                        save_dir = "uploded_file_others"
-
-                    os.makedirs(save_dir, exist_ok=True)
-                    
-                    file_path = os.path.join(save_dir, uploaded_file.name)
-
-                    with open(file_path, "wb") as f:
-                        f.write(uploaded_file.getbuffer())
-                    st.success(f"File '{uploaded_file.name}' saved successfully in `{save_dir}`.")
+                    # The file is copied and converted chunk by chunk, its header decides the folder
+                    progress_bar = st.progress(0.0, text="Saving file ...")
+                    ingest = dataset_ingest.ingest_upload(
+                        uploaded_file, uploaded_file.name, block_hashes,
+                        progress_callback=lambda fraction, text: progress_bar.progress(min(fraction, 1.0), text=text)
+                    )
+                    progress_bar.empty()
+                    st.success(f"File '{uploaded_file.name}' saved successfully in `{ingest['save_dir']}` ({ingest['row_count']:,} records).")
+                    for col, count in ingest['unreadable_values'].items():
+                        st.warning(f"{count:,} values of '{col}' could not be read and were left empty.")
+                    file_path = ingest['path']
+
+                    # Near-duplicates: row fingerprints and Violation_ID ranges stored in the catalog
+                    for other_path, row_overlap, id_overlap in dataset_catalog.find_overlapping_datasets(dataset_catalog.get_catalog(), file_path):
+                        details = [f"about {row_overlap:.0%} of the rows are shared"] if row_overlap > 0 else []
+                        if id_overlap:
+                            details.append("the Violation_ID ranges overlap")
+                        st.warning(f"Similar to '{os.path.basename(other_path)}': {' and '.join(details)}.")
                 
                 except Exception as e:
                     st.error(f"An error occurred while saving the file: {e}")
@@ -155,59 +139,26 @@ if uploaded_file is not None:
 st.markdown("---")
 st.markdown("### View Previously Uploaded Datasets")
 
-dataset_options = {}
-if os.path.exists(local_dataset_dir):
-    for file_name in os.listdir(local_dataset_dir):
-        if file_name.endswith('.csv'):
-            dataset_options[f"[Sample] / {file_name}"] = os.path.join(local_dataset_dir, file_name)
-
-# Function to scan a directory and add to options
-def scan_and_add_datasets(directory, prefix):
-    if os.path.exists(directory):
-        # Scan for date-based directories (for generated data)
-        if "generated" in directory:
-            for date_dir in sorted(os.listdir(directory), reverse=True):
-                full_date_dir = os.path.join(directory, date_dir)
-                if os.path.isdir(full_date_dir):
-                    for file_name in sorted(os.listdir(full_date_dir)):
-                        if file_name.endswith('.csv'):
-                            display_name = f"[{prefix} - {date_dir}] / {file_name}"
-                            dataset_options[display_name] = os.path.join(full_date_dir, file_name)
-        else: # Original logic for other directories
-            for file_name in sorted(os.listdir(directory)):
-                if file_name.endswith('.csv'):
-                    dataset_options[f"[{prefix}] / {file_name}"] = os.path.join(directory, file_name)
-
-# Scan new directories
-scan_and_add_datasets("uploded_file_relateds", "Traffic Related")
-scan_and_add_datasets("generated_fake_traffic_datasets", "Generated")
-scan_and_add_datasets("uploded_file_others", "Other CSVs")
-
+# Listed from the dataset catalog (see core.dataset_catalog), row counts come without opening the files
+cataloged_datasets = dataset_catalog.list_datasets()
+dataset_options = {entry['display_name']: path for path, entry in cataloged_datasets}
+dataset_entries = {entry['display_name']: entry for path, entry in cataloged_datasets}
 
-
-if not os.path.exists(root_upload_dir) and not dataset_options and not os.path.exists("uploded_file_relateds") and not os.path.exists("uploded_file_others"):
+if not dataset_options:
     st.info("No datasets have been uploaded or found locally.")
 else:
-    if os.path.exists(root_upload_dir):
-        date_dirs = [d for d in os.listdir(root_upload_dir) if os.path.isdir(os.path.join(root_upload_dir, d)) and d.startswith("Date(")]
-        def get_date_from_dir_name(dir_name):
-            date_str = dir_name.replace("Date(", "").replace(")", "")
-            return datetime.strptime(date_str, "%d-%m-%Y")
-        sorted_date_dirs = sorted(date_dirs, key=get_date_from_dir_name, reverse=True)
-        for date_dir in sorted_date_dirs:
-            dir_path = os.path.join(root_upload_dir, date_dir)
-            files = sorted([f for f in os.listdir(dir_path) if f.endswith('.csv')])
-            for file_name in files:
-                dataset_options[f"[Legacy] {date_dir.replace('Date(', '').replace(')', '')} / {file_name}"] = os.path.join(dir_path, file_name)
-
-    selected_dataset_display_name = st.selectbox("Select a dataset to view", options=["-"] + list(dataset_options.keys()))
+    selected_dataset_display_name = st.selectbox(
+        "Select a dataset to view",
+        options=["-"] + list(dataset_options.keys()),
+        format_func=lambda name: name if name == "-" else f"{name} ({dataset_entries[name]['row_count']:,} rows)"
+    )
 
     if selected_dataset_display_name != "-":
         file_path = dataset_options[selected_dataset_display_name]
         st.markdown(f"### Statistics for: `{selected_dataset_display_name}`")
         
         try:
-            df_view = pd.read_csv(file_path)
+            df_view = data_loader.read_parquet_parts(data_loader.get_source_parts(file_path)) if file_path.endswith('.parquet') else pd.read_csv(file_path)
             tab1, tab2, tab3, tab4 = st.tabs(["📋 Overview", "🔢 Numerical Summary", "🔠 Categorical Summary", "📄 Data Preview & Actions"])
 
             with tab1:
@@ -219,7 +170,7 @@ else:
                 st.dataframe(df_view.describe(include=np.number))
             with tab3:
                 st.markdown("#### Summary for Categorical Columns")
-                cat_summary = df_view.describe(include='object')
+                cat_summary = df_view.describe(include=['object', 'category'])
                 if not cat_summary.empty: st.dataframe(cat_summary)
                 else: st.info("No categorical columns found.")
             with tab4:
@@ -233,7 +184,7 @@ else:
                     st.download_button(
                         label="⬇️ Download Full Dataset",
                         data=df_view.to_csv(index=False).encode('utf-8'),
-                        file_name=os.path.basename(file_path),
+                        file_name=os.path.splitext(os.path.basename(file_path))[0] + '.csv',
                         mime='text/csv',
                         width='stretch'
                     )
@@ -246,6 +197,24 @@ else:
                     else:
                         st.button("🗑️ Delete Dataset", width='stretch', disabled=True, help="Sample and generated datasets cannot be deleted.")
 
+                # Daily feeds are appended to the stored dataset instead of re-uploading the full file
+                if not file_path.startswith(local_dataset_dir) and dataset_entries[selected_dataset_display_name]['traffic_schema']:
+                    st.markdown("---")
+                    st.markdown("#### Append New Violations")
+                    st.caption("Upload a CSV with the same columns and new Violation_IDs to add its records to this dataset.")
+                    delta_file = st.file_uploader("Choose a CSV file of new violations", type="csv", key="append_uploader")
+                    if delta_file is not None and st.button("➕ Append Records", type="primary"):
+                        delta_df = pd.read_csv(delta_file, dtype={'Violation_ID': str})
+                        existing_df = load_data(file_path, os.path.getmtime(file_path))
+                        problems = dataset_append.validate_delta(delta_df, existing_df)
+                        if problems:
+                            for problem in problems:
+                                st.error(problem)
+                        else:
+                            with st.spinner("Appending records ..."):
+                                combined_df = dataset_append.append_violations(file_path, delta_df, existing_df)
+                            st.success(f"Appended {len(delta_df):,} records to `{os.path.basename(file_path)}` ({len(combined_df):,} records in total).")
+
         except Exception as e:
             st.error(f"An error occurred while analyzing the dataset: {e}")
 
@@ -265,6 +234,11 @@ if st.session_state.file_to_delete:
                 if secret_code == "123456789":
                     try:
                         os.remove(file_path_to_delete)
+                        # Records appended to a Parquet dataset are stored in delta parts next to it
+                        for delta_part in data_loader.get_source_parts(file_path_to_delete)[1:]:
+                            os.remove(delta_part)
+                        data_loader.remove_dataset_cache(file_path_to_delete)
+                        dataset_catalog.unregister_dataset(file_path_to_delete)
                         st.success(f"Successfully deleted `{os.path.basename(file_path_to_delete)}`.")
                         st.session_state.file_to_delete = None
                         st.rerun()
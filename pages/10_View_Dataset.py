@@ -2,7 +2,8 @@ import streamlit as st
 import pandas as pd
 from core import (
     sidebar,
-    data_variables
+    data_variables,
+    derived_columns
 )
 
 # ------------------------------
@@ -20,7 +21,8 @@ st.set_page_config(
 st.title("📝 Dataset Summary")
 st.markdown("Visualize and analyze traffic violation data.")
 
-df = sidebar.render_sidebar()
+# Derived score columns are hidden, this page shows the dataset as stored
+df = derived_columns.drop_derived_columns(sidebar.render_sidebar())
 total_data_records = len(df)
 st.metric(label="Total Data Records", value=total_data_records)
 
@@ -72,7 +74,7 @@ if set(data_variables.TRAFFIC_VIOLATION_COLUMNS).issubset(set(df.columns)):
         st.button("🔄 Reset Filters", on_click=clear_filters)
 
 # Filter the dataset logic using Session State values
-df_filtered = df.copy()
+df_filtered = df.copy(deep=False)
 
 if set(data_variables.TRAFFIC_VIOLATION_COLUMNS).issubset(set(df.columns)):
     # Apply Filters based on Session State (which holds the submitted form values)
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from core import data_generator, data_loader, dataset_append, derived_columns
+
+# Run from the repository root with `python -m unittest discover tests`
+
+
+class ParquetCompactionTest(unittest.TestCase):
+    """
+    Appends to a generated Parquet dataset past MAX_DELTA_PARTS, so it is compacted,
+    then appends values outside the range of the records before the compaction.
+    """
+
+    def setUp(self):
+        self.previous_dir = os.getcwd()
+        self.temp_dir = tempfile.mkdtemp()
+        os.chdir(self.temp_dir)
+        self.previous_max_parts = dataset_append.MAX_DELTA_PARTS
+        dataset_append.MAX_DELTA_PARTS = 3
+
+        self.path = os.path.join("generated_fake_traffic_datasets", "2024-01-01", "01_traffic_dataset.parquet")
+        os.makedirs(os.path.dirname(self.path))
+        data_generator.save_generated_dataset(self.path, '2024-01-01', '2024-01-31', 5, 10, seed=7)
+
+    def tearDown(self):
+        dataset_append.MAX_DELTA_PARTS = self.previous_max_parts
+        os.chdir(self.previous_dir)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_delta(self, dataset, index, fine_amount):
+        """
+        Five records of the dataset as read from a delta CSV, with new Violation_IDs and a later date.
+        """
+        delta = derived_columns.drop_derived_columns(dataset).head(5).astype(object)
+        delta['Violation_ID'] = [f"NEW{index:03d}{row:02d}" for row in range(len(delta))]
+        delta['Date'] = f"2024-02-{index + 1:02d}"
+        delta['Fine_Amount'] = fine_amount
+        return delta
+
+    def test_append_after_compaction_accepts_wider_values(self):
+        dataset = derived_columns.add_derived_columns(data_loader.load_dataset(self.path))
+        row_count = len(dataset)
+        appends = dataset_append.MAX_DELTA_PARTS
+        for index in range(appends):
+            delta = self.make_delta(dataset, index, fine_amount=500)
+            self.assertEqual(dataset_append.validate_delta(delta, dataset), [])
+            dataset = dataset_append.append_violations(self.path, delta, dataset)
+        # The last append compacted the delta parts into the file
+        self.assertEqual(data_loader.get_source_parts(self.path), [self.path])
+
+        # Larger than the int16 the loaded Fine_Amount column is downcast to
+        delta = self.make_delta(dataset, appends, fine_amount=100_000)
+        dataset = dataset_append.append_violations(self.path, delta, dataset)
+
+        stored = data_loader.load_dataset(self.path)
+        self.assertEqual(len(stored), row_count + 5 * (appends + 1))
+        self.assertEqual(int(stored['Fine_Amount'].max()), 100_000)
+        self.assertEqual(len(dataset), len(stored))
+
+
+if __name__ == '__main__':
+    unittest.main()